@@ -1,7 +1,11 @@
 import argparse
+import shlex
+import sys
 from rich.table import Table
 
-from ..connectors import get_connection, MySQLConnector, MongoDBConnector, Neo4jConnector
+from ..connectors import PROFILE_OPTIONS, validate_profile
+from ..connectors.streaming import DEFAULT_BATCH_SIZE
+from ..formatters import OUTPUT_FORMATS
 from ..query_engine.main import QueryEngine
 from ..utils import Console, DatabaseType, NO_ALIAS_FOUND, ALIAS_CONNECTION_OPTIONS_INFO
 
@@ -28,6 +32,8 @@ def list_aliases(self):
             connection_details += f"Username: {config['username']}\n"
         if config.get('database') is not None:
             connection_details += f"Database: {config['database']}\n"
+        for name, value in config.get('profile', {}).items():
+            connection_details += f"{name}: {value}\n"
         table.add_row(alias, connection_details)
 
     Console.out(table)
@@ -42,9 +48,37 @@ def get_arg_parser():
     parser.add_argument('--username', help='Database username')
     parser.add_argument('--password', help='Database password')
     parser.add_argument('--database', help='Database name')
+
+    # Performance profile
+    parser.add_argument('--max-pool-size', type=int, help='MongoDB: connections per alias')
+    parser.add_argument('--min-pool-size', type=int, help='MongoDB: connections kept open')
+    parser.add_argument('--compressors', help='MongoDB: wire compressors, e.g. zstd,snappy')
+    parser.add_argument('--read-preference', help='MongoDB: primary, secondary, nearest, ...')
+    parser.add_argument('--write-concern', help='MongoDB: majority or a number of nodes')
+    parser.add_argument('--allow-disk-use', type=_parse_flag, help='MongoDB: let sorts and groups spill to disk')
+    parser.add_argument('--batch-size', type=int, help='MongoDB: documents per round trip')
+    parser.add_argument('--fetch-size', type=int, help='Neo4j: records per round trip')
+    parser.add_argument('--routing', help='Neo4j: auto, read or write')
+    parser.add_argument('--pool-size', type=int, help='MySQL: connections per alias')
+    parser.add_argument('--compress', type=_parse_flag, help='MySQL: compress the protocol')
+    parser.add_argument('--max-execution-time', type=int, help='MySQL: milliseconds a SELECT may run')
     return parser
 
 
+def _parse_flag(text):
+    if text.lower() not in ('true', 'false'):
+        raise argparse.ArgumentTypeError("expected true or false")
+    return text.lower() == 'true'
+
+
+# Moves the profile flags of parsed options into a profile merged over `existing`
+def split_profile(options, existing=None):
+    names = {name for names in PROFILE_OPTIONS.values() for name in names}
+    updates = {name: options.pop(name) for name in names if name in options}
+    profile = {**(existing or {}), **{name: value for name, value in updates.items() if value is not None}}
+    return validate_profile(options.get('type'), profile)
+
+
 def validate_options(self, options):
     _type = options.get('type')
     host = options.get('host')
@@ -74,7 +108,7 @@ def validate_options(self, options):
     return True
 
 
-def test_connection(self, connection_details):
+def test_connection(self, alias, connection_details):
     _type = connection_details.get('type')
     host = connection_details.get('host')
     port = connection_details.get('port')
@@ -82,14 +116,13 @@ def test_connection(self, connection_details):
     username = connection_details.get('username')
     password = connection_details.get('password')
     database = connection_details.get('database')
+    profile = connection_details.get('profile')
 
     connection_details = {}
 
     try:
         match _type:
             case 'mysql':
-                test_connector = MySQLConnector(host, port, username, password, database)
-                test_connector.close()
                 connection_details['type'] = _type
                 connection_details['host'] = host
                 connection_details['port'] = port
@@ -97,8 +130,6 @@ def test_connection(self, connection_details):
                 connection_details['password'] = password
                 connection_details['database'] = database
             case 'mongodb':
-                test_connector = MongoDBConnector(host, port, username, password, database)
-                test_connector.close()
                 connection_details['type'] = _type
                 connection_details['host'] = host
                 connection_details['port'] = port
@@ -106,8 +137,6 @@ def test_connection(self, connection_details):
                 connection_details['password'] = password
                 connection_details['database'] = database
             case 'neo4j':
-                test_connector = Neo4jConnector(uri, username, password)
-                test_connector.close()
                 connection_details['type'] = _type
                 connection_details['uri'] = uri
                 connection_details['username'] = username
@@ -116,10 +145,20 @@ def test_connection(self, connection_details):
             case _:
                 Console.warn(f"Unsupported database type '{type}'")
                 return None
+        if profile:
+            connection_details['profile'] = profile
+
+        # The validated connection goes back to the alias pool and is reused by `alias use`
+        test_connector = self.pool_manager.acquire(alias, connection_details)
+        alive = test_connector.ping()
+        self.pool_manager.release(alias, test_connector, broken=not alive)
+        if not alive:
+            raise Exception("server did not respond")
 
         return connection_details
 
     except Exception as e:
+        self.pool_manager.close(alias)
         Console.error(f"Failed to connect to {type}: {e}")
         return None
 
@@ -148,13 +187,14 @@ def add_alias(self, alias, args):
     try:
         options = parser.parse_args(args)
         options = vars(options)
+        options['profile'] = split_profile(options)
 
         are_valid_options = validate_options(self, options)
         if not are_valid_options:
             Console.info(ALIAS_CONNECTION_OPTIONS_INFO)
             return
 
-        connection_details = test_connection(self, options)
+        connection_details = test_connection(self, alias, options)
         if not connection_details:
             return
 
@@ -167,6 +207,8 @@ def add_alias(self, alias, args):
     except SystemExit:
         # Prevent argparse from calling sys.exit()
         Console.warn("Invalid arguments provided.")
+    except Exception as err:
+        Console.error(err)
 
 
 def edit_alias(self, alias, args):
@@ -181,13 +223,17 @@ def edit_alias(self, alias, args):
         options = parser.parse_args(args)
         updates = {k: v for k, v in vars(options).items() if v is not None}
         new_options = {**existing_connection_details, **updates}
+        # A profile does not carry over to another database type
+        existing_profile = existing_connection_details.get('profile') \
+            if new_options['type'] == existing_connection_details['type'] else None
+        new_options['profile'] = split_profile(new_options, existing_profile)
 
         are_valid_options = validate_options(self, new_options)
         if not are_valid_options:
             Console.info(ALIAS_CONNECTION_OPTIONS_INFO)
             return
 
-        connection_details = test_connection(self, new_options)
+        connection_details = test_connection(self, alias, new_options)
         if not connection_details:
             return
 
@@ -199,6 +245,8 @@ def edit_alias(self, alias, args):
     except SystemExit:
         # Prevent argparse from calling sys.exit()
         Console.warn("Invalid arguments provided.")
+    except Exception as err:
+        Console.error(err)
 
 
 def delete_alias(self, alias):
@@ -211,22 +259,29 @@ def delete_alias(self, alias):
     confirm = Confirm.ask(f"Are you sure you want to delete alias '{alias}'?")
     if confirm:
         self.connection_details_manager.remove_connection(alias)
+        self.pool_manager.close(alias)
         Console.success(f"Alias '{alias}' deleted successfully.")
     else:
         Console.out(f"Delete operation cancelled")
 
 
+def release_active_connection(self):
+    connector = self.active_connection.pop('connector', None)
+    if connector is not None:
+        self.pool_manager.release(self.active_alias, connector)
+
+
 def use_alias(self, alias):
     connection_details = self.connection_details_manager.get_connection(alias)
     if not connection_details:
         Console.warn(f"No alias exist with name `{alias}`")
         return
 
-    if self.active_connection and self.active_connection['connector']:
-        self.active_connection['connector'].close()
-        del self.active_connection['connector']
+    release_active_connection(self)
+    self.pool_manager.evict_idle()
 
-    self.active_connection['connector'] = get_connection(connection_details)
+    self.active_connection['connector'] = self.pool_manager.acquire(alias, connection_details)
+    self.connection_details_manager.record_use(alias)
     self.active_connection['connector_type'] = connection_details['type']
     self.active_alias = alias
 
@@ -244,17 +299,97 @@ def handle_set_native(command: str, query_engine: QueryEngine):
 
 def handle_set_output(command: str, query_engine: QueryEngine):
     command_parts = command.lower().split()
-    if len(command_parts) != 2 or command_parts[1] not in ('table', 'json', 'raw'):
-        Console.warn("Invalid syntax. Usage: set_output <table|json|raw>")
+    if len(command_parts) != 2 or command_parts[1] not in OUTPUT_FORMATS + ('tabular',):
+        Console.warn(f"Invalid syntax. Usage: set_output <{'|'.join(OUTPUT_FORMATS)}>")
         return
     query_engine.set_output_format(command_parts[1])
-    Console.out(f"Output format set to '{command_parts[1]}'")
+    Console.out(f"Output format set to '{query_engine.output_format}'")
+
+
+def handle_set_raw_bson(command: str, query_engine: QueryEngine):
+    command_parts = command.lower().split()
+    if len(command_parts) != 2 or command_parts[1] not in ('true', 'false'):
+        Console.warn("Invalid syntax. Usage: set_raw_bson <true|false>")
+        return
+    if not query_engine.database_type.is_mql():
+        Console.warn("Raw BSON results are only available for MongoDB.")
+        return
+    query_engine.connector.raw_bson = command_parts[1] == 'true'
+    Console.out(f"Raw BSON results are {'enabled' if query_engine.connector.raw_bson else 'disabled'}.")
+
+
+def _parse_parameter_value(text: str):
+    if len(text) >= 2 and text[0] == text[-1] and text[0] in ("'", '"'):
+        return text[1:-1]
+    lowered = text.lower()
+    if lowered == 'null':
+        return None
+    if lowered in ('true', 'false'):
+        return lowered == 'true'
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def handle_prepare(command: str, query_engine: QueryEngine):
+    command_parts = command.split(maxsplit=2)
+    if len(command_parts) != 3:
+        Console.warn("Invalid syntax. Usage: prepare <name> <query with ? or :name placeholders>")
+        return
+    try:
+        query_engine.prepare(command_parts[2], name=command_parts[1])
+        Console.out(f"Statement '{command_parts[1]}' prepared.")
+    except Exception as err:
+        Console.error(err)
+
+
+def handle_execute(command: str, query_engine: QueryEngine):
+    command_parts = command.split(maxsplit=2)
+    if len(command_parts) < 2:
+        Console.warn("Invalid syntax. Usage: execute <name> [value ...] | [key=value ...]")
+        return
+    statement = query_engine.prepared_statements.get(command_parts[1])
+    if statement is None:
+        Console.warn(f"No prepared statement with name `{command_parts[1]}`")
+        return
+
+    lexer = shlex.shlex(command_parts[2] if len(command_parts) == 3 else "", posix=False)
+    lexer.whitespace_split = True
+    positional, named = [], {}
+    for token in lexer:
+        key, separator, value = token.partition('=')
+        if separator and key.isidentifier():
+            named[key] = _parse_parameter_value(value)
+        else:
+            positional.append(_parse_parameter_value(token))
+    if positional and named:
+        Console.warn("Positional and named parameters cannot be mixed")
+        return
+
+    try:
+        result = statement.execute(named if named else positional, stream=True)
+        _print_result(result, query_engine)
+    except Exception as err:
+        Console.error(err)
+
+
+def _print_result(result, query_engine: QueryEngine):
+    # Rows are written straight to stdout as they arrive, bypassing rich rendering
+    count = query_engine.write_result(result, sys.stdout)
+    sys.stdout.flush()
+    if query_engine.output_format == 'table' and count:
+        Console.out(f"{count} row(s)")
+    if query_engine.last_result_approximate:
+        Console.warn("Approximate result: count taken from collection metadata.")
 
 
 def handle_query_execution(query: str, query_engine: QueryEngine):
     try:
-        result = query_engine.execute_query(query)
-        Console.out(result)
+        result = query_engine.execute_query(query, stream=True)
+        _print_result(result, query_engine)
     except Exception as err:
         Console.error(err)
 
@@ -269,7 +404,8 @@ def run_query_prompt(self, alias):
     connector = self.active_connection['connector']
     database_type = DatabaseType(self.active_connection['connector_type'])
 
-    query_engine = QueryEngine(database_type, connector)
+    query_engine = QueryEngine(database_type, connector, plan_cache=self.plan_cache,
+                               batch_size=getattr(connector, 'batch_size', DEFAULT_BATCH_SIZE))
 
     while True:
         try:
@@ -284,6 +420,12 @@ def run_query_prompt(self, alias):
                 handle_set_native(query, query_engine)
             elif query.lower().startswith("set_output"):
                 handle_set_output(query, query_engine)
+            elif query.lower().startswith("set_raw_bson"):
+                handle_set_raw_bson(query, query_engine)
+            elif query.lower().startswith("prepare "):
+                handle_prepare(query, query_engine)
+            elif query.lower().startswith("execute "):
+                handle_execute(query, query_engine)
             else:
                 handle_query_execution(query, query_engine)
 
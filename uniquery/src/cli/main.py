@@ -1,10 +1,16 @@
 import cmd
 import shlex
 
+from rich.table import Table
+
 from ..connection_details_manager import ConnectionDetailsManager
+from ..connectors import PoolManager
+from ..query_engine.translators import PlanCache
 from ..utils import Console, AVAILABLE_COMMANDS_INFO, ALIAS_SUBCOMMANDS_INFO
+from ..utils.constants import (MAX_OPEN_ALIASES, ALIAS_IDLE_TIMEOUT, PREWARM_ALIAS_COUNT, PLAN_CACHE_SIZE,
+                               PLAN_CACHE_PATH)
 from .welcome_screen import display_welcome_screen
-from .alias_actions import list_aliases, add_alias, edit_alias, delete_alias, use_alias
+from .alias_actions import list_aliases, add_alias, edit_alias, delete_alias, use_alias, release_active_connection
 
 class UniQueryCLI(cmd.Cmd):
     def __init__(self):
@@ -20,6 +26,15 @@ class UniQueryCLI(cmd.Cmd):
         self.connection_details_manager = ConnectionDetailsManager()
         self.active_alias = None
         self.active_connection = {}
+        self.plan_cache = PlanCache(PLAN_CACHE_SIZE, PLAN_CACHE_PATH)
+        self.pool_manager = PoolManager(max_pools=MAX_OPEN_ALIASES, idle_timeout=ALIAS_IDLE_TIMEOUT)
+        self._prewarm_aliases()
+
+    def _prewarm_aliases(self):
+        if PREWARM_ALIAS_COUNT <= 0:
+            return
+        for alias in self.connection_details_manager.most_used(PREWARM_ALIAS_COUNT):
+            self.pool_manager.prewarm(alias, self.connection_details_manager.get_connection(alias))
 
     def do_info(self, arg):
         Console.info(AVAILABLE_COMMANDS_INFO)
@@ -50,12 +65,31 @@ class UniQueryCLI(cmd.Cmd):
             case _:
                 Console.warn(ALIAS_SUBCOMMANDS_INFO)
 
+    def do_pools(self, arg):
+        stats = self.pool_manager.stats()
+        if not stats:
+            Console.out("No connection pools open.")
+            return
+
+        table = Table(title=None, show_header=True, header_style="bold magenta")
+        columns = list(next(iter(stats.values())))
+        table.add_column("Alias", style="magenta", no_wrap=True)
+        for column in columns:
+            table.add_column(column.replace('_', ' ').capitalize(), style="green")
+        for alias, pool_stats in stats.items():
+            table.add_row(alias, *(str(pool_stats[column]) for column in columns))
+        Console.out(table)
+
     def do_exit(self, arg):
         """Exit the CLI"""
-        # Close all active connections
-        if self.active_connection.get('connector') is not None:
-            self.active_connection['connector'].close()
+        # Return the active connection and close all pools
+        release_active_connection(self)
+        self.pool_manager.close()
         self.active_connection.clear()
+        try:
+            self.plan_cache.save()
+        except OSError:
+            Console.error(f"Error in saving to {self.plan_cache.path}")
         Console.out("Exiting UniQuery!")
         return True
 
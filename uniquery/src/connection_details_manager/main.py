@@ -1,14 +1,19 @@
 import json
 import os
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
-from ..utils import Console, ALIAS_CONNECTION_DETAILS_PATH
+from ..utils import Console, ALIAS_CONNECTION_DETAILS_PATH, ALIAS_USAGE_FILE
 
 class ConnectionDetailsManager:
-    def __init__(self, filepath: str = ALIAS_CONNECTION_DETAILS_PATH):
+    def __init__(self, filepath: str = ALIAS_CONNECTION_DETAILS_PATH, usage_filepath: str = None):
         self.filepath = filepath
+        # Usage counts live next to the connection details unless placed elsewhere
+        self.usage_filepath = usage_filepath or os.path.join(os.path.dirname(filepath), ALIAS_USAGE_FILE)
         self.connection_details: Dict[str, dict] = {}
+        # Times each alias was used, kept apart so connection details stay comparable
+        self.usage: Dict[str, int] = {}
         self.load_connection_details()
+        self.load_usage()
 
     # Load configurations from the config file
     def load_connection_details(self) -> None:
@@ -40,6 +45,32 @@ class ConnectionDetailsManager:
         if alias in self.connection_details:
             del self.connection_details[alias]
             self.save_connection_details()
+        if self.usage.pop(alias, None) is not None:
+            self.save_usage()
+
+    # Count one use of an alias
+    def record_use(self, alias: str) -> None:
+        self.usage[alias] = self.usage.get(alias, 0) + 1
+        self.save_usage()
+
+    # Existing aliases ordered by how often they were used
+    def most_used(self, count: int) -> List[str]:
+        aliases = [alias for alias in self.usage if alias in self.connection_details]
+        return sorted(aliases, key=lambda alias: self.usage[alias], reverse=True)[:count]
+
+    def load_usage(self) -> None:
+        try:
+            with open(self.usage_filepath, 'r') as f:
+                self.usage = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.usage = {}
+
+    def save_usage(self) -> None:
+        try:
+            with open(self.usage_filepath, 'w') as f:
+                json.dump(self.usage, f, indent=4)
+        except OSError:
+            Console.error(f"Error in saving to {self.usage_filepath}")
 
     # Save configurations to the config file
     def save_connection_details(self) -> None:
@@ -2,5 +2,8 @@ from .mysql_connector import MySQLConnector
 from .mongodb_connector import MongoDBConnector
 from .neo4j_connector import Neo4jConnector
 from .connector import get_connection
+from .pool import PoolConfig, ConnectorPool, PoolManager
+from .profile import PROFILE_OPTIONS, validate_profile
 
-__all__ = ['get_connection', 'MySQLConnector', 'MongoDBConnector', 'Neo4jConnector']
\ No newline at end of file
+__all__ = ['get_connection', 'MySQLConnector', 'MongoDBConnector', 'Neo4jConnector', 'PoolConfig', 'ConnectorPool',
+           'PoolManager', 'PROFILE_OPTIONS', 'validate_profile']
\ No newline at end of file
@@ -0,0 +1,141 @@
+import logging
+import threading
+import time
+
+from .schema import SCHEMA_SAMPLE_SIZE, infer_schema
+
+CATALOG_TTL = 60.0
+
+logger = logging.getLogger(__name__)
+
+
+class MongoCatalog:
+    def __init__(self, client, ttl: float = CATALOG_TTL, background_refresh: bool = True,
+                 sample_size: int = SCHEMA_SAMPLE_SIZE):
+        self.client = client
+        self.ttl = ttl
+        self.background_refresh = background_refresh
+        self.sample_size = sample_size
+        # key -> (names or index documents, loaded at)
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def database_names(self) -> list:
+        return list(self._get(('databases',)))
+
+    def collection_names(self, database: str) -> list:
+        return list(self._get(('collections', database)))
+
+    # Index documents of a collection as returned by `list_indexes`
+    def indexes(self, database: str, collection: str) -> list:
+        return list(self._get(('indexes', database, collection)))
+
+    # Schema inferred from a `$sample` of the collection, see `infer_schema`
+    def schema(self, database: str, collection: str) -> dict:
+        return self._get(('schema', database, collection))
+
+    def has_database(self, database: str) -> bool:
+        return self._contains(('databases',), database)
+
+    def has_collection(self, database: str, collection: str) -> bool:
+        return self._contains(('collections', database), collection)
+
+    def has_index(self, database: str, collection: str, index_name: str) -> bool:
+        return self._contains(('indexes', database, collection), index_name)
+
+    def database_created(self, database: str) -> None:
+        self._add(('databases',), database)
+
+    def collection_created(self, database: str, collection: str) -> None:
+        self._add(('databases',), database)
+        self._add(('collections', database), collection)
+
+    def collection_dropped(self, database: str, collection: str) -> None:
+        with self._lock:
+            self._discard(('collections', database), collection)
+            self._entries.pop(('indexes', database, collection), None)
+            self._entries.pop(('schema', database, collection), None)
+
+    def database_dropped(self, database: str) -> None:
+        with self._lock:
+            self._discard(('databases',), database)
+            for key in [key for key in self._entries if len(key) > 1 and key[1] == database]:
+                del self._entries[key]
+
+    # Forgets cached entries, all of them, those of a database or of one collection
+    def invalidate(self, database: str = None, collection: str = None) -> None:
+        with self._lock:
+            for key in list(self._entries):
+                if database is None:
+                    del self._entries[key]
+                elif key[1:2] == (database,) and (collection is None or key[2:] == (collection,)):
+                    del self._entries[key]
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at = entry
+                if time.monotonic() - loaded_at <= self.ttl:
+                    return value
+                if self.background_refresh:
+                    self._refresh_later(key)
+                    return value
+        return self._load(key)
+
+    def _contains(self, key, name):
+        with self._lock:
+            cached = key in self._entries
+        if name in self._names(self._get(key)):
+            return True
+        # A miss on a cached entry may be a name created by another client since it was loaded
+        return cached and name in self._names(self._load(key))
+
+    @staticmethod
+    def _names(value):
+        return [item['name'] if isinstance(item, dict) else item for item in value]
+
+    def _load(self, key):
+        if key[0] == 'databases':
+            value = self.client.list_database_names()
+        elif key[0] == 'collections':
+            value = self.client[key[1]].list_collection_names()
+        elif key[0] == 'schema':
+            collection = self.client[key[1]][key[2]]
+            documents = collection.aggregate([{'$sample': {'size': self.sample_size}}])
+            value = infer_schema(documents, collection.estimated_document_count())
+        else:
+            value = [dict(index) for index in self.client[key[1]][key[2]].list_indexes()]
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+        return value
+
+    # Called with the lock held, reloads an expired entry once on a daemon thread
+    def _refresh_later(self, key):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(key)
+            except Exception as err:
+                logger.warning("Catalog refresh of %s failed: %s", key, err)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name='uniquery-catalog-refresh', daemon=True).start()
+
+    def _add(self, key, name):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and name not in entry[0]:
+                self._entries[key] = (entry[0] + [name], entry[1])
+
+    # Called with the lock held
+    def _discard(self, key, name):
+        entry = self._entries.get(key)
+        if entry is not None and name in entry[0]:
+            self._entries[key] = ([item for item in entry[0] if item != name], entry[1])
@@ -1,12 +1,15 @@
 from .mysql_connector import MySQLConnector
 from .mongodb_connector import MongoDBConnector
 from .neo4j_connector import Neo4jConnector
+from .profile import mongodb_client_options, mongodb_connector_options, mysql_connector_options, \
+    neo4j_connector_options
 from ..utils.constants import DatabaseType
 
 def get_connection(connection_details):
     try:
         connector = None
         database_type = DatabaseType(connection_details['type'])
+        profile = connection_details.get('profile', {})
 
         if database_type == DatabaseType.MYSQL:
             connector = MySQLConnector(
@@ -14,7 +17,8 @@ def get_connection(connection_details):
                 connection_details['port'],
                 connection_details['username'],
                 connection_details['password'],
-                connection_details['database']
+                connection_details['database'],
+                **mysql_connector_options(profile)
             )
         elif database_type == DatabaseType.MONGO_DB:
             connector = MongoDBConnector(
@@ -22,13 +26,18 @@ def get_connection(connection_details):
                 connection_details['port'],
                 connection_details['username'],
                 connection_details['password'],
-                connection_details['database']
+                connection_details['database'],
+                raw_bson=connection_details.get('raw_bson', False),
+                **mongodb_connector_options(profile),
+                **mongodb_client_options(profile)
             )
         elif database_type == DatabaseType.NEO4J:
             connector = Neo4jConnector(
                 connection_details['uri'],
                 connection_details['username'],
-                connection_details['password']
+                connection_details['password'],
+                connection_details.get('database'),
+                **neo4j_connector_options(profile)
             )
         return connector
 
@@ -0,0 +1,105 @@
+import threading
+from collections import OrderedDict
+
+# Documents a trial run returns at most, the server's own plan trials stop near this
+EXPLAIN_TRIAL_LIMIT = 101
+
+ADVISOR_CACHE_SIZE = 256
+
+
+# Hints are cached per query shape, literal values are left out
+def query_shape(database: str, plan: dict):
+    return (
+        database,
+        plan.get('collection'),
+        plan.get('operation'),
+        _shape(plan.get('filter') or {}),
+        tuple(tuple(item) for item in plan.get('sort') or ()),
+        tuple(plan.get('projection') or ())
+    )
+
+
+def _shape(value):
+    if isinstance(value, dict):
+        return tuple((key, _shape(item)) for key, item in value.items())
+    if isinstance(value, list):
+        # $and/$or operands keep their structure, $in lists collapse to one marker
+        if value and all(isinstance(item, dict) for item in value):
+            return tuple(_shape(item) for item in value)
+        return '[?]'
+    return '?'
+
+
+# Name of the first index scanned by an explain plan stage, None for a collection scan
+def _index_name(stage):
+    if isinstance(stage, dict):
+        if stage.get('indexName'):
+            return stage['indexName']
+        for value in stage.values():
+            name = _index_name(value)
+            if name:
+                return name
+    elif isinstance(stage, list):
+        for item in stage:
+            name = _index_name(item)
+            if name:
+                return name
+    return None
+
+
+class IndexAdvisor:
+    def __init__(self, max_size: int = ADVISOR_CACHE_SIZE, trial_limit: int = EXPLAIN_TRIAL_LIMIT):
+        self.max_size = max_size
+        self.trial_limit = trial_limit
+        # query shape -> index name to hint, None when the server's own choice is best
+        self._choices = OrderedDict()
+        self._lock = threading.Lock()
+
+    # The index to hint for `plan` on `database`, a pymongo Database, or None
+    def choose(self, database, plan: dict, candidates):
+        shape = query_shape(database.name, plan)
+        with self._lock:
+            if shape in self._choices:
+                self._choices.move_to_end(shape)
+                return self._choices[shape]
+
+        try:
+            choice = self._verify(database, plan, candidates)
+        except Exception:
+            # Explain is advisory, the query still runs without a hint
+            choice = None
+
+        with self._lock:
+            self._choices[shape] = choice
+            if len(self._choices) > self.max_size:
+                self._choices.popitem(last=False)
+        return choice
+
+    # Forgets choices made for a collection, or for a whole database
+    def invalidate(self, database: str, collection: str = None) -> None:
+        with self._lock:
+            for shape in list(self._choices):
+                if shape[0] == database and collection in (None, shape[1]):
+                    del self._choices[shape]
+
+    def _verify(self, database, plan, candidates):
+        command = {'find': plan['collection'], 'filter': plan.get('filter') or {}}
+        if plan.get('sort'):
+            command['sort'] = dict(plan['sort'])
+        if plan.get('projection'):
+            command['projection'] = plan['projection']
+
+        explained = database.command('explain', command, verbosity='queryPlanner')
+        server_choice = _index_name(explained.get('queryPlanner', {}).get('winningPlan'))
+
+        costs = {}
+        for name in candidates:
+            trial = dict(command, hint=name, limit=self.trial_limit)
+            stats = database.command('explain', trial, verbosity='executionStats')['executionStats']
+            examined = stats.get('totalKeysExamined', 0) + stats.get('totalDocsExamined', 0)
+            costs[name] = examined / max(stats.get('nReturned', 0), 1)
+
+        best = min(candidates, key=lambda name: costs[name])
+        if server_choice in costs and costs[server_choice] <= costs[best]:
+            return None
+        return best
@@ -1,17 +1,179 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+
+from bson.raw_bson import RawBSONDocument
+import pymongo
 from pymongo import MongoClient
-from tabulate import tabulate
+
+from .catalog import CATALOG_TTL, MongoCatalog
+from .index_advisor import IndexAdvisor
+from .streaming import DEFAULT_BATCH_SIZE, batched, stream_rows
+
+logger = logging.getLogger(__name__)
+
+def mongodb_uri(host, port, username, password, auth_source="admin"):
+    uri = f"mongodb://{username}:{password}@{host}:{port}/"
+    uri += f"?authSource={auth_source}"
+    return uri
+
 
 class MongoDBConnector():
-    def __init__(self, host, port, username, password, database=None, auth_source="admin"):
-        uri = f"mongodb://{username}:{password}@{host}:{port}/"
-        uri += f"?authSource={auth_source}"
-        self.client = MongoClient(uri)
+    def __init__(self, host, port, username, password, database=None, auth_source="admin", raw_bson=False,
+                 client=None, batch_size=DEFAULT_BATCH_SIZE, allow_disk_use=False, catalog_ttl=CATALOG_TTL,
+                 **client_options):
+        # A shared client (and its connection pool) is left open when this connector closes
+        self.owns_client = client is None
+        if client is None:
+            client = MongoClient(mongodb_uri(host, port, username, password, auth_source), **client_options)
+        self.client = client
+        self.default_database = database
         self.database = self.client[database] if database else None
+        # Return query results as RawBSONDocument, fields are decoded only when accessed.
+        # The client's other codec options (tz_aware, uuid_representation, ...) still apply.
+        self.raw_bson = raw_bson
+        # Documents per getMore round trip, and whether sorts and groups may spill to disk
+        self.batch_size = batch_size
+        self.allow_disk_use = allow_disk_use
+        # Database, collection and index names, so existence checks skip a round trip
+        self.catalog = MongoCatalog(self.client, catalog_ttl)
+        # Explain-verified index hints per query shape
+        self.index_advisor = IndexAdvisor()
+
+    def ping(self):
+        try:
+            self.client.admin.command("ping")
+            return True
+        except Exception:
+            return False
+
+    def reset(self):
+        self.database = self.client[self.default_database] if self.default_database else None
+
+    def _result_collection(self, name):
+        collection = self.database[name]
+        if self.raw_bson:
+            return collection.with_options(codec_options=collection.codec_options.with_options(document_class=RawBSONDocument))
+        return collection
 
     def close(self):
-        if self.client:
+        if self.client and self.owns_client:
             self.client.close()
 
+    # Only FIND and AGGREGATE are streamed, other operations return the same value as run_query
+    def stream(self, query, parameters=None, batch_size=DEFAULT_BATCH_SIZE, prefetch=True):
+        operation = query.get("operation")
+        if operation not in ("FIND", "AGGREGATE"):
+            result = self.run_query(query)
+            return iter(result) if isinstance(result, list) else result
+
+        # A BATCH hint on the query wins over the engine's batch size
+        batch_size = query.get("batch_size") or batch_size
+        try:
+            if operation == "FIND":
+                cursor = self._find_cursor(query).batch_size(batch_size)
+            else:
+                collection = self._result_collection(query.get("collection"))
+                cursor = self._aggregate(collection, query.get("pipeline", []), batchSize=batch_size,
+                                         **self._command_options(query))
+        except Exception as err:
+            raise Exception(f"MongoDB Error: {str(err)}")
+        return self._wrap_errors(stream_rows(batched(cursor, batch_size), prefetch))
+
+    @staticmethod
+    def _wrap_errors(rows):
+        try:
+            yield from rows
+        except Exception as err:
+            raise Exception(f"MongoDB Error: {str(err)}")
+
+    # Sampled schema and index documents of a collection, loaded into the catalog when missing
+    def describe_collection(self, collection):
+        if self.database is None:
+            return None, None
+        schema = self.catalog.schema(self.database.name, collection)
+        try:
+            indexes = self.catalog.indexes(self.database.name, collection)
+        except pymongo.errors.OperationFailure as err:
+            # Views have no indexes to list
+            logger.warning("Cannot list the indexes of `%s`: %s", collection, err)
+            indexes = None
+        return schema, indexes
+
+    # The planner's covering index, or the candidate explain found cheapest
+    def _index_hint(self, query):
+        if query.get("hint"):
+            return query["hint"]
+        candidates = query.get("hint_candidates")
+        if not candidates:
+            return None
+        return self.index_advisor.choose(self.database, query, candidates)
+
+    # hint and maxTimeMS of a query, for the commands that take them as options
+    def _command_options(self, query):
+        options = {}
+        hint = self._index_hint(query)
+        if hint:
+            options["hint"] = hint
+        if query.get("max_time_ms"):
+            options["maxTimeMS"] = query["max_time_ms"]
+        return options
+
+    # Writes take no maxTimeMS option, the client side timeout sends one instead
+    @staticmethod
+    def _write_timeout(query):
+        if query.get("max_time_ms"):
+            return pymongo.timeout(query["max_time_ms"] / 1000)
+        return nullcontext()
+
+    def _describe_collection(self, table):
+        # The metadata calls are independent, so they run concurrently
+        collection = self.database[table]
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            count = executor.submit(collection.estimated_document_count)
+            coll_stats = executor.submit(self.database.command, "collstats", table)
+            indexes = executor.submit(self.catalog.indexes, self.database.name, table)
+            schema = executor.submit(self.catalog.schema, self.database.name, table)
+        coll_stats = coll_stats.result()
+        schema = schema.result()
+        return {
+            "collection": table,
+            "indexes": [{"name": idx["name"], "keys": list(idx["key"].items())} for idx in indexes.result()],
+            "stats": {
+                "count": count.result(),
+                "size": coll_stats.get("size", 0),
+                "storageSize": coll_stats.get("storageSize", 0)
+            },
+            "sample_fields": list(schema["fields"]),
+            "schema": schema
+        }
+
+    def _has_collection(self, name):
+        return self.catalog.has_collection(self.database.name, name)
+
+    def _aggregate(self, collection, pipeline, **options):
+        if self.allow_disk_use:
+            options["allowDiskUse"] = True
+        return collection.aggregate(pipeline, **options)
+
+    def _find_cursor(self, query):
+        collection = self._result_collection(query.get("collection"))
+        projection = query.get("projection", {})
+        cursor = collection.find(query.get("filter", {}), projection if projection else None,
+                                 allow_disk_use=True if self.allow_disk_use else None)
+        hint = self._index_hint(query)
+        if hint:
+            cursor = cursor.hint(hint)
+        if query.get("max_time_ms"):
+            cursor = cursor.max_time_ms(query["max_time_ms"])
+        if query.get("sort"):
+            cursor = cursor.sort(query.get("sort"))
+        if query.get("skip"):
+            cursor = cursor.skip(query.get("skip"))
+        if query.get("limit"):
+            cursor = cursor.limit(query.get("limit"))
+        return cursor
+
     def run_query(self, query):
         try:
             operation = query.get("operation")
@@ -19,136 +181,154 @@ class MongoDBConnector():
             # Database
             if operation == 'CREATE_DATABASE':
                 database_name = query.get("database_name")
-                if database_name in self.client.list_database_names():
+                if self.catalog.has_database(database_name):
                     raise Exception(f"Database `{database_name}` already exist")
                 db = self.client[database_name]
                 db["__init__"].insert_one({"created_by": "uniquery"})
+                self.catalog.collection_created(database_name, "__init__")
                 return True
             elif operation == 'USE_DATABASE':
                 database_name = query.get("database_name")
-                if database_name not in self.client.list_database_names():
+                if not self.catalog.has_database(database_name):
                     raise Exception(f"Database `{database_name}` does not exist")
                 self.database = self.client[database_name]
                 print(self.database)
                 return True
             elif operation == 'DROP_DATABASE':
                 database_name = query.get("database_name")
-                if database_name not in self.client.list_database_names():
+                if not self.catalog.has_database(database_name):
                     raise Exception(f"Database `{database_name}` does not exist")
                 self.client.drop_database(database_name)
+                self.catalog.database_dropped(database_name)
+                self.index_advisor.invalidate(database_name)
                 return True
             elif operation == 'SHOW_DATABASES':
-                database_names = self.client.list_database_names()
+                database_names = self.catalog.database_names()
                 return database_names
 
             # Table
             if operation == 'CREATE_COLLECTION':
                 table = query.get("table")
-                if table in self.database.list_collection_names():
+                if self._has_collection(table):
                     raise Exception(f"Collection `{table}` already exist")
                 self.database.create_collection(table)
+                self.catalog.collection_created(self.database.name, table)
                 return True
             elif operation == 'DROP_COLLECTION':
                 table = query.get("table")
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     raise Exception(f"Collection `{table}` does not exist")
                 self.database[table].drop()
+                self.catalog.collection_dropped(self.database.name, table)
+                self.index_advisor.invalidate(self.database.name, table)
                 return True
             elif operation == 'RENAME_COLLECTION':
                 old_name = query.get("old_name")
                 new_name = query.get("new_name")
-                if old_name not in self.database.list_collection_names():
+                if not self._has_collection(old_name):
                     raise Exception(f"Collection `{old_name}` does not exist")
                 self.database[old_name].rename(new_name)
+                self.catalog.collection_dropped(self.database.name, old_name)
+                self.index_advisor.invalidate(self.database.name, old_name)
+                self.catalog.collection_created(self.database.name, new_name)
                 return True
             elif operation == 'SHOW_COLLECTIONS':
-                return self.database.list_collection_names()
+                return self.catalog.collection_names(self.database.name)
             elif operation == 'SHOW_COLLECTION':
                 table = query.get("table_name")
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     raise Exception(f"Collection `{table}` does not exist")
-                collection = self.database[table]
-                stats = collection.estimated_document_count()
-                coll_stats = self.database.command("collstats", table)
-                indexes = list(collection.list_indexes())
-                index_data = [{"name": idx["name"], "keys": list(idx["key"].items())} for idx in indexes]
-                sample = collection.find_one()
-                sample_fields = list(sample.keys()) if sample else []
-                return {
-                    "collection": table,
-                    "indexes": index_data,
-                    "stats": {
-                        "count": stats,
-                        "size": coll_stats.get("size", 0),
-                        "storageSize": coll_stats.get("storageSize", 0)
-                    },
-                    "sample_fields": sample_fields
-                }
+                return self._describe_collection(table)
             elif operation == 'CREATE_INDEX':
                 table = query.get("table")
                 index_name = query.get("index_name")
                 columns = query.get("columns")
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     raise Exception(f"Collection `{table}` does not exist")
                 collection = self.database[table]
-                existing_indexes = [idx["name"] for idx in collection.list_indexes()]
-                if index_name in existing_indexes:
+                if self.catalog.has_index(self.database.name, table, index_name):
                     raise Exception(f"Index `{index_name}` already exist")
                 keys = [(col, 1) for col in columns]
                 collection.create_index(keys, name=index_name)
+                self.catalog.invalidate(self.database.name, table)
+                self.index_advisor.invalidate(self.database.name, table)
                 return True
             elif operation == 'DROP_INDEX':
                 table = query.get("table")
                 index_name = query.get("index_name")
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     raise Exception(f"Collection `{table}` does not exist")
                 collection = self.database[table]
-                existing_indexes = [idx["name"] for idx in collection.list_indexes()]
-                if index_name not in existing_indexes:
+                if not self.catalog.has_index(self.database.name, table, index_name):
                     raise Exception(f"Index `{index_name}` does not exist")
                 collection.drop_index(index_name)
+                self.catalog.invalidate(self.database.name, table)
+                self.index_advisor.invalidate(self.database.name, table)
                 return True
             elif operation == "INSERT_DATA":
                 table = query.get("collection")
                 documents = query.get("documents", [])
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     self.database.create_collection(table)
+                    self.catalog.collection_created(self.database.name, table)
                 result = self.database[table].insert_many(documents)
                 return result
             elif operation == "UPDATE_DATA":
                 table = query.get("collection")
                 updates = query.get("updates", {})
                 filter_criteria = query.get("filter", {})
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     raise Exception(f"Collection `{table}` does not exist")
-                result = self.database[table].update_many(filter_criteria, {"$set": updates})
+                options = {"hint": query["hint"]} if query.get("hint") else {}
+                with self._write_timeout(query):
+                    result = self.database[table].update_many(filter_criteria, {"$set": updates}, **options)
                 return result
             elif operation == "DELETE_DATA":
                 table = query.get("collection")
                 filter_criteria = query.get("filter", {})
-                if table not in self.database.list_collection_names():
+                if not self._has_collection(table):
                     raise Exception(f"Collection `{table}` does not exist")
-                result = self.database[table].delete_many(filter_criteria)
+                options = {"hint": query["hint"]} if query.get("hint") else {}
+                with self._write_timeout(query):
+                    result = self.database[table].delete_many(filter_criteria, **options)
                 return result
             elif operation == "FIND":
-                table = query.get("collection")
-                collection = self.database[table]
-                filter_criteria = query.get("filter", {})
-                projection = query.get("projection", {})
-                sort = query.get("sort")
-                limit = query.get("limit")
-                cursor = collection.find(filter_criteria, projection if projection else None)
-                if sort:
-                    cursor = cursor.sort(sort)
-                if limit:
-                    cursor = cursor.limit(limit)
-                result = list(cursor)
-                return result
+                return list(self._find_cursor(query).batch_size(query.get("batch_size") or self.batch_size))
+            elif operation == "FIND_ONE":
+                collection = self._result_collection(query.get("collection"))
+                projection = query.get("projection")
+                document = collection.find_one(query.get("filter", {}), projection if projection else None,
+                                               sort=query.get("sort"), hint=self._index_hint(query),
+                                               max_time_ms=query.get("max_time_ms"))
+                return [document] if document is not None else []
+            elif operation == "DISTINCT":
+                collection = self.database[query.get("collection")]
+                alias = query.get("alias", query.get("key"))
+                values = collection.distinct(query.get("key"), query.get("filter", {}), **self._command_options(query))
+                return [{alias: value} for value in values]
+            elif operation == "COUNT":
+                collection = self.database[query.get("collection")]
+                options = self._command_options(query)
+                if query.get("estimated"):
+                    # Read from collection metadata, no documents are scanned
+                    options.pop("hint", None)
+                    count = collection.estimated_document_count(**options)
+                else:
+                    count = collection.count_documents(query.get("filter", {}), **options)
+                return [{query.get("alias", "count"): count}]
+            elif operation == "EXISTS":
+                collection = self.database[query.get("collection")]
+                if query.get("pipeline"):
+                    found = next(collection.aggregate(query.get("pipeline")), None) is not None
+                else:
+                    found = collection.find_one(query.get("filter", {}), {"_id": 1}) is not None
+                return [{query.get("alias", "exists"): found}]
             elif operation == "AGGREGATE":
                 table = query.get("collection")
                 pipeline = query.get("pipeline", [])
-                collection = self.database[table]
-                return list(collection.aggregate(pipeline))
+                collection = self._result_collection(table)
+                return list(self._aggregate(collection, pipeline, batchSize=query.get("batch_size") or self.batch_size,
+                                            **self._command_options(query)))
 
             raise Exception(f"Unsupported operation: {operation}")
 
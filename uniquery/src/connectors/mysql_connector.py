@@ -1,34 +1,112 @@
 import mysql.connector
-from tabulate import tabulate
+
+from .streaming import DEFAULT_BATCH_SIZE, fetchmany_batches, stream_rows
+from ..query_engine.result_set import ResultSet
 
 class MySQLConnector():
-    def __init__(self, host, port, username, password, database=None):
+    def __init__(self, host, port, username, password, database=None, batch_size=DEFAULT_BATCH_SIZE,
+                 session_variables=None, **connect_options):
+        # The C extension is used when it is installed, connect(use_pure=False) fails without it
         self.connection = mysql.connector.connect(
             host=host,
             port=port,
             user=username,
             password=password,
-            database=database
+            database=database,
+            use_pure=not mysql.connector.HAVE_CEXT,
+            autocommit=True,
+            **connect_options
         )
-        self.cursor = self.connection.cursor(dictionary=True)
+        self.batch_size = batch_size
+        # Server settings of the session, applied again after every reset
+        self.session_variables = session_variables or {}
+        self._set_session_variables()
 
     def close(self):
-        if self.cursor:
-            self.cursor.close()
         if self.connection:
             self.connection.close()
 
-    def run_query(self, query):
+    def ping(self):
+        try:
+            self.connection.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def reset(self):
+        # Drops session state (USE, variables, temporary tables) before the next checkout
+        self.connection.reset_session()
+        self._set_session_variables()
+
+    def _set_session_variables(self):
+        if not self.session_variables:
+            return
+        assignments = ', '.join(f"SESSION {name} = %s" for name in self.session_variables)
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SET {assignments}", tuple(self.session_variables.values()))
+        finally:
+            cursor.close()
+
+    # Statements without a result set return their row count
+    def run_query(self, query, parameters=None):
+        try:
+            cursor = self._execute(query, parameters)
+            if not cursor.with_rows:
+                return _affected(cursor)
+
+            result_set = ResultSet(_column_names(cursor))
+            for batch in fetchmany_batches(cursor, self.batch_size):
+                result_set.extend_tuples(batch)
+            return result_set if len(result_set) else None
+
+        except Exception as err:
+            raise Exception(f"MySQL Error: {str(err)}")
+
+    # Each stream reads from an unbuffered cursor of its own
+    def stream(self, query, parameters=None, batch_size=DEFAULT_BATCH_SIZE, prefetch=True):
         try:
-            self.cursor.execute(query)
-            results = self.cursor.fetchall()
+            cursor = self._execute(query, parameters)
+        except Exception as err:
+            raise Exception(f"MySQL Error: {str(err)}")
 
-            if not results:
-                return None
+        if not cursor.with_rows:
+            return _affected(cursor)
+        columns = _column_names(cursor)
+        rows = (dict(zip(columns, row)) for row in stream_rows(fetchmany_batches(cursor, batch_size), prefetch))
+        return self._wrap_errors(rows)
 
-            headers = results[0].keys()
-            rows = [list(r.values()) for r in results]
-            return tabulate(rows, headers=headers, tablefmt="fancy_grid")
+    def _execute(self, query, parameters):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, parameters)
+        except Exception:
+            cursor.close()
+            raise
+        return cursor
 
+    @staticmethod
+    def _wrap_errors(rows):
+        try:
+            yield from rows
         except Exception as err:
-            raise Exception(f"MySQL Error: {str(err)}")
\ No newline at end of file
+            raise Exception(f"MySQL Error: {str(err)}")
+
+
+def _affected(cursor):
+    rowcount = cursor.rowcount
+    cursor.close()
+    return {'rows_affected': rowcount}
+
+
+# Tuple rows keep every selected column, repeated names get a numeric suffix
+def _column_names(cursor):
+    names = []
+    for name in cursor.column_names:
+        unique = name
+        suffix = 1
+        while unique in names:
+            unique = f"{name}_{suffix}"
+            suffix += 1
+        names.append(unique)
+    return names
@@ -1,40 +1,112 @@
-from neo4j import GraphDatabase
-from tabulate import tabulate
+from neo4j import GraphDatabase, Query, READ_ACCESS, WRITE_ACCESS, unit_of_work
+
+from .streaming import DEFAULT_BATCH_SIZE, batched, stream_rows
 
 class Neo4jConnector():
-    def __init__(self, uri, username, password):
-        self.driver = GraphDatabase.driver(uri, auth=(username, password))
+    def __init__(self, uri, username, password, database=None, fetch_size=DEFAULT_BATCH_SIZE, driver=None,
+                 routing='auto', **driver_options):
+        # A shared driver (and its connection pool) is left open when this connector closes
+        self.owns_driver = driver is None
+        self.driver = driver if driver is not None else GraphDatabase.driver(uri, auth=(username, password),
+                                                                             **driver_options)
+        self.database = database
+        # Records pulled from the server per round trip
+        self.fetch_size = fetch_size
+        # `auto` routes each query by the statement it was translated from, `read` or `write`
+        # sends every query the same way
+        self.routing = routing
+        # Long-lived sessions, one per access mode, opened on first use
+        self._sessions = {}
 
     def close(self):
-        if self.driver:
+        for session in self._sessions.values():
+            session.close()
+        self._sessions.clear()
+        if self.driver and self.owns_driver:
             self.driver.close()
 
-    def run_query(self, query):
+    def ping(self):
+        try:
+            self.driver.verify_connectivity()
+            return True
+        except Exception:
+            return False
+
+    # Managed transactions are retried by the driver on transient errors, `timeout` is in seconds
+    def run_query(self, query, parameters=None):
+        access_mode = self._access_mode(query)
+        timeout = getattr(query, 'timeout', None)
         try:
-            with self.driver.session() as session:
-                result = session.run(query)
-                records = [record.data() for record in result]
-
-                if not records:
-                    return None
-
-                # Flatten if the result is nested
-                flat_records = []
-                for record in records:
-                    flat = {}
-                    for key, value in record.items():
-                        if isinstance(value, dict):
-                            # Flatten nested dictionary
-                            for sub_key, sub_value in value.items():
-                                flat[sub_key] = sub_value
-                        else:
-                            flat[key] = value
-                    flat_records.append(flat)
-
-                headers = flat_records[0].keys()
-                rows = [list(r.values()) for r in flat_records]
-
-                return tabulate(rows, headers=headers, tablefmt="fancy_grid")
+            session = self._session(access_mode)
+            work = session.execute_write if access_mode == WRITE_ACCESS else session.execute_read
+            rows = work(unit_of_work(timeout=timeout)(_collect) if timeout else _collect, query, parameters)
+            return rows if rows else None
+
+        except Exception as err:
+            self._discard(access_mode)
+            raise Exception(f"Neo4j Error: {str(err)}")
 
+    # Only one stream per connector can be open at a time
+    def stream(self, query, parameters=None, batch_size=DEFAULT_BATCH_SIZE, prefetch=True):
+        access_mode = self._access_mode(query)
+        timeout = getattr(query, 'timeout', None)
+        try:
+            result = self._session(access_mode).run(Query(query, timeout=timeout) if timeout else query, parameters)
+            keys = result.keys()
         except Exception as err:
-            raise Exception(f"Neo4j Error: {str(err)}")
\ No newline at end of file
+            self._discard(access_mode)
+            raise Exception(f"Neo4j Error: {str(err)}")
+
+        return self._wrap_errors(stream_rows(batched(_records(result, keys), batch_size), prefetch))
+
+    def _access_mode(self, query):
+        if self.routing == 'read':
+            return READ_ACCESS
+        if self.routing == 'write':
+            return WRITE_ACCESS
+        return _access_mode(query)
+
+    def _session(self, access_mode):
+        session = self._sessions.get(access_mode)
+        if session is None or session.closed():
+            session = self.driver.session(database=self.database, fetch_size=self.fetch_size,
+                                          default_access_mode=access_mode)
+            self._sessions[access_mode] = session
+        return session
+
+    # A failed session is replaced on the next query
+    def _discard(self, access_mode):
+        session = self._sessions.pop(access_mode, None)
+        if session is not None:
+            try:
+                session.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _wrap_errors(rows):
+        try:
+            yield from rows
+        except Exception as err:
+            raise Exception(f"Neo4j Error: {str(err)}")
+
+
+# Translated SELECT and EXISTS statements read, native Cypher text is not parsed and goes to the writer
+def _access_mode(query):
+    return READ_ACCESS if getattr(query, 'read_only', False) else WRITE_ACCESS
+
+
+# The records of an abandoned stream are discarded, so the session is free for the next query
+def _records(result, keys):
+    try:
+        for record in result:
+            yield dict(zip(keys, record))
+    finally:
+        result.consume()
+
+
+# Records are tuples in RETURN order, zipping with the keys skips record.data() conversion
+def _collect(tx, query, parameters):
+    result = tx.run(query, parameters)
+    keys = result.keys()
+    return [dict(zip(keys, record)) for record in result]
@@ -0,0 +1,353 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from neo4j import GraphDatabase
+from pymongo import MongoClient
+
+from .mysql_connector import MySQLConnector
+from .mongodb_connector import MongoDBConnector, mongodb_uri
+from .neo4j_connector import Neo4jConnector
+from .profile import mongodb_client_options, mongodb_connector_options, mysql_connector_options, \
+    neo4j_connector_options, profile_pool_config
+from ..utils.constants import DatabaseType
+
+
+@dataclass
+class PoolConfig:
+    min_size: int = 1
+    max_size: int = 8
+    # Seconds a connector may stay idle before it is closed, down to `min_size`
+    max_idle_time: float = 300.0
+    # Seconds after which an idle connector is pinged again before it is reused
+    health_check_interval: float = 30.0
+    # Seconds a checkout waits for a free connector
+    acquire_timeout: float = 30.0
+
+
+# `on_close` releases what the connectors share once the last checked out connector is back
+class ConnectorPool:
+    def __init__(self, factory, config: PoolConfig = None, on_close=None):
+        self.factory = factory
+        self.config = config if config is not None else PoolConfig()
+        self.on_close = on_close
+        self._condition = threading.Condition()
+        # Idle connectors as [connector, idle_since, checked_at], most recently used last
+        self._idle = []
+        self._in_use = {}
+        self._size = 0
+        self._waiting = 0
+        self._closed = False
+        self._counters = {'checkouts': 0, 'timeouts': 0, 'created': 0, 'evicted': 0, 'unhealthy': 0}
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    def acquire(self, timeout: float = None):
+        timeout = self.config.acquire_timeout if timeout is None else timeout
+        start = time.monotonic()
+        with self._condition:
+            self._waiting += 1
+            try:
+                while True:
+                    if self._closed:
+                        raise Exception("Connection pool is closed")
+                    if self._idle:
+                        entry = self._idle.pop()
+                        break
+                    if self._size < self.config.max_size:
+                        self._size += 1
+                        entry = None
+                        break
+                    remaining = start + timeout - time.monotonic()
+                    if remaining <= 0:
+                        self._counters['timeouts'] += 1
+                        raise Exception(f"Timed out after {timeout}s waiting for a pooled connection")
+                    self._condition.wait(remaining)
+            finally:
+                self._waiting -= 1
+            waited = time.monotonic() - start
+            self._wait_time_total += waited
+            self._wait_time_max = max(self._wait_time_max, waited)
+
+        try:
+            connector, checked_at = self._healthy(entry)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._in_use[id(connector)] = (connector, checked_at)
+            self._counters['checkouts'] += 1
+        return connector
+
+    # Returns a connector to the pool, a broken one is closed and replaced on demand
+    def release(self, connector, broken: bool = False) -> None:
+        if not broken and hasattr(connector, 'reset'):
+            try:
+                connector.reset()
+            except Exception:
+                broken = True
+
+        with self._condition:
+            if id(connector) not in self._in_use:
+                raise Exception("Connector was not checked out from this pool")
+            _, checked_at = self._in_use.pop(id(connector))
+            discard = broken or self._closed
+            if discard:
+                self._size -= 1
+            else:
+                self._idle.append([connector, time.monotonic(), checked_at])
+            expired = self._expired()
+            finished = self._closed and not self._in_use
+            self._condition.notify()
+
+        for stale in ([connector] if discard else []) + expired:
+            _close(stale)
+        if finished and self.on_close:
+            self.on_close()
+
+    @contextmanager
+    def connection(self, timeout: float = None):
+        connector = self.acquire(timeout)
+        try:
+            yield connector
+        except Exception:
+            self.release(connector, broken=not _is_alive(connector))
+            raise
+        self.release(connector)
+
+    # Closes connectors idle for longer than `max_idle_time`, keeping `min_size`
+    def evict_idle(self) -> int:
+        with self._condition:
+            expired = self._expired()
+        for connector in expired:
+            _close(connector)
+        return len(expired)
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'size': self._size,
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'max_size': self.config.max_size,
+                'wait_time_total': round(self._wait_time_total, 6),
+                'wait_time_max': round(self._wait_time_max, 6),
+                **self._counters
+            }
+
+    # Closes idle connectors now and checked out ones when they are released
+    def close(self) -> None:
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            idle = [entry[0] for entry in self._idle]
+            self._size -= len(idle)
+            self._idle.clear()
+            finished = not self._in_use
+            self._condition.notify_all()
+        for connector in idle:
+            _close(connector)
+        if finished and self.on_close:
+            self.on_close()
+
+    # Called with the lock held, removes expired idle connectors and returns them
+    def _expired(self):
+        now = time.monotonic()
+        expired = []
+        for entry in list(self._idle):
+            if self._size <= self.config.min_size:
+                break
+            if now - entry[1] > self.config.max_idle_time:
+                self._idle.remove(entry)
+                self._size -= 1
+                self._counters['evicted'] += 1
+                expired.append(entry[0])
+        return expired
+
+    # Reuses an idle connector that passes its health check, or creates a new one
+    def _healthy(self, entry):
+        if entry is not None:
+            connector, _, checked_at = entry
+            now = time.monotonic()
+            if now - checked_at < self.config.health_check_interval:
+                return connector, checked_at
+            if _is_alive(connector):
+                return connector, now
+            with self._condition:
+                self._counters['unhealthy'] += 1
+            _close(connector)
+
+        connector = self.factory()
+        with self._condition:
+            self._counters['created'] += 1
+        return connector, time.monotonic()
+
+
+# One ConnectorPool per alias, rebuilt when the alias details change; the least recently used idle pool is closed first
+class PoolManager:
+    def __init__(self, config: PoolConfig = None, factory_builder=None, max_pools: int = None,
+                 idle_timeout: float = None):
+        self.config = config if config is not None else PoolConfig()
+        self.factory_builder = factory_builder if factory_builder is not None else pooled_connector_factory
+        self.max_pools = max_pools
+        self.idle_timeout = idle_timeout
+        # alias -> [connection details, pool, last used], least recently used first
+        self._pools = OrderedDict()
+        # Pool of every checked out connector, which survives a rebuild of its alias pool
+        self._owners = {}
+        self._lock = threading.Lock()
+
+    def pool(self, alias: str, connection_details: dict) -> ConnectorPool:
+        stale = []
+        with self._lock:
+            details, pool, _ = self._pools.get(alias, (None, None, None))
+            if pool is None or details != connection_details:
+                if pool is not None:
+                    stale.append(pool)
+                config = profile_pool_config(self.config, connection_details.get('profile', {}))
+                factory, on_close = self.factory_builder(alias, connection_details, config)
+                pool = ConnectorPool(factory, config, on_close)
+            self._pools[alias] = [dict(connection_details), pool, time.monotonic()]
+            self._pools.move_to_end(alias)
+            stale += self._evicted(keep=alias)
+        for old in stale:
+            old.close()
+        return pool
+
+    def acquire(self, alias: str, connection_details: dict, timeout: float = None):
+        pool = self.pool(alias, connection_details)
+        connector = pool.acquire(timeout)
+        with self._lock:
+            self._owners[id(connector)] = pool
+        return connector
+
+    def release(self, alias: str, connector, broken: bool = False) -> None:
+        with self._lock:
+            pool = self._owners.pop(id(connector), None)
+            if alias in self._pools:
+                self._pools[alias][2] = time.monotonic()
+        if pool is None:
+            _close(connector)
+            return
+        pool.release(connector, broken)
+
+    @contextmanager
+    def connection(self, alias: str, connection_details: dict, timeout: float = None):
+        with self.pool(alias, connection_details).connection(timeout) as connector:
+            yield connector
+
+    # Failures are left for the first real checkout to report
+    def prewarm(self, alias: str, connection_details: dict) -> threading.Thread:
+        def warm():
+            try:
+                connector = self.acquire(alias, connection_details)
+            except Exception:
+                return
+            self.release(alias, connector)
+
+        thread = threading.Thread(target=warm, name=f'uniquery-prewarm-{alias}', daemon=True)
+        thread.start()
+        return thread
+
+    # Closes pools unused for `idle_timeout` seconds and idle connectors of the others
+    def evict_idle(self) -> None:
+        with self._lock:
+            stale = self._evicted()
+            pools = [entry[1] for entry in self._pools.values()]
+        for pool in stale:
+            pool.close()
+        for pool in pools:
+            pool.evict_idle()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pools = {alias: entry[1] for alias, entry in self._pools.items()}
+        return {alias: pool.stats() for alias, pool in pools.items()}
+
+    def close(self, alias: str = None) -> None:
+        with self._lock:
+            aliases = [alias] if alias is not None else list(self._pools)
+            pools = [self._pools.pop(name)[1] for name in aliases if name in self._pools]
+        for pool in pools:
+            pool.close()
+
+    # Called with the lock held, removes pools over the limits that have nothing checked out
+    def _evicted(self, keep: str = None):
+        now = time.monotonic()
+        evicted = []
+        for alias, (_, pool, last_used) in list(self._pools.items()):
+            if alias == keep or pool.stats()['in_use']:
+                continue
+            over_limit = self.max_pools is not None and len(self._pools) > self.max_pools
+            expired = self.idle_timeout is not None and now - last_used > self.idle_timeout
+            if over_limit or expired:
+                del self._pools[alias]
+                evicted.append(pool)
+        return evicted
+
+
+# Connector factory of an alias and the callback closing the client or driver its connectors share
+def pooled_connector_factory(alias: str, connection_details: dict, config: PoolConfig):
+    database_type = DatabaseType(connection_details['type'])
+    profile = connection_details.get('profile', {})
+
+    if database_type == DatabaseType.MYSQL:
+        # One connection per connector, the pool here bounds their number and closes them
+        def factory():
+            return MySQLConnector(
+                connection_details['host'],
+                connection_details['port'],
+                connection_details['username'],
+                connection_details['password'],
+                connection_details['database'],
+                **mysql_connector_options(profile)
+            )
+        return factory, None
+
+    elif database_type == DatabaseType.MONGO_DB:
+        uri = mongodb_uri(connection_details['host'], connection_details['port'],
+                          connection_details['username'], connection_details['password'])
+        client = MongoClient(uri, **{**mongodb_client_options(profile), 'maxPoolSize': config.max_size,
+                                     'minPoolSize': config.min_size,
+                                     'maxIdleTimeMS': int(config.max_idle_time * 1000)})
+
+        def factory():
+            return MongoDBConnector(None, None, None, None, connection_details['database'],
+                                    raw_bson=connection_details.get('raw_bson', False), client=client,
+                                    **mongodb_connector_options(profile))
+        return factory, client.close
+
+    elif database_type == DatabaseType.NEO4J:
+        # The Neo4j driver has no minimum pool size, idle connections are checked for liveness instead
+        driver = GraphDatabase.driver(
+            connection_details['uri'],
+            auth=(connection_details['username'], connection_details['password']),
+            max_connection_pool_size=config.max_size,
+            liveness_check_timeout=config.health_check_interval
+        )
+
+        def factory():
+            return Neo4jConnector(None, None, None, connection_details.get('database'), driver=driver,
+                                  **neo4j_connector_options(profile))
+        return factory, driver.close
+
+    raise Exception(f"Connection pooling is not supported for database type: {database_type.value}")
+
+
+def _is_alive(connector):
+    ping = getattr(connector, 'ping', None)
+    return ping() if ping else True
+
+
+def _close(connector):
+    try:
+        connector.close()
+    except Exception:
+        pass
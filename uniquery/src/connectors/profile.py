@@ -0,0 +1,107 @@
+from dataclasses import replace
+
+PROFILE_OPTIONS = {
+    'mongodb': ('max_pool_size', 'min_pool_size', 'compressors', 'read_preference', 'write_concern',
+                'allow_disk_use', 'batch_size'),
+    'neo4j': ('fetch_size', 'routing'),
+    'mysql': ('pool_size', 'compress', 'max_execution_time')
+}
+
+MONGODB_COMPRESSORS = ('zstd', 'snappy', 'zlib')
+
+MONGODB_READ_PREFERENCES = ('primary', 'primaryPreferred', 'secondary', 'secondaryPreferred', 'nearest')
+
+# `auto` picks read or write routing per query, `read` and `write` pin every query to one
+NEO4J_ROUTING = ('auto', 'read', 'write')
+
+_POSITIVE_INTEGERS = ('max_pool_size', 'min_pool_size', 'batch_size', 'fetch_size', 'pool_size',
+                      'max_execution_time')
+
+
+def validate_profile(database_type: str, profile: dict) -> dict:
+    allowed = PROFILE_OPTIONS.get(database_type, ())
+    profile = {name: value for name, value in profile.items() if value is not None}
+
+    for name, value in profile.items():
+        if name not in allowed:
+            raise Exception(f"Option `{name}` is not available for {database_type}")
+        if name in _POSITIVE_INTEGERS and (isinstance(value, bool) or not isinstance(value, int) or value < 1):
+            raise Exception(f"Option `{name}` must be a positive integer")
+
+    compressors = profile.get('compressors')
+    if compressors is not None:
+        if isinstance(compressors, str):
+            compressors = [name.strip() for name in compressors.split(',') if name.strip()]
+        unknown = [name for name in compressors if name not in MONGODB_COMPRESSORS]
+        if unknown or not compressors:
+            raise Exception(f"Compressors must be a list of: {', '.join(MONGODB_COMPRESSORS)}")
+        profile['compressors'] = list(compressors)
+
+    if profile.get('read_preference', 'primary') not in MONGODB_READ_PREFERENCES:
+        raise Exception(f"Read preference must be one of: {', '.join(MONGODB_READ_PREFERENCES)}")
+
+    write_concern = profile.get('write_concern')
+    if write_concern is not None:
+        if isinstance(write_concern, str) and write_concern.isdigit():
+            write_concern = int(write_concern)
+        if write_concern != 'majority' and (isinstance(write_concern, bool) or not isinstance(write_concern, int)):
+            raise Exception("Write concern must be `majority` or a number of nodes")
+        profile['write_concern'] = write_concern
+
+    if profile.get('routing', 'auto') not in NEO4J_ROUTING:
+        raise Exception(f"Routing must be one of: {', '.join(NEO4J_ROUTING)}")
+
+    if profile.get('min_pool_size', 0) > profile.get('max_pool_size', profile.get('min_pool_size', 0)):
+        raise Exception("Option `min_pool_size` cannot be larger than `max_pool_size`")
+    return profile
+
+
+def mongodb_client_options(profile: dict) -> dict:
+    options = {}
+    if 'max_pool_size' in profile:
+        options['maxPoolSize'] = profile['max_pool_size']
+    if 'min_pool_size' in profile:
+        options['minPoolSize'] = profile['min_pool_size']
+    if 'compressors' in profile:
+        options['compressors'] = ','.join(profile['compressors'])
+    if 'read_preference' in profile:
+        options['readPreference'] = profile['read_preference']
+    if 'write_concern' in profile:
+        options['w'] = profile['write_concern']
+    return options
+
+
+def mongodb_connector_options(profile: dict) -> dict:
+    options = {}
+    if 'allow_disk_use' in profile:
+        options['allow_disk_use'] = profile['allow_disk_use']
+    if 'batch_size' in profile:
+        options['batch_size'] = profile['batch_size']
+    return options
+
+
+def mysql_connector_options(profile: dict) -> dict:
+    options = {}
+    if 'compress' in profile:
+        options['compress'] = profile['compress']
+    if 'max_execution_time' in profile:
+        # Milliseconds a SELECT may run before the server aborts it
+        options['session_variables'] = {'max_execution_time': profile['max_execution_time']}
+    return options
+
+
+def neo4j_connector_options(profile: dict) -> dict:
+    options = {}
+    if 'fetch_size' in profile:
+        options['fetch_size'] = profile['fetch_size']
+    if 'routing' in profile:
+        options['routing'] = profile['routing']
+    return options
+
+
+def profile_pool_config(config, profile: dict):
+    max_size = profile.get('max_pool_size', profile.get('pool_size', config.max_size))
+    min_size = min(profile.get('min_pool_size', config.min_size), max_size)
+    if (min_size, max_size) == (config.min_size, config.max_size):
+        return config
+    return replace(config, min_size=min_size, max_size=max_size)
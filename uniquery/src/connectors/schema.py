@@ -0,0 +1,73 @@
+import datetime
+import decimal
+
+from bson import Binary, Decimal128, ObjectId
+
+SCHEMA_SAMPLE_SIZE = 100
+
+_INT32_MIN = -2 ** 31
+_INT32_MAX = 2 ** 31 - 1
+
+
+def bson_type(value) -> str:
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int' if _INT32_MIN <= value <= _INT32_MAX else 'long'
+    if isinstance(value, float):
+        return 'double'
+    if isinstance(value, str):
+        return 'string'
+    if isinstance(value, datetime.datetime):
+        return 'date'
+    if isinstance(value, ObjectId):
+        return 'objectId'
+    if isinstance(value, (Decimal128, decimal.Decimal)):
+        return 'decimal'
+    if isinstance(value, (Binary, bytes)):
+        return 'binData'
+    if isinstance(value, dict):
+        return 'object'
+    if isinstance(value, (list, tuple)):
+        return 'array'
+    return type(value).__name__
+
+
+# Cardinality is scaled up to `total` when every sampled value was distinct, as for a key
+def infer_schema(documents, total: int = None) -> dict:
+    documents = list(documents)
+    sample_size = len(documents)
+    total = max(total or 0, sample_size)
+    fields = {}
+
+    for document in documents:
+        for name, value in document.items():
+            field = fields.get(name)
+            if field is None:
+                field = fields[name] = {'types': {}, 'count': 0, 'values': set()}
+            kind = bson_type(value)
+            field['types'][kind] = field['types'].get(kind, 0) + 1
+            field['count'] += 1
+            if kind != 'null':
+                try:
+                    field['values'].add(value)
+                except TypeError:
+                    # Documents and arrays are told apart by their text
+                    field['values'].add(repr(value))
+
+    schema = {}
+    for name, field in fields.items():
+        present = sum(count for kind, count in field['types'].items() if kind != 'null')
+        distinct = len(field['values'])
+        cardinality = distinct
+        if distinct and distinct == present and sample_size < total:
+            cardinality = round(distinct * total / sample_size)
+        schema[name] = {
+            # Most frequent type first
+            'types': sorted(field['types'], key=lambda kind: -field['types'][kind]),
+            'presence': round(field['count'] / sample_size, 4),
+            'cardinality': cardinality
+        }
+    return {'sample_size': sample_size, 'fields': schema}
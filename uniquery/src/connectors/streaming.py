@@ -0,0 +1,100 @@
+import queue
+import threading
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Queue item marking the end of the batches
+_DONE = object()
+
+
+def batched(rows, batch_size: int = DEFAULT_BATCH_SIZE):
+    if batch_size <= 0:
+        raise Exception("Batch size must be positive")
+    batch = []
+    try:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        # Driver cursors are closed as soon as the stream is done or abandoned
+        _close(rows)
+
+
+# An abandoned result is read to the end first, unbuffered cursors cannot be closed over unread rows
+def fetchmany_batches(cursor, batch_size: int = DEFAULT_BATCH_SIZE):
+    exhausted = False
+    try:
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                exhausted = True
+                return
+            yield batch
+    finally:
+        try:
+            while not exhausted and cursor.fetchmany(batch_size):
+                pass
+        finally:
+            cursor.close()
+
+
+def unbatched(batches):
+    try:
+        for batch in batches:
+            yield from batch
+    finally:
+        _close(batches)
+
+
+def _close(iterator):
+    close = getattr(iterator, 'close', None)
+    if close is not None:
+        close()
+
+
+# Closing the returned generator stops the worker and closes `batches` before close() returns
+def prefetch(batches, depth: int = 1):
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def worker():
+        try:
+            iterator = iter(batches)
+            while not stopped.is_set():
+                batch = next(iterator, _DONE)
+                if not _put(batch) or batch is _DONE:
+                    return
+        except BaseException as err:
+            _put(err)
+
+    def _put(item):
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    thread = threading.Thread(target=worker, name='uniquery-prefetch', daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+        thread.join()
+        _close(batches)
+
+
+def stream_rows(batches, prefetch_batches: bool = True):
+    return unbatched(prefetch(batches) if prefetch_batches else batches)
@@ -0,0 +1,6 @@
+from .formatter import OUTPUT_FORMATS, get_writer, normalize_output_format, write_result
+from .encoder import encode_value, to_json, raw_to_json
+from .writers import TableWriter, JsonWriter, NdjsonWriter, CsvWriter, RawWriter, BsonWriter
+
+__all__ = ['OUTPUT_FORMATS', 'get_writer', 'normalize_output_format', 'write_result', 'encode_value', 'to_json',
+           'raw_to_json', 'TableWriter', 'JsonWriter', 'NdjsonWriter', 'CsvWriter', 'RawWriter', 'BsonWriter']
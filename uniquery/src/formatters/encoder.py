@@ -0,0 +1,89 @@
+import base64
+import datetime
+import decimal
+import json
+import uuid
+from collections.abc import Mapping
+
+import bson
+from bson import ObjectId, Decimal128, Timestamp, Binary, Regex, json_util
+from bson.raw_bson import RawBSONDocument
+
+# Optional: converts raw BSON to extended JSON in C without building Python objects
+try:
+    import bsonjs
+except ImportError:
+    bsonjs = None
+
+
+# ObjectId, Decimal128, datetimes and binary values as plain JSON values
+def encode_value(value):
+    if isinstance(value, RawBSONDocument):
+        return bson.decode(value.raw)
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, Decimal128):
+        return str(value.to_decimal())
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if isinstance(value, Timestamp):
+        return {'t': value.time, 'i': value.inc}
+    if isinstance(value, Regex):
+        return value.pattern
+    if isinstance(value, (Binary, bytes, bytearray)):
+        return base64.b64encode(bytes(value)).decode()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    # Neo4j nodes and relationships are mappings of their properties
+    if isinstance(value, Mapping):
+        return dict(value)
+    # Neo4j paths
+    if hasattr(value, 'nodes') and hasattr(value, 'relationships'):
+        return [dict(node) for node in value.nodes]
+    # Neo4j temporal and spatial values
+    if hasattr(value, 'iso_format'):
+        return value.iso_format()
+    return str(value)
+
+
+class BsonJSONEncoder(json.JSONEncoder):
+
+    def default(self, value):
+        return encode_value(value)
+
+
+# Reused across rows, building an encoder per call dominates the cost of small rows
+_ENCODER = BsonJSONEncoder(ensure_ascii=False)
+
+
+def raw_to_json(document: RawBSONDocument) -> str:
+    if bsonjs is not None:
+        return bsonjs.dumps(bytes(document.raw), mode=bsonjs.RELAXED)
+    return json_util.dumps(bson.decode(document.raw), json_options=json_util.RELAXED_JSON_OPTIONS)
+
+
+def to_json(value, indent=None) -> str:
+    if isinstance(value, RawBSONDocument):
+        return raw_to_json(value)
+    if indent is None:
+        return _ENCODER.encode(value)
+    return json.dumps(value, cls=BsonJSONEncoder, ensure_ascii=False, indent=indent)
+
+
+# Strings as they are, containers as compact JSON
+def to_text(value) -> str:
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (bool, int, float)):
+        return str(value)
+    if isinstance(value, RawBSONDocument):
+        # Cells use the same compact JSON as decoded documents, not extended JSON
+        return to_json(bson.decode(value.raw))
+    if isinstance(value, (Mapping, list, tuple)):
+        return to_json(value)
+    encoded = encode_value(value)
+    return encoded if isinstance(encoded, str) else to_json(encoded)
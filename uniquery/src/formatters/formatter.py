@@ -0,0 +1,55 @@
+from collections.abc import Iterable, Mapping
+
+from .writers import TableWriter, JsonWriter, NdjsonWriter, CsvWriter, RawWriter, BsonWriter
+
+_WRITERS = {
+    'table': TableWriter,
+    'json': JsonWriter,
+    'ndjson': NdjsonWriter,
+    'csv': CsvWriter,
+    'raw': RawWriter,
+    'bson': BsonWriter
+}
+
+_ALIASES = {
+    'tabular': 'table'
+}
+
+OUTPUT_FORMATS = tuple(_WRITERS)
+
+
+def normalize_output_format(output_format: str) -> str:
+    name = output_format.lower()
+    name = _ALIASES.get(name, name)
+    if name not in _WRITERS:
+        raise Exception(f"Unsupported output format: {output_format}")
+    return name
+
+
+def get_writer(output_format: str):
+    return _WRITERS[normalize_output_format(output_format)]()
+
+
+def _rows(result):
+    if isinstance(result, Mapping):
+        return [result]
+    if isinstance(result, Iterable) and not isinstance(result, (str, bytes)):
+        return result
+    return None
+
+
+# Acknowledgements such as True are written as their text, returns the number of rows written
+def write_result(result, output_format: str, out) -> int:
+    if result is None:
+        return 0
+    rows = _rows(result)
+    if rows is None:
+        out.write(f"{result}\n")
+        return 0
+    try:
+        return get_writer(output_format).write(rows, out)
+    finally:
+        # A stream abandoned by a writer error or Ctrl-C stops reading from the connection
+        close = getattr(result, 'close', None)
+        if close is not None and hasattr(result, '__next__'):
+            close()
@@ -0,0 +1,154 @@
+import csv
+import itertools
+from abc import ABC, abstractmethod
+from collections.abc import Mapping
+
+import bson
+from bson.raw_bson import RawBSONDocument
+
+from .encoder import to_json, to_text
+
+TABLE_SAMPLE_SIZE = 100
+TABLE_MAX_COLUMN_WIDTH = 40
+
+
+def _as_mapping(row):
+    return row if isinstance(row, Mapping) else {'value': row}
+
+
+class Writer(ABC):
+    name = 'writer'
+
+    @abstractmethod
+    def write(self, rows, out) -> int:
+        ...
+
+
+# Layout is taken from the first `sample_size` rows, later columns are named in a note under the table
+class TableWriter(Writer):
+    name = 'table'
+
+    def __init__(self, sample_size: int = TABLE_SAMPLE_SIZE, max_width: int = TABLE_MAX_COLUMN_WIDTH):
+        self.sample_size = sample_size
+        self.max_width = max_width
+
+    def write(self, rows, out) -> int:
+        rows = iter(rows)
+        sample = [_as_mapping(row) for row in itertools.islice(rows, self.sample_size)]
+        if not sample:
+            return 0
+
+        columns = list(dict.fromkeys(key for row in sample for key in row))
+        widths = {column: len(str(column)) for column in columns}
+        for row in sample:
+            for column in columns:
+                widths[column] = max(widths[column], len(to_text(row.get(column))))
+        widths = {column: min(width, self.max_width) for column, width in widths.items()}
+
+        border = '+' + '+'.join('-' * (widths[column] + 2) for column in columns) + '+\n'
+        out.write(border)
+        out.write(self._line({column: str(column) for column in columns}, columns, widths))
+        out.write(border)
+
+        count = 0
+        known = set(columns)
+        hidden = {}
+        for row in itertools.chain(sample, (_as_mapping(row) for row in rows)):
+            out.write(self._line({column: to_text(row.get(column)) for column in columns}, columns, widths))
+            count += 1
+            for key in row:
+                if key not in known:
+                    hidden.setdefault(key, None)
+        out.write(border)
+        if hidden:
+            out.write(f"Columns not shown, first seen after row {len(sample)}: "
+                      f"{', '.join(str(column) for column in hidden)}\n")
+        return count
+
+    @staticmethod
+    def _line(cells, columns, widths):
+        parts = []
+        for column in columns:
+            text = cells[column].replace('\n', ' ')
+            width = widths[column]
+            if len(text) > width:
+                text = text[:width - 1] + '…'
+            parts.append(text.ljust(width))
+        return '| ' + ' | '.join(parts) + ' |\n'
+
+
+class JsonWriter(Writer):
+    name = 'json'
+
+    def write(self, rows, out) -> int:
+        count = 0
+        out.write('[')
+        for row in rows:
+            out.write(',\n  ' if count else '\n  ')
+            out.write(to_json(row))
+            count += 1
+        out.write('\n]\n' if count else ']\n')
+        return count
+
+
+class NdjsonWriter(Writer):
+    name = 'ndjson'
+
+    def write(self, rows, out) -> int:
+        count = 0
+        for row in rows:
+            out.write(to_json(row))
+            out.write('\n')
+            count += 1
+        return count
+
+
+# The header comes from the first row, nested values are written as JSON
+class CsvWriter(Writer):
+    name = 'csv'
+
+    def write(self, rows, out) -> int:
+        rows = iter(rows)
+        first = next(rows, None)
+        if first is None:
+            return 0
+
+        first = _as_mapping(first)
+        columns = list(first)
+        writer = csv.writer(out, lineterminator='\n')
+        writer.writerow(columns)
+        count = 0
+        for row in itertools.chain((first,), (_as_mapping(row) for row in rows)):
+            writer.writerow([to_text(row.get(column)) for column in columns])
+            count += 1
+        return count
+
+
+class RawWriter(Writer):
+    name = 'raw'
+
+    def write(self, rows, out) -> int:
+        count = 0
+        for row in rows:
+            out.write(f"{row}\n")
+            count += 1
+        return count
+
+
+# Concatenated BSON documents, as written by mongodump
+class BsonWriter(Writer):
+    name = 'bson'
+
+    def write(self, rows, out) -> int:
+        stream = getattr(out, 'buffer', out)
+        if stream is not out:
+            # Text already buffered in `out` has to go first
+            out.flush()
+        count = 0
+        for row in rows:
+            if isinstance(row, RawBSONDocument):
+                stream.write(row.raw)
+            else:
+                stream.write(bson.encode(_as_mapping(row)))
+            count += 1
+        return count
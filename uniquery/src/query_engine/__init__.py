@@ -1,3 +1,6 @@
 from .main import QueryEngine
+from .prepared_statement import PreparedStatement
+from .pagination import KeysetPage
+from .result_set import ResultSet
 
-__all__ = ['QueryEngine']
\ No newline at end of file
+__all__ = ['QueryEngine', 'PreparedStatement', 'KeysetPage', 'ResultSet']
\ No newline at end of file
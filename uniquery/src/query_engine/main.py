@@ -1,40 +1,152 @@
+import io
 import json
-from typing import Any
+import sys
+from typing import Any, TextIO
 
 from uniquery.src.utils import DatabaseType
-from uniquery.src.query_engine.translators import QueryTranslator
+from uniquery.src.connectors.streaming import DEFAULT_BATCH_SIZE
+from uniquery.src.formatters import normalize_output_format, write_result
+from uniquery.src.query_engine.translators import QueryTranslator, PlanCache
+from uniquery.src.query_engine.translators.query_translator import EMPTY_RESULT
+from uniquery.src.query_engine.prepared_statement import PreparedStatement, Parameters
+from uniquery.src.query_engine.pagination import KeysetPage
+from uniquery.src.query_engine.result_set import ResultSet
+
+# Plan operations whose filter, projection or index choice depends on the collection catalog
+_CATALOG_OPERATIONS = ('FIND', 'FIND_ONE', 'COUNT', 'DISTINCT', 'EXISTS', 'AGGREGATE', 'UPDATE_DATA', 'DELETE_DATA')
+
 
 class QueryEngine:
 
-    def __init__(self, database_type: DatabaseType, connector, is_native_mode = False, output_format = "TABULAR"):
+    def __init__(self, database_type: DatabaseType, connector, is_native_mode = False, output_format = "table",
+                 plan_cache: PlanCache = None, batch_size: int = DEFAULT_BATCH_SIZE, prefetch: bool = True):
         self.database_type = database_type
         self.connector = connector
         self.is_native_mode = is_native_mode
-        self.output_format = output_format
-        self.translator = QueryTranslator(database_type)
+        self.output_format = normalize_output_format(output_format)
+        self.plan_cache = plan_cache if plan_cache is not None else PlanCache()
+        self.translator = QueryTranslator(database_type, self.plan_cache)
+        self.prepared_statements = {}
+        # Rows per round trip when streaming, and whether the next batch is read ahead
+        self.batch_size = batch_size
+        self.prefetch = prefetch
+        # Set when the last result came from metadata rather than an exact scan
+        self.last_result_approximate = False
 
     def set_is_native_mode(self, is_native_mode: bool) -> None:
         self.is_native_mode = is_native_mode
 
     def set_output_format(self, output_format: str) -> None:
-        # Handle valid op formats
-        self.output_format = output_format
+        self.output_format = normalize_output_format(output_format)
 
     def format_result(self, result: Any) -> str:
-        return result
+        out = io.StringIO()
+        self.write_result(result, out)
+        return out.getvalue()
+
+    def write_result(self, result: Any, out: TextIO = None) -> int:
+        return write_result(result, self.output_format, out if out is not None else sys.stdout)
+
+    def build_query(self, query: str) -> Any:
+        if not self.is_native_mode:
+            return self.translator.translate(query)
+        if self.database_type.is_mql():
+            return json.loads(query)
+        return query
+
+    def prepare(self, query: str, name: str = None) -> PreparedStatement:
+        statement = PreparedStatement(self, query)
+        if name:
+            self.prepared_statements[name] = statement
+        return statement
 
-    def execute_query(self, query: str) -> Any:
+    def run(self, query: Any, parameters: Parameters = None, stream: bool = False) -> Any:
         if not self.connector:
             raise Exception("No active connection available")
 
         if not self.is_native_mode:
-            query = self.translator.translate(query)
+            query = self._with_catalog(query)
+
+        # Kept off stdout, which carries the JSON, NDJSON, CSV or BSON output
+        print(f"Translated query: {query}", file=sys.stderr)
+
+        self.last_result_approximate = isinstance(query, dict) and bool(query.get('estimated'))
+
+        if isinstance(query, dict) and query.get('operation') == EMPTY_RESULT:
+            return iter([]) if stream else []
+
+        columns = query.get('columns') if isinstance(query, dict) else None
+
+        if stream:
+            rows = self.stream(query, parameters)
+            return _in_column_order(rows, columns) if columns and hasattr(rows, '__next__') else rows
+
+        if parameters:
+            result = self.connector.run_query(query, parameters)
         else:
-            if self.database_type.is_mql():
-                query = json.loads(query)
+            result = self.connector.run_query(query)
+
+        if columns and isinstance(result, list):
+            return list(_in_column_order(result, columns))
+        return result
+
+    # Translated MongoDB plans are fitted to the sampled schema and indexes of their collection
+    def _with_catalog(self, plan):
+        describe = getattr(self.connector, 'describe_collection', None)
+        if describe is None or not isinstance(plan, dict) or plan.get('operation') not in _CATALOG_OPERATIONS:
+            return plan
+        schema, indexes = describe(plan['collection'])
+        return self.translator.with_catalog(plan, schema, indexes)
+
+    # Connectors without streaming support fall back to their materialized result
+    def stream(self, query: Any, parameters: Parameters = None) -> Any:
+        if not hasattr(self.connector, 'stream'):
+            result = self.connector.run_query(query, parameters) if parameters else self.connector.run_query(query)
+            return iter(result) if isinstance(result, list) else result
+        return self.connector.stream(query, parameters, batch_size=self.batch_size, prefetch=self.prefetch)
+
+    def execute_query(self, query: str, parameters: Parameters = None, stream: bool = False) -> Any:
+        if not self.connector:
+            raise Exception("No active connection available")
+
+        if parameters is not None:
+            return self.prepare(query).execute(parameters, stream=stream)
+
+        return self.run(self.build_query(query), stream=stream)
+
+    def fetch_result_set(self, query: str, parameters: Parameters = None) -> ResultSet:
+        rows = self.execute_query(query, parameters, stream=True)
+        if rows is None:
+            return ResultSet()
+        if isinstance(rows, str) or not hasattr(rows, '__iter__'):
+            raise Exception("Query did not return rows")
+        return ResultSet.from_rows(rows)
+
+    # `unique_key` breaks ORDER BY ties, `_id` by default on MongoDB, Neo4j has no such property
+    def execute_page(self, query: str, page_size: int, token: str = None, unique_key: str = None):
+        if not self.connector:
+            raise Exception("No active connection available")
+        if self.is_native_mode or not (self.database_type.is_mql() or self.database_type.is_cypher()):
+            raise Exception("Keyset pagination is supported for translated MongoDB and Neo4j queries")
+        if unique_key is None:
+            if self.database_type.is_cypher():
+                raise Exception("Keyset pagination on Neo4j needs the unique_key property of the ordered nodes")
+            unique_key = '_id'
+
+        page = KeysetPage(self.translator.sql_parser.parse_ir(query), query, page_size, unique_key)
+        plan = self.translator.translate_statement(page.statement_after(token))
+        if isinstance(plan, dict) and plan.get('operation') == EMPTY_RESULT:
+            return [], None
 
-        print(f"Translated MQL query: {query}")
+        return page.split(self.connector.run_query(self._with_catalog(plan)), token)
 
-        result = self.connector.run_query(query)
 
-        return self.format_result(result)
\ No newline at end of file
+# Fields of the sampled schema come first and in schema order, fields the sample missed follow
+def _in_column_order(rows, columns):
+    for row in rows:
+        if isinstance(row, dict):
+            ordered = {name: row[name] for name in columns if name in row}
+            if len(ordered) != len(row):
+                ordered.update(row)
+            row = ordered
+        yield row
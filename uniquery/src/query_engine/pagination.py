@@ -0,0 +1,105 @@
+import base64
+import hashlib
+from dataclasses import replace
+
+from bson import json_util
+
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, Logical, OrderItem, Projection,
+                                                      SelectStatement)
+
+
+# Keyset pagination: each page seeks past the last row of the previous one instead of skipping
+class KeysetPage:
+    def __init__(self, statement, query: str, page_size: int, unique_key: str = '_id'):
+        if not isinstance(statement, SelectStatement) or not statement.order_by:
+            raise Exception("Keyset pagination requires a SELECT with ORDER BY")
+        if statement.group_by or statement.distinct or statement.offset is not None:
+            raise Exception("Keyset pagination does not support GROUP BY, DISTINCT or OFFSET")
+        if any(order.aggregation_function for order in statement.order_by):
+            raise Exception("Keyset pagination requires ORDER BY on plain columns")
+        if statement.limit is not None and (not isinstance(statement.limit, int) or statement.limit < 0):
+            raise Exception("Keyset pagination requires a LIMIT given as a number")
+        if page_size <= 0:
+            raise Exception("Page size must be positive")
+
+        self.hidden_key = None
+        if all(order.column != unique_key for order in statement.order_by):
+            statement = replace(statement, order_by=statement.order_by + (OrderItem(unique_key),))
+        if not any(col.is_star or unique_key in (col.name, col.alias) for col in statement.columns):
+            statement = replace(statement, columns=statement.columns + (Projection(unique_key),))
+            self.hidden_key = unique_key
+
+        self.statement = statement
+        self.page_size = page_size
+        self.fingerprint = hashlib.sha1(query.encode()).hexdigest()[:16]
+
+    # One extra row is fetched to tell whether another page exists
+    def statement_after(self, token: str = None) -> SelectStatement:
+        values, served = self._decode(token) if token is not None else (None, 0)
+        statement = replace(self.statement, limit=self._page_limit(served) + 1)
+        if values is None:
+            return statement
+
+        seek = seek_predicate(self.statement.order_by, values)
+        filter_ = seek if statement.filter is None else Logical(Operator.AND, (statement.filter, seek))
+        return replace(statement, filter=filter_)
+
+    def split(self, rows, token: str = None):
+        served = self._decode(token)[1] if token is not None else 0
+        limit = self._page_limit(served)
+        rows = list(rows or [])
+        next_token = None
+        if len(rows) > limit and served + limit != self.statement.limit:
+            rows = rows[:limit]
+            values = [self._row_value(rows[-1], order.column) for order in self.statement.order_by]
+            next_token = self._encode(values, served + limit)
+        return [self._visible(row) for row in rows[:limit]], next_token
+
+    # Rows this page may return, a LIMIT on the query caps the last page
+    def _page_limit(self, served):
+        if self.statement.limit is None:
+            return self.page_size
+        return min(self.page_size, self.statement.limit - served)
+
+    def _visible(self, row):
+        if self.hidden_key is None or not isinstance(row, dict):
+            return row
+        return {key: value for key, value in row.items() if key != self.hidden_key}
+
+    def _row_value(self, row, column):
+        aliases = {col.name: col.alias for col in self.statement.columns if col.alias}
+        for key in (column, aliases.get(column), column.split('.', 1)[-1]):
+            if key in row:
+                return row[key]
+        # A whole node returned for `alias.property`
+        alias, _, name = column.partition('.')
+        if name and hasattr(row.get(alias), 'get') and name in row[alias]:
+            return row[alias][name]
+        raise Exception(f"ORDER BY column `{column}` must be selected for keyset pagination")
+
+    def _encode(self, values, served) -> str:
+        payload = json_util.dumps({'q': self.fingerprint, 'k': values, 'n': served})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def _decode(self, token: str):
+        try:
+            payload = json_util.loads(base64.urlsafe_b64decode(token.encode()).decode())
+        except Exception:
+            raise Exception("Invalid continuation token")
+        if payload.get('q') != self.fingerprint or len(payload.get('k', [])) != len(self.statement.order_by):
+            raise Exception("Continuation token does not belong to this query")
+        return payload['k'], payload.get('n', 0)
+
+
+# (a > x) OR (a = x AND b > y) OR ..., with < for descending columns
+def seek_predicate(order_by, values):
+    branches = []
+    for index, order in enumerate(order_by):
+        operands = tuple(
+            Comparison(previous.column, Operator.EQ, value)
+            for previous, value in zip(order_by[:index], values[:index])
+        )
+        operator = Operator.LT if order.descending else Operator.GT
+        operands += (Comparison(order.column, operator, values[index]),)
+        branches.append(operands[0] if len(operands) == 1 else Logical(Operator.AND, operands))
+    return branches[0] if len(branches) == 1 else Logical(Operator.OR, tuple(branches))
@@ -0,0 +1,57 @@
+from typing import Any, Mapping, Sequence, Union
+
+from uniquery.src.query_engine.translators.parameters import bind_parameters, has_parameters, to_pyformat_sql
+
+Parameters = Union[Sequence[Any], Mapping[str, Any], None]
+
+
+# Cypher and SQL templates keep their placeholders and hand the values to the driver
+class PreparedStatement:
+    def __init__(self, query_engine, query: str):
+        self.query_engine = query_engine
+        self.query = query
+        self.database_type = query_engine.database_type
+
+        if self.database_type.is_sql():
+            self.template, self.parameter_keys = to_pyformat_sql(query)
+        else:
+            self.template = query_engine.build_query(query)
+            self.parameter_keys = None
+        self.is_parameterized = bool(self.parameter_keys) or has_parameters(self.template) or (
+            self.database_type.is_cypher() and '$' in self.template
+        )
+
+    def bind(self, parameters: Parameters = None):
+        if isinstance(parameters, (str, bytes)):
+            raise Exception("Parameters must be a sequence or a mapping")
+
+        if self.database_type.is_mql():
+            return bind_parameters(self.template, parameters), None
+        elif self.database_type.is_cypher():
+            if parameters is None or isinstance(parameters, Mapping):
+                values = dict(parameters or {})
+            else:
+                values = {f"p{index}": value for index, value in enumerate(parameters)}
+            transforms = getattr(self.template, 'bind_transforms', {})
+            return self.template, {
+                name: transforms[name](value) if name in transforms else value for name, value in values.items()
+            }
+        elif self.database_type.is_sql():
+            if not self.parameter_keys:
+                return self.template, None
+            if isinstance(self.parameter_keys[0], int):
+                if isinstance(parameters, Mapping) or parameters is None or len(parameters) < len(self.parameter_keys):
+                    raise Exception(f"Expected {len(self.parameter_keys)} positional parameters")
+                return self.template, tuple(parameters)
+            if not isinstance(parameters, Mapping):
+                raise Exception("Expected named parameters")
+            missing = [key for key in self.parameter_keys if key not in parameters]
+            if missing:
+                raise Exception(f"Missing value for parameter `:{missing[0]}`")
+            return self.template, dict(parameters)
+
+        raise Exception(f"Prepared statements are not supported for database type: {self.database_type.value}")
+
+    def execute(self, parameters: Parameters = None, stream: bool = False) -> Any:
+        query, driver_parameters = self.bind(parameters)
+        return self.query_engine.run(query, driver_parameters, stream=stream)
@@ -0,0 +1,194 @@
+from array import array
+from collections.abc import Mapping
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+_TYPECODES = {
+    'bool': 'b',
+    'int': 'q',
+    'float': 'd'
+}
+
+_PLACEHOLDERS = {
+    'bool': 0,
+    'int': 0,
+    'float': 0.0
+}
+
+
+def _kind_of(value):
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int' if _INT64_MIN <= value <= _INT64_MAX else 'object'
+    if isinstance(value, float):
+        return 'float'
+    return 'object'
+
+
+def _require(module: str):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise Exception(f"This export requires {module}, install it with `pip install {module}`")
+
+
+# `kind` stays None until the first non-null value arrives
+class Column:
+    __slots__ = ('name', 'kind', 'values', 'nulls')
+
+    def __init__(self, name: str, length: int = 0):
+        self.name = name
+        self.kind = None
+        self.values = None
+        # One byte per row, 1 where the value is null
+        self.nulls = bytearray(b'\x01' * length)
+
+    def __len__(self):
+        return len(self.nulls)
+
+    def append(self, value):
+        if value is None:
+            self.nulls.append(1)
+            if self.values is not None:
+                self.values.append(_PLACEHOLDERS.get(self.kind))
+            return
+
+        kind = _kind_of(value)
+        if kind != self.kind:
+            self._widen(kind)
+        if self.kind == 'float':
+            value = float(value)
+        self.values.append(value)
+        self.nulls.append(0)
+
+    def _widen(self, kind):
+        if self.kind is None:
+            self.kind = kind
+            placeholder = _PLACEHOLDERS.get(kind)
+            if kind == 'object':
+                self.values = [placeholder] * len(self.nulls)
+            else:
+                self.values = array(_TYPECODES[kind], [placeholder] * len(self.nulls))
+        elif {self.kind, kind} == {'int', 'float'}:
+            if self.kind == 'int':
+                self.kind = 'float'
+                self.values = array('d', self.values)
+        elif self.kind != 'object':
+            self.values = self.to_list()
+            self.kind = 'object'
+
+    def get(self, index: int):
+        if self.nulls[index]:
+            return None
+        value = self.values[index]
+        return bool(value) if self.kind == 'bool' else value
+
+    def to_list(self) -> list:
+        return [self.get(index) for index in range(len(self.nulls))]
+
+    def to_numpy(self):
+        numpy = _require('numpy')
+        mask = numpy.frombuffer(self.nulls, dtype=numpy.uint8).astype(bool)
+        if self.kind in _TYPECODES:
+            # Copies the raw buffer, no value is boxed into a Python object
+            dtype = {'bool': numpy.int8, 'int': numpy.int64, 'float': numpy.float64}[self.kind]
+            data = numpy.frombuffer(self.values, dtype=dtype).copy()
+            if self.kind == 'bool':
+                data = data.astype(bool)
+            if self.kind == 'float':
+                data[mask] = numpy.nan
+            elif mask.any():
+                return numpy.ma.MaskedArray(data, mask=mask)
+            return data
+
+        data = numpy.empty(len(self.nulls), dtype=object)
+        for index in range(len(self.nulls)):
+            data[index] = self.get(index)
+        return data
+
+    def to_pandas(self):
+        pandas = _require('pandas')
+        data = self.to_numpy()
+        if self.kind == 'int' and hasattr(data, 'mask'):
+            return pandas.arrays.IntegerArray(data.data, data.mask)
+        if self.kind == 'bool' and hasattr(data, 'mask'):
+            return pandas.arrays.BooleanArray(data.data, data.mask)
+        return data
+
+
+# Integer, float and bool columns are kept in `array` buffers next to a null mask
+class ResultSet:
+    def __init__(self, columns=()):
+        self._columns = {name: Column(name) for name in columns}
+        self._length = 0
+
+    @classmethod
+    def from_rows(cls, rows):
+        result_set = cls()
+        result_set.extend(rows)
+        return result_set
+
+    def append(self, row) -> None:
+        if not isinstance(row, Mapping):
+            row = {'value': row}
+
+        for name, value in row.items():
+            column = self._columns.get(name)
+            if column is None:
+                column = self._columns[name] = Column(name, self._length)
+            column.append(value)
+        self._length += 1
+
+        if len(row) != len(self._columns):
+            for column in self._columns.values():
+                if len(column) < self._length:
+                    column.append(None)
+
+    def extend(self, rows) -> None:
+        for row in rows:
+            self.append(row)
+
+    # Appends rows given as sequences in column order, no mapping is built per row
+    def extend_tuples(self, rows) -> None:
+        columns = list(self._columns.values())
+        for row in rows:
+            for column, value in zip(columns, row):
+                column.append(value)
+            self._length += 1
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        return self.rows()
+
+    @property
+    def columns(self) -> list:
+        return list(self._columns)
+
+    # Column name to type, 'null' for columns that only held nulls so far
+    @property
+    def schema(self) -> dict:
+        return {name: column.kind or 'null' for name, column in self._columns.items()}
+
+    def column(self, name: str) -> list:
+        if name not in self._columns:
+            raise Exception(f"Column `{name}` does not exist")
+        return self._columns[name].to_list()
+
+    def rows(self):
+        columns = list(self._columns.values())
+        for index in range(self._length):
+            yield {column.name: column.get(index) for column in columns}
+
+    # Null floats become NaN, integer and bool columns with nulls become masked arrays
+    def to_numpy(self) -> dict:
+        return {name: column.to_numpy() for name, column in self._columns.items()}
+
+    # DataFrame with nullable integer and boolean columns where nulls are present
+    def to_pandas(self):
+        pandas = _require('pandas')
+        return pandas.DataFrame({name: column.to_pandas() for name, column in self._columns.items()},
+                                columns=self.columns)
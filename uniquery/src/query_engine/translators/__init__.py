@@ -6,5 +6,7 @@ This module provides converters to transform queries between different database
 """
 
 from .query_translator import QueryTranslator
+from .plan_cache import PlanCache
+from .optimizer import PredicateOptimizer, Rule
 
-__all__ = ['QueryTranslator']
\ No newline at end of file
+__all__ = ['QueryTranslator', 'PlanCache', 'PredicateOptimizer', 'Rule']
\ No newline at end of file
@@ -0,0 +1,157 @@
+import datetime
+import decimal
+from dataclasses import dataclass
+from typing import Optional
+
+from bson import Decimal128, ObjectId
+from bson.int64 import Int64
+
+from uniquery.src.query_engine.translators.parameters import Parameter
+
+
+@dataclass(frozen=True, slots=True)
+class Point:
+    x: float
+    y: float
+    z: Optional[float] = None
+
+
+_DATE_TYPES = {'DATE'}
+_TIMESTAMP_TYPES = {'TIMESTAMP', 'TIMESTAMPTZ', 'TIMESTAMPLTZ', 'DATETIME', 'DATETIME64'}
+_DECIMAL_TYPES = {'DECIMAL', 'NUMERIC', 'MONEY', 'BIGDECIMAL'}
+_INTEGER_TYPES = {'INT', 'INTEGER', 'BIGINT', 'SMALLINT', 'TINYINT', 'MEDIUMINT'}
+_FLOAT_TYPES = {'FLOAT', 'DOUBLE', 'REAL'}
+_STRING_TYPES = {'VARCHAR', 'CHAR', 'TEXT', 'NVARCHAR', 'NCHAR', 'STRING'}
+
+
+def _timestamp(text):
+    # fromisoformat before Python 3.11 does not read a trailing Z
+    return datetime.datetime.fromisoformat(text[:-1] + '+00:00' if text.endswith('Z') else text)
+
+
+# Converts the value of an explicit SQL literal or CAST to `type_name`
+def typed_literal(type_name: str, value):
+    type_name = type_name.upper()
+    try:
+        if type_name in _DATE_TYPES:
+            return value if isinstance(value, datetime.date) else datetime.date.fromisoformat(str(value))
+        if type_name in _TIMESTAMP_TYPES:
+            return value if isinstance(value, datetime.datetime) else _timestamp(str(value))
+        if type_name in _DECIMAL_TYPES:
+            return decimal.Decimal(str(value))
+        if type_name in _INTEGER_TYPES:
+            return int(value)
+        if type_name in _FLOAT_TYPES:
+            return float(value)
+        if type_name in _STRING_TYPES:
+            return str(value)
+        if type_name == 'OBJECTID':
+            return ObjectId(str(value))
+        if type_name == 'POINT':
+            return Point(*(float(coordinate) for coordinate in value))
+    except Exception as err:
+        raise Exception(f"Cannot convert {value!r} to {type_name}: {err}")
+    raise Exception(f"Unsupported literal type: {type_name}")
+
+
+def to_bson(value):
+    if isinstance(value, dict):
+        return {key: to_bson(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_bson(item) for item in value]
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime(value.year, value.month, value.day)
+    if isinstance(value, decimal.Decimal):
+        return Decimal128(value)
+    if isinstance(value, Point):
+        coordinates = [value.x, value.y] if value.z is None else [value.x, value.y, value.z]
+        return {'type': 'Point', 'coordinates': coordinates}
+    return value
+
+
+# Mixed-type fields are left out, so documents holding either type still match
+def field_types(schema: dict) -> dict:
+    types = {}
+    for name, field in schema.get('fields', {}).items():
+        kinds = [kind for kind in field['types'] if kind != 'null']
+        if len(kinds) == 1:
+            types[name] = kinds[0]
+    return types
+
+
+# Values that do not convert cleanly are left as written
+def coerce_value(value, bson_type: str):
+    if value is None or isinstance(value, (bool, Parameter)):
+        return value
+    try:
+        if bson_type == 'date':
+            if isinstance(value, str):
+                return _timestamp(value)
+            if isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+                return datetime.datetime(value.year, value.month, value.day)
+        elif bson_type == 'objectId':
+            if isinstance(value, str) and ObjectId.is_valid(value):
+                return ObjectId(value)
+        elif bson_type == 'decimal':
+            if isinstance(value, (int, float, str, decimal.Decimal)):
+                return Decimal128(str(value))
+        elif bson_type == 'long':
+            if isinstance(value, str):
+                return Int64(int(value))
+        elif bson_type == 'int':
+            if isinstance(value, str):
+                return int(value)
+        elif bson_type == 'double':
+            if isinstance(value, str):
+                return float(value)
+    except (ValueError, TypeError, decimal.InvalidOperation, ArithmeticError):
+        pass
+    return value
+
+
+_VALUE_OPERATORS = ('$eq', '$ne', '$gt', '$gte', '$lt', '$lte')
+_LIST_OPERATORS = ('$in', '$nin')
+_LOGICAL_OPERATORS = ('$and', '$or', '$nor')
+
+
+def coerce_filter(filter_: dict, types: dict) -> dict:
+    coerced = {}
+    for key, condition in filter_.items():
+        if key in _LOGICAL_OPERATORS:
+            coerced[key] = [coerce_filter(operand, types) for operand in condition]
+        elif key.startswith('$') or key not in types:
+            coerced[key] = condition
+        else:
+            coerced[key] = _coerce_condition(condition, types[key])
+    return coerced
+
+
+def _coerce_condition(condition, bson_type):
+    if not isinstance(condition, dict):
+        return coerce_value(condition, bson_type)
+    coerced = {}
+    for operator, operand in condition.items():
+        if operator in _VALUE_OPERATORS:
+            operand = coerce_value(operand, bson_type)
+        elif operator in _LIST_OPERATORS and isinstance(operand, list):
+            operand = [coerce_value(item, bson_type) for item in operand]
+        elif operator == '$not' and isinstance(operand, dict):
+            operand = _coerce_condition(operand, bson_type)
+        coerced[operator] = operand
+    return coerced
+
+
+# Only filters and the leading $match are coerced, inserted and updated values are stored as written
+def coerce_plan(plan: dict, types: dict) -> dict:
+    if not types:
+        return plan
+    plan = dict(plan)
+    if isinstance(plan.get('filter'), dict):
+        plan['filter'] = coerce_filter(plan['filter'], types)
+    pipeline = plan.get('pipeline')
+    # Only the first stage sees fields as stored, later stages may reshape documents
+    if pipeline and '$match' in pipeline[0]:
+        plan['pipeline'] = [{'$match': coerce_filter(pipeline[0]['$match'], types)}] + pipeline[1:]
+    return plan
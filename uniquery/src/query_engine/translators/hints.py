@@ -0,0 +1,68 @@
+import re
+from typing import Optional
+
+from sqlglot.tokens import Tokenizer, TokenType
+
+from uniquery.src.query_engine.translators.ir import QueryHints
+
+_HINT = re.compile(r'(\w+)\s*\(([^)]*)\)')
+_SEPARATORS = re.compile(r'[\s,]+')
+
+
+# sqlglot only reads hints after SELECT, so they are taken out of the statement first
+def split_hints(sql: str):
+    if '/*+' not in sql:
+        return sql, None
+    try:
+        tokens = Tokenizer().tokenize(sql)
+    except Exception:
+        return sql, None
+
+    parts = []
+    texts = []
+    position = 0
+    for token in tokens:
+        if token.token_type == TokenType.HINT:
+            parts.append(sql[position:token.start])
+            texts.append(token.text[3:-2])
+            position = token.end + 1
+    if not texts:
+        return sql, None
+    parts.append(sql[position:])
+    return "".join(parts), " ".join(texts)
+
+
+# The INDEX, MAX_TIME and BATCH hints of a hint comment, None when it has none of them
+def parse_hints(text: str) -> Optional[QueryHints]:
+    found = {}
+    for name, arguments in _HINT.findall(text):
+        name = name.upper()
+        arguments = [argument.strip('`"') for argument in _SEPARATORS.split(arguments) if argument]
+        if name == 'INDEX':
+            if not arguments:
+                raise Exception("INDEX hint needs an index name")
+            if len(arguments) == 1:
+                found['indexes'] = tuple(arguments)
+            else:
+                found['index_table'] = arguments[0]
+                found['indexes'] = tuple(arguments[1:])
+        elif name == 'MAX_TIME':
+            found['max_time_ms'] = _positive_integer(name, arguments)
+        elif name == 'BATCH':
+            found['batch_size'] = _positive_integer(name, arguments)
+    return QueryHints(**found) if found else None
+
+
+def _positive_integer(name, arguments):
+    if len(arguments) != 1 or not arguments[0].isdigit() or int(arguments[0]) == 0:
+        raise Exception(f"{name} hint needs one positive integer, got ({', '.join(arguments)})")
+    return int(arguments[0])
+
+
+# Indexes an INDEX hint names for the queried table, empty without one
+def hinted_indexes(hints: Optional[QueryHints], table: str, alias: str = None) -> tuple:
+    if hints is None or not hints.indexes:
+        return ()
+    if hints.index_table is not None and hints.index_table not in (table, alias):
+        raise Exception(f"INDEX hint names `{hints.index_table}`, which is not the queried table `{table}`")
+    return hints.indexes
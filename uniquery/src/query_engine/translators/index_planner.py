@@ -0,0 +1,151 @@
+_PLANNED_OPERATIONS = ('FIND', 'FIND_ONE', 'COUNT')
+
+_EQUALITY_OPERATORS = ('$eq', '$in')
+_RANGE_OPERATORS = ('$gt', '$gte', '$lt', '$lte')
+
+
+# Sparse, partial and collated indexes can skip documents and are never hinted
+def usable_indexes(indexes) -> list:
+    usable = []
+    for index in indexes:
+        if index.get('sparse') or index.get('partialFilterExpression') or index.get('collation'):
+            continue
+        keys = list(index['key'].items())
+        if all(direction in (1, -1) for _, direction in keys):
+            usable.append((index['name'], [field for field, _ in keys]))
+    return usable
+
+
+# Field of each top-level conjunct to 'eq', 'range' or 'other'
+def predicate_kinds(filter_: dict) -> dict:
+    kinds = {}
+    for key, condition in filter_.items():
+        if key == '$and':
+            for operand in condition:
+                for field, kind in predicate_kinds(operand).items():
+                    kinds[field] = _stronger(kinds.get(field), kind)
+        elif not key.startswith('$'):
+            kinds[key] = _stronger(kinds.get(key), _condition_kind(condition))
+    return kinds
+
+
+def _condition_kind(condition):
+    if not isinstance(condition, dict) or not condition:
+        return 'eq'
+    operators = set(condition)
+    if operators & set(_EQUALITY_OPERATORS):
+        return 'eq'
+    if operators <= set(_RANGE_OPERATORS):
+        return 'range'
+    # A regex anchored at the start is scanned as an index range
+    regex = condition.get('$regex')
+    if isinstance(regex, str) and regex.startswith('^') and not condition.get('$options'):
+        return 'range'
+    return 'other'
+
+
+def _stronger(first, second):
+    order = ('eq', 'range', 'other')
+    return second if first is None else order[min(order.index(first), order.index(second))]
+
+
+# Two points per leading equality field, one for the sort continuing the key and one for a following range field
+def index_score(fields, kinds, sort=()) -> int:
+    score = 0
+    position = 0
+    while position < len(fields) and kinds.get(fields[position]) == 'eq':
+        score += 2
+        position += 1
+    sort_fields = [field for field, _ in sort]
+    if sort_fields and fields[position:position + len(sort_fields)] == sort_fields:
+        score += 1
+        position += len(sort_fields)
+    if position < len(fields) and kinds.get(fields[position]) == 'range':
+        score += 1
+    return score
+
+
+# The plan adjusted to `indexes`, the index documents of its collection
+def plan_indexes(plan: dict, indexes, schema: dict = None) -> dict:
+    if plan.get('operation') not in _PLANNED_OPERATIONS or plan.get('estimated') or plan.get('hint') \
+            or plan.get('hint_candidates'):
+        return plan
+
+    filter_ = plan.get('filter') or {}
+    kinds = predicate_kinds(filter_)
+    sort = plan.get('sort') or ()
+    ranked = []
+    for name, fields in usable_indexes(indexes):
+        score = index_score(fields, kinds, sort)
+        if score:
+            ranked.append((score, -len(fields), name, fields))
+    if not ranked:
+        return plan
+    ranked.sort(reverse=True)
+    _, _, best_name, best_fields = ranked[0]
+
+    plan = dict(plan)
+    if isinstance(filter_.get('$and'), list):
+        plan['filter'] = {**filter_, '$and': _in_key_order(filter_['$and'], best_fields)}
+
+    covering = _covering_index(plan, [(name, fields) for _, _, name, fields in ranked], schema)
+    if covering is not None:
+        name, fields = covering
+        if '_id' not in fields:
+            # The index has no _id, returning it would mean fetching every document
+            plan['projection'] = {**plan['projection'], '_id': 0}
+        plan['hint'] = name
+    elif len(ranked) > 1:
+        plan['hint_candidates'] = [name for _, _, name, _ in ranked]
+    return plan
+
+
+def _in_key_order(operands, fields):
+    def position(operand):
+        field = next(iter(operand), None) if len(operand) == 1 else None
+        return fields.index(field) if field in fields else len(fields)
+    return sorted(operands, key=position)
+
+
+def _covering_index(plan, ranked, schema):
+    projection = plan.get('projection')
+    if plan.get('operation') == 'COUNT' or not projection:
+        return None
+    # Only plain inclusion of top-level fields can be answered from index keys
+    included = [field for field in projection if field != '_id']
+    if not included or any(projection[field] != 1 or '.' in field for field in included):
+        return None
+
+    filtered = _filter_fields(plan.get('filter') or {})
+    if filtered is None:
+        return None
+    needed = set(included) | filtered | {field for field, _ in plan.get('sort') or ()}
+    if projection.get('_id') == 1:
+        needed.add('_id')
+    fields_info = (schema or {}).get('fields', {})
+    if any('array' in fields_info.get(field, {}).get('types', ()) for field in needed):
+        return None
+    for name, fields in ranked:
+        if needed <= set(fields):
+            return name, fields
+    return None
+
+
+# Every field a filter reads, None when it needs more than index keys to be evaluated
+def _filter_fields(filter_):
+    fields = set()
+    for key, condition in filter_.items():
+        if key in ('$and', '$or', '$nor'):
+            for operand in condition:
+                operand_fields = _filter_fields(operand)
+                if operand_fields is None:
+                    return None
+                fields |= operand_fields
+        elif key.startswith('$'):
+            return None
+        elif condition is None or (isinstance(condition, dict) and None in condition.values()):
+            # Null also matches a missing field, which index keys cannot tell apart
+            return None
+        else:
+            fields.add(key)
+    return fields
@@ -0,0 +1,492 @@
+from dataclasses import dataclass, replace
+from enum import Enum
+from typing import Any, Optional, Tuple
+
+
+class Operator(Enum):
+    EQ = '='
+    NEQ = '!='
+    GT = '>'
+    GTE = '>='
+    LT = '<'
+    LTE = '<='
+    LIKE = 'LIKE'
+    ILIKE = 'ILIKE'
+    IN = 'IN'
+    BETWEEN = 'BETWEEN'
+    IS_NULL = 'IS_NULL'
+    RANGE = 'RANGE'
+    AND = 'AND'
+    OR = 'OR'
+    NOT = 'NOT'
+    TRUE = 'TRUE'
+    FALSE = 'FALSE'
+
+
+# Predicates
+
+class Predicate:
+    __slots__ = ()
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison(Predicate):
+    column: str
+    operator: Operator
+    value: Any
+    aggregation_function: Optional[str] = None
+
+    def to_dict(self):
+        value = self.value.to_dict() if isinstance(self.value, ColumnRef) else self.value
+        result = {'column': self.column, 'operator': self.operator.value, 'value': value}
+        if self.aggregation_function:
+            result['aggregation_function'] = self.aggregation_function
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class InList(Predicate):
+    column: str
+    values: Tuple[Any, ...]
+
+    def to_dict(self):
+        return {'operator': Operator.IN.value, 'column': self.column, 'values': list(self.values)}
+
+
+@dataclass(frozen=True, slots=True)
+class Between(Predicate):
+    column: str
+    low: Any
+    high: Any
+
+    def to_dict(self):
+        return {'operator': Operator.BETWEEN.value, 'column': self.column, 'low': self.low, 'high': self.high}
+
+
+@dataclass(frozen=True, slots=True)
+class IsNull(Predicate):
+    column: str
+
+    def to_dict(self):
+        return {'operator': Operator.IS_NULL.value, 'column': self.column}
+
+
+# Bounded condition on one column, produced by the optimizer from merged comparisons
+@dataclass(frozen=True, slots=True)
+class Range(Predicate):
+    column: str
+    low: Any = None
+    high: Any = None
+    low_inclusive: bool = True
+    high_inclusive: bool = True
+    aggregation_function: Optional[str] = None
+
+    def to_dict(self):
+        result = {
+            'operator': Operator.RANGE.value,
+            'column': self.column,
+            'low': self.low,
+            'high': self.high,
+            'low_inclusive': self.low_inclusive,
+            'high_inclusive': self.high_inclusive
+        }
+        if self.aggregation_function:
+            result['aggregation_function'] = self.aggregation_function
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class Constant(Predicate):
+    value: bool
+
+    def to_dict(self):
+        return {'operator': Operator.TRUE.value if self.value else Operator.FALSE.value}
+
+
+TRUE = Constant(True)
+FALSE = Constant(False)
+
+
+@dataclass(frozen=True, slots=True)
+class Not(Predicate):
+    operand: Predicate
+
+    def to_dict(self):
+        return {'operator': Operator.NOT.value, 'operand': self.operand.to_dict()}
+
+
+@dataclass(frozen=True, slots=True)
+class Logical(Predicate):
+    operator: Operator
+    operands: Tuple[Predicate, ...]
+
+    def to_dict(self):
+        return {'operator': self.operator.value, 'operands': [operand.to_dict() for operand in self.operands]}
+
+
+# SQL fragment the parser could not map to a typed predicate
+@dataclass(frozen=True, slots=True)
+class RawCondition(Predicate):
+    sql: str
+
+    def to_dict(self):
+        return self.sql
+
+
+# A column compared against another one, the value side of `e.department_id = d.id`
+@dataclass(frozen=True, slots=True)
+class ColumnRef:
+    column: str
+
+    def to_dict(self):
+        return {'column_ref': self.column}
+
+
+_COLUMN_PREDICATES = (Comparison, InList, Between, IsNull, Range)
+
+
+# Column references on the value side are mapped too
+def map_columns(predicate, mapper):
+    if isinstance(predicate, _COLUMN_PREDICATES):
+        column = mapper(predicate)
+        mapped = predicate if column == predicate.column else replace(predicate, column=column)
+        if isinstance(predicate, Comparison) and isinstance(predicate.value, ColumnRef):
+            value = ColumnRef(mapper(predicate.value))
+            if value != predicate.value:
+                mapped = replace(mapped, value=value)
+        return mapped
+    if isinstance(predicate, Logical):
+        return Logical(predicate.operator, tuple(map_columns(operand, mapper) for operand in predicate.operands))
+    if isinstance(predicate, Not):
+        return Not(map_columns(predicate.operand, mapper))
+    return predicate
+
+
+def predicate_columns(predicate) -> set:
+    if isinstance(predicate, Comparison) and isinstance(predicate.value, ColumnRef):
+        return {predicate.column, predicate.value.column}
+    if isinstance(predicate, _COLUMN_PREDICATES):
+        return {predicate.column}
+    if isinstance(predicate, Logical):
+        return set().union(*(predicate_columns(operand) for operand in predicate.operands))
+    if isinstance(predicate, Not):
+        return predicate_columns(predicate.operand)
+    return set()
+
+
+# Select building blocks
+
+@dataclass(frozen=True, slots=True)
+class TableRef:
+    name: str
+    alias: Optional[str] = None
+
+    @property
+    def reference(self) -> str:
+        return self.alias or self.name
+
+    def to_dict(self):
+        return {'name': self.name, 'alias': self.alias}
+
+
+@dataclass(frozen=True, slots=True)
+class Projection:
+    name: Optional[str]
+    alias: Optional[str] = None
+    aggregation_function: Optional[str] = None
+
+    @property
+    def is_star(self) -> bool:
+        return self.name == '*' and self.aggregation_function is None
+
+    def to_dict(self):
+        if self.aggregation_function:
+            return {'aggregation_function': self.aggregation_function, 'name': self.name, 'alias': self.alias}
+        return {'name': self.name, 'alias': self.alias}
+
+
+@dataclass(frozen=True, slots=True)
+class Join:
+    type: str
+    table: TableRef
+    left: str
+    right: str
+    operator: Operator = Operator.EQ
+
+    def to_dict(self):
+        return {
+            'type': self.type,
+            'table': self.table.to_dict(),
+            'on': {'left': self.left, 'operator': self.operator.value, 'right': self.right}
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class OrderItem:
+    column: str
+    descending: bool = False
+    aggregation_function: Optional[str] = None
+
+    def to_dict(self):
+        result = {'column': self.column, 'order': 'DESC' if self.descending else 'ASC'}
+        if self.aggregation_function:
+            result['aggregation_function'] = self.aggregation_function
+        return result
+
+
+# `index_table` is None when the INDEX hint names no table
+@dataclass(frozen=True, slots=True)
+class QueryHints:
+    indexes: Tuple[str, ...] = ()
+    index_table: Optional[str] = None
+    max_time_ms: Optional[int] = None
+    batch_size: Optional[int] = None
+
+    def to_dict(self):
+        result = {}
+        if self.indexes:
+            result['index'] = {'table': self.index_table, 'names': list(self.indexes)}
+        if self.max_time_ms is not None:
+            result['max_time_ms'] = self.max_time_ms
+        if self.batch_size is not None:
+            result['batch_size'] = self.batch_size
+        return result
+
+
+# Statements
+
+class Statement:
+    __slots__ = ()
+    operation = None
+
+
+@dataclass(frozen=True, slots=True)
+class SelectStatement(Statement):
+    table: TableRef
+    columns: Tuple[Projection, ...]
+    filter: Optional[Predicate] = None
+    order_by: Tuple[OrderItem, ...] = ()
+    limit: Any = None
+    group_by: Tuple[str, ...] = ()
+    having: Optional[Predicate] = None
+    joins: Tuple[Join, ...] = ()
+    distinct: bool = False
+    offset: Any = None
+    hints: Optional[QueryHints] = None
+
+    operation = 'SELECT'
+
+    def to_dict(self):
+        result = {
+            'operation': self.operation,
+            'table': self.table.to_dict(),
+            'columns': [column.to_dict() for column in self.columns]
+        }
+        if self.filter is not None:
+            result['filter'] = self.filter.to_dict()
+        if self.order_by:
+            result['order_by'] = [item.to_dict() for item in self.order_by]
+        if self.limit is not None:
+            result['limit'] = self.limit
+        if self.offset is not None:
+            result['offset'] = self.offset
+        if self.group_by:
+            result['aggregate'] = list(self.group_by)
+        if self.having is not None:
+            result['having'] = self.having.to_dict()
+        if self.joins:
+            result['joins'] = [join.to_dict() for join in self.joins]
+        if self.distinct:
+            result['distinct'] = True
+        if self.hints is not None:
+            result['hints'] = self.hints.to_dict()
+        return result
+
+
+# SELECT EXISTS(subquery), answered by probing for a single matching row
+@dataclass(frozen=True, slots=True)
+class ExistsStatement(Statement):
+    query: SelectStatement
+    alias: str = 'exists'
+
+    operation = 'EXISTS'
+
+    def to_dict(self):
+        return {'operation': self.operation, 'query': self.query.to_dict(), 'alias': self.alias}
+
+
+@dataclass(frozen=True, slots=True)
+class InsertStatement(Statement):
+    table_name: str
+    columns: Tuple[str, ...]
+    values: Tuple[Tuple[Any, ...], ...]
+
+    operation = 'INSERT_DATA'
+
+    def to_dict(self):
+        return {
+            'operation': self.operation,
+            'table_name': self.table_name,
+            'columns': list(self.columns),
+            'values': [list(row) for row in self.values]
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class UpdateStatement(Statement):
+    table_name: str
+    columns: Tuple[str, ...]
+    values: Tuple[Any, ...]
+    filter: Optional[Predicate] = None
+    hints: Optional[QueryHints] = None
+
+    operation = 'UPDATE_DATA'
+
+    def to_dict(self):
+        result = {
+            'operation': self.operation,
+            'table_name': self.table_name,
+            'columns': list(self.columns),
+            'values': list(self.values),
+            'filter': self.filter.to_dict() if self.filter is not None else None
+        }
+        if self.hints is not None:
+            result['hints'] = self.hints.to_dict()
+        return result
+
+
+@dataclass(frozen=True, slots=True)
+class DeleteStatement(Statement):
+    table_name: str
+    filter: Optional[Predicate] = None
+    hints: Optional[QueryHints] = None
+
+    operation = 'DELETE_DATA'
+
+    def to_dict(self):
+        result = {
+            'operation': self.operation,
+            'table_name': self.table_name,
+            'filter': self.filter.to_dict() if self.filter is not None else None
+        }
+        if self.hints is not None:
+            result['hints'] = self.hints.to_dict()
+        return result
+
+
+# CREATE/DROP/ALTER/USE/SHOW keep their details as a plain dict, generators only rename the fields
+class Command(Statement):
+    __slots__ = ('details',)
+
+    def __init__(self, details: dict):
+        self.details = details
+
+    @property
+    def operation(self):
+        return self.details['operation']
+
+    def to_dict(self):
+        return dict(self.details)
+
+    def __eq__(self, other):
+        return isinstance(other, Command) and self.details == other.details
+
+    def __repr__(self):
+        return f"Command({self.details!r})"
+
+
+# Legacy dict compatibility
+
+def predicate_from_dict(data) -> Optional[Predicate]:
+    if data is None or isinstance(data, Predicate):
+        return data
+    if isinstance(data, str):
+        return RawCondition(data)
+    if not data.get('operator'):
+        return None
+
+    operator = Operator(data['operator'].upper())
+    if operator in (Operator.AND, Operator.OR):
+        return Logical(operator, tuple(predicate_from_dict(operand) for operand in data.get('operands', [])))
+    elif operator == Operator.NOT:
+        return Not(predicate_from_dict(data.get('operand')))
+    elif operator == Operator.IN:
+        return InList(data['column'], tuple(data.get('values', [])))
+    elif operator == Operator.BETWEEN:
+        return Between(data['column'], data.get('low'), data.get('high'))
+    elif operator == Operator.IS_NULL:
+        return IsNull(data['column'])
+    elif operator == Operator.RANGE:
+        return Range(data['column'], data.get('low'), data.get('high'), data.get('low_inclusive', True),
+                     data.get('high_inclusive', True), data.get('aggregation_function'))
+    elif operator in (Operator.TRUE, Operator.FALSE):
+        return TRUE if operator == Operator.TRUE else FALSE
+    value = data.get('value')
+    if isinstance(value, dict) and 'column_ref' in value:
+        value = ColumnRef(value['column_ref'])
+    return Comparison(data.get('column'), operator, value, data.get('aggregation_function'))
+
+
+def hints_from_dict(data) -> Optional[QueryHints]:
+    if data is None or isinstance(data, QueryHints):
+        return data
+    index = data.get('index') or {}
+    return QueryHints(tuple(index.get('names') or ()), index.get('table'), data.get('max_time_ms'),
+                      data.get('batch_size'))
+
+
+def statement_from_dict(data) -> Statement:
+    if isinstance(data, Statement):
+        return data
+
+    operation = data['operation']
+    if operation == 'SELECT':
+        table = data['table']
+        return SelectStatement(
+            table=TableRef(table['name'], table.get('alias')),
+            columns=tuple(
+                Projection(column.get('name'), column.get('alias'), column.get('aggregation_function'))
+                for column in data.get('columns', [])
+            ),
+            filter=predicate_from_dict(data.get('filter')),
+            order_by=tuple(
+                OrderItem(item['column'], item.get('order', 'ASC').upper() == 'DESC', item.get('aggregation_function'))
+                for item in data.get('order_by') or []
+            ),
+            limit=data.get('limit'),
+            group_by=tuple(data.get('aggregate') or ()),
+            having=predicate_from_dict(data.get('having')),
+            joins=tuple(
+                Join(
+                    type=join.get('type', 'INNER').upper(),
+                    table=TableRef(join['table']['name'], join['table'].get('alias')),
+                    left=join.get('on', {}).get('left'),
+                    right=join.get('on', {}).get('right'),
+                    operator=Operator(join.get('on', {}).get('operator', '='))
+                )
+                for join in data.get('joins') or []
+            ),
+            distinct=bool(data.get('distinct', False)),
+            offset=data.get('offset'),
+            hints=hints_from_dict(data.get('hints'))
+        )
+    elif operation == 'EXISTS':
+        return ExistsStatement(statement_from_dict(data['query']), data.get('alias', 'exists'))
+    elif operation == 'INSERT_DATA':
+        return InsertStatement(
+            data['table_name'],
+            tuple(data['columns']),
+            tuple(tuple(row) for row in data['values'])
+        )
+    elif operation == 'UPDATE_DATA':
+        return UpdateStatement(
+            data['table_name'],
+            tuple(data['columns']),
+            tuple(data['values']),
+            predicate_from_dict(data.get('filter')),
+            hints_from_dict(data.get('hints'))
+        )
+    elif operation == 'DELETE_DATA':
+        return DeleteStatement(data['table_name'], predicate_from_dict(data.get('filter')),
+                               hints_from_dict(data.get('hints')))
+    return Command(data)
@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from enum import Enum
+
+
+_REGEX_METACHARACTERS = set('\\.^$|?*+()[]{}')
+
+
+# Escapes only regex metacharacters, the result is valid PCRE (MongoDB) and Java (Neo4j) syntax
+def _escape_regex(text: str) -> str:
+    return ''.join('\\' + char if char in _REGEX_METACHARACTERS else char for char in text)
+
+
+class LikeKind(Enum):
+    EXACT = 'EXACT'
+    PREFIX = 'PREFIX'
+    SUFFIX = 'SUFFIX'
+    CONTAINS = 'CONTAINS'
+    PATTERN = 'PATTERN'
+
+
+@dataclass(frozen=True, slots=True)
+class LikePattern:
+    kind: LikeKind
+    # Literal text for EXACT/PREFIX/SUFFIX/CONTAINS
+    text: str
+    # Regex matching the whole value, without anchors
+    regex: str
+
+    # For engines that search anywhere in the value (MongoDB)
+    def search_regex(self) -> str:
+        if self.kind == LikeKind.PREFIX:
+            return '^' + _escape_regex(self.text)
+        elif self.kind == LikeKind.SUFFIX:
+            return _escape_regex(self.text) + '$'
+        elif self.kind == LikeKind.CONTAINS:
+            return _escape_regex(self.text)
+
+        regex = '^' + self.regex + '$'
+        if regex.startswith('^.*'):
+            regex = regex[3:]
+        if regex.endswith('.*$'):
+            regex = regex[:-3]
+        return regex
+
+
+def _tokenize(pattern: str):
+    tokens = []
+    literal = ''
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\' and index + 1 < len(pattern):
+            literal += pattern[index + 1]
+            index += 2
+            continue
+        if char in ('%', '_'):
+            if literal:
+                tokens.append(literal)
+                literal = ''
+            # Consecutive `%` match the same as a single one
+            if not (char == '%' and tokens and tokens[-1] == '%'):
+                tokens.append(char)
+        else:
+            literal += char
+        index += 1
+    if literal:
+        tokens.append(literal)
+    return tokens
+
+
+def analyze_like(pattern: str) -> LikePattern:
+    tokens = _tokenize(pattern)
+    regex = ''.join('.*' if token == '%' else '.' if token == '_' else _escape_regex(token) for token in tokens)
+
+    wildcards = [token for token in tokens if token in ('%', '_')]
+    literals = [token for token in tokens if token not in ('%', '_')]
+    text = literals[0] if len(literals) == 1 else ''
+
+    if not wildcards:
+        return LikePattern(LikeKind.EXACT, ''.join(literals), regex)
+    if '_' not in wildcards and len(literals) <= 1:
+        if tokens == ['%'] or (len(tokens) == 2 and tokens[1] == '%'):
+            return LikePattern(LikeKind.PREFIX, text, regex)
+        if len(tokens) == 2 and tokens[0] == '%':
+            return LikePattern(LikeKind.SUFFIX, text, regex)
+        if len(tokens) == 3 and tokens[0] == '%' and tokens[2] == '%':
+            return LikePattern(LikeKind.CONTAINS, text, regex)
+    return LikePattern(LikeKind.PATTERN, '', regex)
+
+
+def escape_like(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def normalize_escape(pattern: str, escape: str) -> str:
+    result = ''
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == escape and index + 1 < len(pattern):
+            result += '\\' + pattern[index + 1]
+            index += 2
+            continue
+        result += '\\\\' if char == '\\' else char
+        index += 1
+    return result
+
+
+def like_to_regex(pattern) -> str:
+    return analyze_like(pattern).search_regex()
+
+
+# For engines that match the whole value (Neo4j `=~`)
+def like_to_full_regex(pattern, case_insensitive: bool = False) -> str:
+    return ('(?i)' if case_insensitive else '') + analyze_like(pattern).regex
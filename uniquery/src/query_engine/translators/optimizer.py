@@ -0,0 +1,376 @@
+from dataclasses import replace
+from decimal import Decimal
+
+from uniquery.src.query_engine.translators.parameters import Parameter
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, InList, Between, IsNull, Range, Constant,
+                                                      Not, Logical, TRUE, FALSE, SelectStatement, ExistsStatement,
+                                                      UpdateStatement, DeleteStatement, ColumnRef)
+
+_MAX_PASSES = 8
+
+_BOUND_OPERATORS = (Operator.EQ, Operator.GT, Operator.GTE, Operator.LT, Operator.LTE)
+
+# Values only known per row or per execution, rules never compare them
+_UNKNOWN_VALUES = (Parameter, ColumnRef)
+
+
+# Literals are only compared with literals of the same kind, bools never (True == 1 in Python)
+def _same_kind(values):
+    kinds = set()
+    for value in values:
+        if isinstance(value, bool):
+            return False
+        kinds.add('number' if isinstance(value, (int, float, Decimal)) else type(value))
+    return len(kinds) <= 1
+
+
+# Membership that tells True from 1 and 1 from 1.0, dataclass equality does not
+def _contains(items, item):
+    return any(item == other and repr(item) == repr(other) for other in items)
+
+
+# `rewrite` must return the very same object when the rule does not apply
+class Rule:
+    name = 'rule'
+
+    def __init__(self):
+        self.fired = 0
+
+    def rewrite(self, predicate):
+        raise NotImplementedError
+
+
+# TRUE/FALSE operands absorb or drop out of AND/OR, NOT of a constant is evaluated
+class FoldConstants(Rule):
+    name = 'fold_constants'
+
+    def rewrite(self, predicate):
+        if isinstance(predicate, Not) and isinstance(predicate.operand, Constant):
+            return FALSE if predicate.operand.value else TRUE
+        if not isinstance(predicate, Logical):
+            return predicate
+
+        absorbing, neutral = (FALSE, TRUE) if predicate.operator == Operator.AND else (TRUE, FALSE)
+        if absorbing in predicate.operands:
+            return absorbing
+        if neutral not in predicate.operands:
+            return predicate
+        operands = tuple(operand for operand in predicate.operands if operand != neutral)
+        if not operands:
+            return neutral
+        return operands[0] if len(operands) == 1 else Logical(predicate.operator, operands)
+
+
+# Nested AND/OR of the same kind are inlined, single-operand groups and double negation removed
+class FlattenLogical(Rule):
+    name = 'flatten_logical'
+
+    def rewrite(self, predicate):
+        if isinstance(predicate, Not) and isinstance(predicate.operand, Not):
+            return predicate.operand.operand
+        if not isinstance(predicate, Logical):
+            return predicate
+        if len(predicate.operands) == 1:
+            return predicate.operands[0]
+        if not any(isinstance(operand, Logical) and operand.operator == predicate.operator
+                   for operand in predicate.operands):
+            return predicate
+
+        operands = []
+        for operand in predicate.operands:
+            if isinstance(operand, Logical) and operand.operator == predicate.operator:
+                operands.extend(operand.operands)
+            else:
+                operands.append(operand)
+        return Logical(predicate.operator, tuple(operands))
+
+
+# Repeated operands of an AND/OR are kept once
+class RemoveDuplicates(Rule):
+    name = 'remove_duplicates'
+
+    def rewrite(self, predicate):
+        if not isinstance(predicate, Logical):
+            return predicate
+
+        operands = []
+        for operand in predicate.operands:
+            if not _contains(operands, operand):
+                operands.append(operand)
+        if len(operands) == len(predicate.operands):
+            return predicate
+        return operands[0] if len(operands) == 1 else Logical(predicate.operator, tuple(operands))
+
+
+# `a = 1 OR a = 2 OR a IN (3)` becomes `a IN (1, 2, 3)`
+class OrEqualitiesToIn(Rule):
+    name = 'or_equalities_to_in'
+
+    @staticmethod
+    def _values(operand):
+        if isinstance(operand, Comparison) and operand.operator == Operator.EQ and not operand.aggregation_function \
+                and not isinstance(operand.value, ColumnRef):
+            return (operand.value,)
+        if isinstance(operand, InList):
+            return operand.values
+        return None
+
+    def rewrite(self, predicate):
+        if not isinstance(predicate, Logical) or predicate.operator != Operator.OR:
+            return predicate
+
+        groups = {}
+        for operand in predicate.operands:
+            if self._values(operand) is not None:
+                groups.setdefault(operand.column, []).append(operand)
+        mergeable = {column for column, operands in groups.items() if len(operands) > 1}
+        if not mergeable:
+            return predicate
+
+        operands = []
+        for operand in predicate.operands:
+            column = getattr(operand, 'column', None)
+            if column not in mergeable or self._values(operand) is None:
+                operands.append(operand)
+                continue
+            if column not in groups:
+                continue
+            values = []
+            for member in groups.pop(column):
+                for value in self._values(member):
+                    if not _contains(values, value):
+                        values.append(value)
+            operands.append(InList(column, tuple(values)))
+        return operands[0] if len(operands) == 1 else Logical(Operator.OR, tuple(operands))
+
+
+# Without scalar_fields (MongoDB arrays can meet each bound with a different element) only range bounds are combined
+class MergeRanges(Rule):
+    name = 'merge_ranges'
+
+    def __init__(self, scalar_fields: bool = True):
+        super().__init__()
+        self.scalar_fields = scalar_fields
+
+    @staticmethod
+    def _is_bound(operand):
+        if isinstance(operand, Comparison):
+            return operand.operator in _BOUND_OPERATORS and not isinstance(operand.value, _UNKNOWN_VALUES)
+        if isinstance(operand, Between):
+            return not isinstance(operand.low, _UNKNOWN_VALUES) and not isinstance(operand.high, _UNKNOWN_VALUES)
+        if isinstance(operand, Range):
+            return not isinstance(operand.low, _UNKNOWN_VALUES) and not isinstance(operand.high, _UNKNOWN_VALUES)
+        return False
+
+    def _merge(self, column, aggregation_function, operands):
+        if not _same_kind(_bound_values(operands)):
+            return None
+        if not self.scalar_fields and any(isinstance(operand, Comparison) and operand.operator == Operator.EQ
+                                          for operand in operands):
+            return None
+
+        low = high = None
+        low_inclusive = high_inclusive = True
+        equals = []
+
+        def tighten_low(value, inclusive):
+            nonlocal low, low_inclusive
+            if low is None or value > low or (value == low and not inclusive):
+                low, low_inclusive = value, inclusive
+
+        def tighten_high(value, inclusive):
+            nonlocal high, high_inclusive
+            if high is None or value < high or (value == high and not inclusive):
+                high, high_inclusive = value, inclusive
+
+        try:
+            for operand in operands:
+                if isinstance(operand, Comparison):
+                    if operand.operator == Operator.EQ:
+                        equals.append(operand.value)
+                    elif operand.operator in (Operator.GT, Operator.GTE):
+                        tighten_low(operand.value, operand.operator == Operator.GTE)
+                    else:
+                        tighten_high(operand.value, operand.operator == Operator.LTE)
+                elif isinstance(operand, Between):
+                    tighten_low(operand.low, True)
+                    tighten_high(operand.high, True)
+                else:
+                    if operand.low is not None:
+                        tighten_low(operand.low, operand.low_inclusive)
+                    if operand.high is not None:
+                        tighten_high(operand.high, operand.high_inclusive)
+
+            if not self.scalar_fields:
+                return Range(column, low, high, low_inclusive, high_inclusive, aggregation_function)
+            if any(value != equals[0] for value in equals[1:]):
+                return FALSE
+            if low is not None and high is not None:
+                if low > high or (low == high and not (low_inclusive and high_inclusive)):
+                    return FALSE
+                if low == high:
+                    equals.append(low)
+            if equals:
+                value = equals[0]
+                if low is not None and (value < low or (value == low and not low_inclusive)):
+                    return FALSE
+                if high is not None and (value > high or (value == high and not high_inclusive)):
+                    return FALSE
+                return Comparison(column, Operator.EQ, value, aggregation_function)
+        except TypeError:
+            # Bounds of incomparable types are left for the server to evaluate
+            return None
+
+        return Range(column, low, high, low_inclusive, high_inclusive, aggregation_function)
+
+    def rewrite(self, predicate):
+        if not isinstance(predicate, Logical) or predicate.operator != Operator.AND:
+            return predicate
+
+        groups = {}
+        for operand in predicate.operands:
+            if self._is_bound(operand):
+                key = (operand.column, getattr(operand, 'aggregation_function', None))
+                groups.setdefault(key, []).append(operand)
+
+        merged = {}
+        for key, operands in groups.items():
+            if len(operands) > 1:
+                result = self._merge(key[0], key[1], operands)
+                if result is not None:
+                    merged[key] = result
+        if not merged:
+            return predicate
+        if FALSE in merged.values():
+            return FALSE
+
+        operands = []
+        for operand in predicate.operands:
+            key = (getattr(operand, 'column', None), getattr(operand, 'aggregation_function', None))
+            if key not in merged or not self._is_bound(operand):
+                operands.append(operand)
+            elif merged[key] is not None:
+                operands.append(merged[key])
+                merged[key] = None
+        return operands[0] if len(operands) == 1 else Logical(Operator.AND, tuple(operands))
+
+
+# Without scalar_fields only an empty IN and a condition ANDed with its negation fold, arrays can hold both 1 and 2
+class DetectContradictions(Rule):
+    name = 'detect_contradictions'
+
+    def __init__(self, scalar_fields: bool = True):
+        super().__init__()
+        self.scalar_fields = scalar_fields
+
+    def rewrite(self, predicate):
+        if isinstance(predicate, InList) and not predicate.values:
+            return FALSE
+        if not isinstance(predicate, Logical) or predicate.operator != Operator.AND:
+            return predicate
+
+        operands = predicate.operands
+        if not self.scalar_fields:
+            return FALSE if any(isinstance(operand, Not) and _contains(operands, operand.operand)
+                                for operand in operands) else predicate
+        null_columns = {operand.column for operand in operands if isinstance(operand, IsNull)}
+        not_null_columns = {operand.operand.column for operand in operands
+                            if isinstance(operand, Not) and isinstance(operand.operand, IsNull)}
+        if null_columns & not_null_columns:
+            return FALSE
+
+        equals = {}
+        for operand in operands:
+            if isinstance(operand, (Comparison, InList, Between, Range)) and operand.column in null_columns \
+                    and not getattr(operand, 'aggregation_function', None):
+                # Comparisons against NULL are never true
+                return FALSE
+            if isinstance(operand, Not) and _contains(operands, operand.operand):
+                return FALSE
+            if isinstance(operand, Comparison) and operand.operator == Operator.EQ \
+                    and not operand.aggregation_function and not isinstance(operand.value, _UNKNOWN_VALUES):
+                equals[operand.column] = operand.value
+
+        for operand in operands:
+            if isinstance(operand, InList) and operand.column in equals \
+                    and not any(isinstance(value, _UNKNOWN_VALUES) for value in operand.values) \
+                    and _same_kind((equals[operand.column],) + tuple(operand.values)) \
+                    and equals[operand.column] not in operand.values:
+                return FALSE
+        return predicate
+
+
+def _bound_values(operands):
+    for operand in operands:
+        if isinstance(operand, Comparison):
+            yield operand.value
+        else:
+            yield from (value for value in (operand.low, operand.high) if value is not None)
+
+
+# Pass scalar_fields=False for targets whose fields can be arrays (MongoDB)
+def default_rules(scalar_fields: bool = True):
+    return [
+        FoldConstants(),
+        FlattenLogical(),
+        RemoveDuplicates(),
+        OrEqualitiesToIn(),
+        MergeRanges(scalar_fields),
+        DetectContradictions(scalar_fields)
+    ]
+
+
+class PredicateOptimizer:
+
+    def __init__(self, rules=None, max_passes: int = _MAX_PASSES):
+        self.rules = list(rules) if rules is not None else default_rules()
+        self.max_passes = max_passes
+
+    def add_rule(self, rule: Rule) -> None:
+        self.rules.append(rule)
+
+    def stats(self) -> dict:
+        return {rule.name: rule.fired for rule in self.rules}
+
+    def optimize(self, predicate):
+        if predicate is None:
+            return None
+        for _ in range(self.max_passes):
+            rewritten = self._rewrite(predicate)
+            if rewritten == predicate:
+                return rewritten
+            predicate = rewritten
+        return predicate
+
+    def optimize_statement(self, statement):
+        if isinstance(statement, SelectStatement):
+            filter_ = self.optimize(statement.filter)
+            having = self.optimize(statement.having)
+            if filter_ is statement.filter and having is statement.having:
+                return statement
+            return replace(statement, filter=filter_, having=having)
+        if isinstance(statement, ExistsStatement):
+            query = self.optimize_statement(statement.query)
+            return statement if query is statement.query else replace(statement, query=query)
+        if isinstance(statement, (UpdateStatement, DeleteStatement)):
+            filter_ = self.optimize(statement.filter)
+            return statement if filter_ is statement.filter else replace(statement, filter=filter_)
+        return statement
+
+    # Bottom-up: children first, then every rule on the node itself
+    def _rewrite(self, predicate):
+        if isinstance(predicate, Logical):
+            operands = tuple(self._rewrite(operand) for operand in predicate.operands)
+            if any(new is not old for new, old in zip(operands, predicate.operands)):
+                predicate = Logical(predicate.operator, operands)
+        elif isinstance(predicate, Not):
+            operand = self._rewrite(predicate.operand)
+            if operand is not predicate.operand:
+                predicate = Not(operand)
+
+        for rule in self.rules:
+            result = rule.rewrite(predicate)
+            if result is not predicate:
+                rule.fired += 1
+                predicate = result
+        return predicate
@@ -0,0 +1,133 @@
+from sqlglot.tokens import Tokenizer, TokenType
+
+# Positional `?` placeholders are renamed to `:_<index>` before parsing so they keep their textual order
+_POSITIONAL_PREFIX = '_'
+
+
+# `key` is the position of a `?` or the name of a `:name` placeholder
+class Parameter:
+    __slots__ = ('key', 'transform')
+
+    def __init__(self, key, transform=None):
+        self.key = key
+        self.transform = transform
+
+    @classmethod
+    def from_placeholder(cls, name):
+        if name is None:
+            raise Exception("Unnumbered positional placeholder")
+        if name.startswith(_POSITIONAL_PREFIX) and name[len(_POSITIONAL_PREFIX):].isdigit():
+            return cls(int(name[len(_POSITIONAL_PREFIX):]))
+        return cls(name)
+
+    @property
+    def name(self) -> str:
+        return f"p{self.key}" if isinstance(self.key, int) else self.key
+
+    def with_transform(self, transform):
+        return Parameter(self.key, transform)
+
+    def resolve(self, parameters):
+        if isinstance(self.key, int):
+            if isinstance(parameters, dict) or parameters is None or self.key >= len(parameters):
+                raise Exception(f"Missing value for positional parameter {self.key + 1}")
+            value = parameters[self.key]
+        else:
+            if not isinstance(parameters, dict) or self.key not in parameters:
+                raise Exception(f"Missing value for parameter `:{self.key}`")
+            value = parameters[self.key]
+        return self.transform(value) if self.transform else value
+
+    def __eq__(self, other):
+        return isinstance(other, Parameter) and self.key == other.key and self.transform == other.transform
+
+    def __hash__(self):
+        return hash((self.key, self.transform))
+
+    def __repr__(self):
+        return f"Parameter({self.key!r})"
+
+
+# sqlglot does not keep the position of a parsed `?`, so each one is numbered first
+def number_positional_placeholders(sql: str) -> str:
+    if '?' not in sql:
+        return sql
+    try:
+        tokens = Tokenizer().tokenize(sql)
+    except Exception:
+        return sql
+
+    parts = []
+    position = 0
+    index = 0
+    for token in tokens:
+        if token.token_type == TokenType.PLACEHOLDER and token.text == '?':
+            parts.append(sql[position:token.start])
+            parts.append(f":{_POSITIONAL_PREFIX}{index}")
+            position = token.end + 1
+            index += 1
+    parts.append(sql[position:])
+    return "".join(parts)
+
+
+def has_parameters(template) -> bool:
+    if isinstance(template, Parameter):
+        return True
+    if isinstance(template, dict):
+        return any(has_parameters(key) or has_parameters(value) for key, value in template.items())
+    if isinstance(template, (list, tuple)):
+        return any(has_parameters(item) for item in template)
+    return False
+
+
+# Containers without parameters are rebuilt shallowly, scalars are shared
+def bind_parameters(template, parameters):
+    if isinstance(template, Parameter):
+        return template.resolve(parameters)
+    if isinstance(template, dict):
+        return {
+            bind_parameters(key, parameters): bind_parameters(value, parameters)
+            for key, value in template.items()
+        }
+    if isinstance(template, list):
+        return [bind_parameters(item, parameters) for item in template]
+    if isinstance(template, tuple):
+        return tuple(bind_parameters(item, parameters) for item in template)
+    return template
+
+
+# `?` / `:name` placeholders as `%s` / `%(name)s`, literal `%` escaped
+def to_pyformat_sql(sql: str):
+    tokens = Tokenizer().tokenize(sql)
+    parts = []
+    keys = []
+    position = 0
+    skip_next = False
+
+    def _copy_until(end):
+        parts.append(sql[position:end].replace('%', '%%'))
+
+    for index, token in enumerate(tokens):
+        if skip_next:
+            skip_next = False
+            continue
+        if token.token_type == TokenType.PLACEHOLDER and token.text == '?':
+            _copy_until(token.start)
+            parts.append('%s')
+            keys.append(len(keys))
+            position = token.end + 1
+        elif token.token_type == TokenType.COLON and index + 1 < len(tokens):
+            next_token = tokens[index + 1]
+            if next_token.start == token.end + 1 and next_token.token_type in (TokenType.VAR, TokenType.NUMBER):
+                _copy_until(token.start)
+                parts.append(f"%({next_token.text})s")
+                keys.append(next_token.text)
+                position = next_token.end + 1
+                skip_next = True
+    if not keys:
+        return sql, keys
+    _copy_until(len(sql))
+
+    if any(isinstance(key, int) for key in keys) and any(isinstance(key, str) for key in keys):
+        raise Exception("Positional and named parameters cannot be mixed in one statement")
+    return "".join(parts), keys
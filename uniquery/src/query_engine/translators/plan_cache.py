@@ -0,0 +1,200 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+from functools import partial
+
+import sqlglot
+from bson import json_util
+from sqlglot.tokens import Tokenizer, TokenType
+
+from uniquery.src.utils import DatabaseType
+from uniquery.src.utils.constants import PLAN_CACHE_SIZE
+from uniquery.src.query_engine.translators.parameters import Parameter
+from uniquery.src.query_engine.translators.like_pattern import like_to_regex, like_to_full_regex
+from uniquery.src.query_engine.translators.query_generator.cyper import CypherQuery
+
+# Bind-time transforms a persisted plan may name, nothing else is called on load
+_TRANSFORMS = {transform.__name__: transform for transform in (like_to_regex, like_to_full_regex)}
+
+
+# Identifiers and string literals are left as written
+def normalize_sql(sql: str) -> str:
+    try:
+        tokens = Tokenizer().tokenize(sql)
+    except Exception:
+        return " ".join(sql.split())
+
+    parts = []
+    for index, token in enumerate(tokens):
+        text = token.text
+        if token.token_type == TokenType.STRING:
+            text = "'" + text.replace("'", "''") + "'"
+        elif token.token_type == TokenType.HINT:
+            # Hints name indexes, which are case-sensitive
+            text = " ".join(text.split())
+        elif token.token_type == TokenType.IDENTIFIER:
+            text = '"' + text.replace('"', '""') + '"'
+        elif token.token_type == TokenType.VAR:
+            # Function names are case-insensitive, column and table names are not
+            next_token = tokens[index + 1] if index + 1 < len(tokens) else None
+            if next_token is not None and next_token.token_type == TokenType.L_PAREN:
+                text = text.upper()
+        else:
+            text = text.upper()
+        parts.append(text)
+    return " ".join(parts)
+
+
+# Thread-safe LRU of translated plans keyed by normalized SQL and database type
+class PlanCache:
+    def __init__(self, max_size: int = PLAN_CACHE_SIZE, path: str = None):
+        if max_size <= 0:
+            raise ValueError("Plan cache size must be a positive integer")
+        self.max_size = max_size
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+        if path:
+            self.load(path)
+
+    @staticmethod
+    def make_key(sql_query: str, database_type: DatabaseType):
+        return database_type.value, normalize_sql(sql_query)
+
+    def get(self, key):
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is None:
+                self.misses += 1
+                return None
+            self._plans.move_to_end(key)
+            self.hits += 1
+        # Callers (and drivers such as pymongo's insert_many) mutate plans in place
+        return copy.deepcopy(plan)
+
+    def put(self, key, plan) -> None:
+        plan = copy.deepcopy(plan)
+        with self._lock:
+            self._plans[key] = plan
+            self._plans.move_to_end(key)
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, max_size: int) -> None:
+        if max_size <= 0:
+            raise ValueError("Plan cache size must be a positive integer")
+        with self._lock:
+            self.max_size = max_size
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'size': len(self._plans),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+    def __len__(self):
+        return len(self._plans)
+
+    # Persist plans as extended JSON stamped with the sqlglot version that produced them,
+    # plans holding values JSON cannot describe are left out
+    def save(self, path: str = None) -> None:
+        path = path or self.path
+        if not path:
+            raise ValueError("No plan cache path configured")
+        with self._lock:
+            items = list(self._plans.items())
+        plans = []
+        for key, plan in items:
+            try:
+                plans.append([list(key), _encode_plan(plan)])
+            except TypeError:
+                continue
+        snapshot = {'sqlglot_version': sqlglot.__version__, 'plans': plans}
+        with open(path, 'w') as f:
+            f.write(json_util.dumps(snapshot, json_options=json_util.CANONICAL_JSON_OPTIONS))
+
+    # Load previously persisted plans, ignoring unreadable caches and those written by another sqlglot version
+    def load(self, path: str = None) -> bool:
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'r') as f:
+                snapshot = json_util.loads(f.read())
+            if snapshot.get('sqlglot_version') != sqlglot.__version__:
+                return False
+            plans = [((database_type, sql), _decode_plan(plan)) for (database_type, sql), plan in snapshot['plans']]
+        except Exception:
+            return False
+        with self._lock:
+            for key, plan in plans:
+                self._plans[key] = plan
+            while len(self._plans) > self.max_size:
+                self._plans.popitem(last=False)
+        return True
+
+
+# Values JSON has no type for are written as tagged objects
+def _encode_plan(value):
+    if isinstance(value, CypherQuery):
+        transforms = {name: _encode_transform(transform) for name, transform in value.bind_transforms.items()}
+        return {'$cypher': str(value), 'timeout': value.timeout, 'bind_transforms': transforms,
+                'read_only': value.read_only}
+    if isinstance(value, Parameter):
+        return {'$parameter': value.key, 'transform': _encode_transform(value.transform)}
+    if isinstance(value, tuple):
+        return {'$tuple': [_encode_plan(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode_plan(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _encode_plan(item) for key, item in value.items()}
+    return value
+
+
+def _encode_transform(transform):
+    if transform is None:
+        return None
+    keywords = {}
+    if isinstance(transform, partial):
+        transform, keywords = transform.func, dict(transform.keywords)
+    if _TRANSFORMS.get(getattr(transform, '__name__', None)) is not transform:
+        raise TypeError(f"Cannot persist the transform {transform!r}")
+    return {'name': transform.__name__, 'keywords': keywords}
+
+
+def _decode_plan(value):
+    if isinstance(value, list):
+        return [_decode_plan(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if '$cypher' in value:
+        transforms = {name: _decode_transform(transform) for name, transform in value['bind_transforms'].items()}
+        return CypherQuery(value['$cypher'], value['timeout'], transforms, value.get('read_only', False))
+    if '$parameter' in value:
+        return Parameter(value['$parameter'], _decode_transform(value['transform']))
+    if '$tuple' in value:
+        return tuple(_decode_plan(item) for item in value['$tuple'])
+    return {key: _decode_plan(item) for key, item in value.items()}
+
+
+def _decode_transform(encoded):
+    if encoded is None:
+        return None
+    transform = _TRANSFORMS[encoded['name']]
+    return partial(transform, **encoded['keywords']) if encoded['keywords'] else transform
@@ -1,33 +1,341 @@
-def get_cypher_query(parsed_data: dict):
-    tables = parsed_data["tables"]
-    joins = parsed_data["joins"]
-    where_clause = parsed_data["where_clause"]
-    return_fields = parsed_data["return_fields"]
-    is_distinct = parsed_data["is_distinct"]
-    order_by_clause = parsed_data["order_by_clause"]
-    limit_clause = parsed_data["limit_clause"]
-
-    if not tables:
-        return "Unsupported query: No table found."
-
-    # Build MATCH path
-    match_clause = f"({tables[0]['alias']}:{tables[0]['label']})"
-    for join in joins:
-        match_clause += f"-[{join['alias']}:{join['relationship']}]->({join['target_alias']}:{join['target_table']})"
-
-    cypher_query = f"MATCH {match_clause}"
-    if where_clause:
-        cypher_query += f"\n{where_clause}"
-    if return_fields:
-        distinct_keyword = "DISTINCT " if is_distinct else ""
-        cypher_query += f"\nRETURN {distinct_keyword}{', '.join(return_fields)}"
+import datetime
+import decimal
+from functools import partial
+
+from uniquery.src.query_engine.translators.parameters import Parameter
+from uniquery.src.query_engine.translators.coercion import Point
+from uniquery.src.query_engine.translators.like_pattern import LikeKind, analyze_like, like_to_full_regex
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, InList, Between, IsNull, Range, Constant,
+                                                      Not, Logical, RawCondition, SelectStatement, ExistsStatement,
+                                                      InsertStatement, UpdateStatement, DeleteStatement, Projection,
+                                                      map_columns, statement_from_dict, ColumnRef)
+
+_COMPARISON_OPERATORS = {
+    Operator.EQ: '=',
+    Operator.NEQ: '<>',
+    Operator.GT: '>',
+    Operator.GTE: '>=',
+    Operator.LT: '<',
+    Operator.LTE: '<='
+}
+
+_AGGREGATION_FUNCTIONS = {
+    'COUNT': 'count',
+    'SUM': 'sum',
+    'AVG': 'avg',
+    'MIN': 'min',
+    'MAX': 'max'
+}
+
+
+# Cypher text with its MAX_TIME timeout in seconds, bound value conversions and read-only flag
+class CypherQuery(str):
+    def __new__(cls, text, timeout=None, bind_transforms=None, read_only=False):
+        query = super().__new__(cls, text)
+        query.timeout = timeout
+        query.bind_transforms = bind_transforms or {}
+        query.read_only = read_only
+        return query
+
+
+def get_cypher_query(statement):
+    if isinstance(statement, dict):
+        statement = statement_from_dict(statement)
+
+    builder = _STATEMENT_BUILDERS.get(type(statement))
+    if builder is None:
+        raise Exception("This operation is not supported for Cypher translation")
+    query = builder(statement)
+    hints = getattr(statement, 'hints', None)
+    timeout = hints.max_time_ms / 1000 if hints is not None and hints.max_time_ms is not None else None
+    read_only = isinstance(statement, (SelectStatement, ExistsStatement))
+    return CypherQuery(query, timeout, _bind_transforms(statement), read_only)
+
+
+# Bound LIKE patterns are turned into regexes when their values are bound
+def _bind_transforms(statement):
+    if isinstance(statement, ExistsStatement):
+        statement = statement.query
+    transforms = {}
+    predicates = [getattr(statement, 'filter', None), getattr(statement, 'having', None)]
+    while predicates:
+        predicate = predicates.pop()
+        if isinstance(predicate, Logical):
+            predicates.extend(predicate.operands)
+        elif isinstance(predicate, Not):
+            predicates.append(predicate.operand)
+        elif isinstance(predicate, Comparison) and predicate.operator in (Operator.LIKE, Operator.ILIKE) \
+                and isinstance(predicate.value, Parameter):
+            transforms[predicate.value.name] = partial(like_to_full_regex,
+                                                       case_insensitive=predicate.operator == Operator.ILIKE)
+    return transforms
+
+
+def _get_create_query(statement: InsertStatement):
+    creates = []
+    for index, row in enumerate(statement.values):
+        properties = ", ".join(f"{column}: {_value(value)}" for column, value in zip(statement.columns, row))
+        creates.append(f"(n{index}:{statement.table_name} {{{properties}}})")
+    return f"CREATE {', '.join(creates)};"
+
+
+def _get_set_query(statement: UpdateStatement):
+    alias = 'n'
+    cypher_query = f"MATCH ({alias}:{statement.table_name})"
+    _reject_index_hint(statement.hints)
+    if statement.filter is not None:
+        cypher_query += f"\nWHERE {_condition(statement.filter, alias)}"
+    assignments = ", ".join(
+        f"{_property(column, alias)} = {_value(value)}" for column, value in zip(statement.columns, statement.values)
+    )
+    return cypher_query + f"\nSET {assignments};"
+
+
+def _get_delete_query(statement: DeleteStatement):
+    alias = 'n'
+    cypher_query = f"MATCH ({alias}:{statement.table_name})"
+    _reject_index_hint(statement.hints)
+    if statement.filter is not None:
+        cypher_query += f"\nWHERE {_condition(statement.filter, alias)}"
+    return cypher_query + f"\nDETACH DELETE {alias};"
+
+
+def get_cypher_match_query(statement: SelectStatement):
+    alias = statement.table.reference
+    columns = statement.columns
+
+    cypher_query = _match_clause(statement)
+
+    return_items = []
+    for col in columns:
+        if col.is_star:
+            return_items.append(alias)
+            continue
+        item = _return_item(col, alias)
+        if col.alias:
+            item += f" AS {col.alias}"
+        return_items.append(item)
+
+    # Cypher groups implicitly by the non-aggregated return items, HAVING becomes a WITH ... WHERE
+    having = statement.having
+    if having is None:
+        order_keys = [_order_key(order, alias, columns) for order in statement.order_by]
     else:
-        all_aliases = [tables[0]['alias']] + [j['alias'] for j in joins] + [j['target_alias'] for j in joins]
-        distinct_keyword = "DISTINCT " if is_distinct else ""
-        cypher_query += f"\nRETURN {distinct_keyword}{', '.join(all_aliases)}"
-    if order_by_clause:
-        cypher_query += f"\n{order_by_clause}"
-    if limit_clause:
-        cypher_query += f"\n{limit_clause}"
-    cypher_query += ";"
+        with_items = []
+        aggregate_names = {}
+        for col in columns:
+            name = col.alias or _default_name(col)
+            with_items.append(f"{_return_item(col, alias)} AS {name}")
+            if col.aggregation_function:
+                aggregate_names[(col.aggregation_function.upper(), col.name)] = name
+
+        def having_column(leaf):
+            function = getattr(leaf, 'aggregation_function', None)
+            if not function:
+                return _default_name(Projection(leaf.column))
+            key = (function.upper(), leaf.column)
+            if key not in aggregate_names:
+                aggregate_names[key] = f"{function.lower()}_{leaf.column.replace('*', 'all')}"
+                with_items.append(f"{_aggregate(function, leaf.column, alias)} AS {aggregate_names[key]}")
+            return aggregate_names[key]
+
+        having = map_columns(having, having_column)
+        # Only the names of the WITH are in scope after it, ordering aggregates join them
+        order_keys = [_order_key(order, alias, columns, having_column) for order in statement.order_by]
+        cypher_query += f"\nWITH {', '.join(with_items)}"
+        cypher_query += f"\nWHERE {_condition(having, None)}"
+        return_items = [col.alias or _default_name(col) for col in columns]
+
+    distinct_keyword = "DISTINCT " if statement.distinct else ""
+    cypher_query += f"\nRETURN {distinct_keyword}{', '.join(return_items)}"
+
+    if statement.order_by:
+        order_items = [
+            f"{key}{' DESC' if order.descending else ''}" for key, order in zip(order_keys, statement.order_by)
+        ]
+        cypher_query += f"\nORDER BY {', '.join(order_items)}"
+    if statement.offset is not None:
+        cypher_query += f"\nSKIP {_value(statement.offset)}"
+    if statement.limit is not None:
+        cypher_query += f"\nLIMIT {_value(statement.limit)}"
+
+    return cypher_query + ";"
+
+
+def _match_clause(statement: SelectStatement):
+    alias = statement.table.reference
+    if statement.joins:
+        raise Exception("JOIN is not supported for Cypher translation")
+
+    cypher_query = f"MATCH ({alias}:{statement.table.name})"
+    _reject_index_hint(statement.hints)
+    if statement.filter is not None:
+        cypher_query += f"\nWHERE {_condition(statement.filter, alias)}"
     return cypher_query
+
+
+# INDEX hints name an index, Cypher's USING INDEX takes label properties, so one is not read as the other
+def _reject_index_hint(hints):
+    if hints is not None and hints.indexes:
+        raise Exception("INDEX hints are not supported for Neo4j, USING INDEX names label properties, not indexes")
+
+
+def _get_exists_query(statement: ExistsStatement):
+    # The subquery stops at the first match
+    return f"RETURN EXISTS {{\n{_match_clause(statement.query)}\n}} AS {statement.alias};"
+
+
+def _return_item(col, alias):
+    if col.aggregation_function:
+        return _aggregate(col.aggregation_function, col.name, alias)
+    return _property(col.name, alias)
+
+
+def _aggregate(function, column, alias):
+    function = function.upper()
+    if function == 'COUNT_DISTINCT':
+        return f"count(DISTINCT {_property(column, alias)})"
+    function = _AGGREGATION_FUNCTIONS.get(function, function.lower())
+    if column in (None, '*'):
+        # count(n) over a bare label match is answered from the count store
+        return f"count({alias})" if function == 'count' and alias else f"{function}(*)"
+    return f"{function}({_property(column, alias)})"
+
+
+# After the WITH of a HAVING, `output_name` gives the name a column or aggregate has there
+def _order_key(order, alias, columns, output_name=None):
+    if not order.aggregation_function and any(col.alias == order.column for col in columns):
+        return order.column
+    if output_name is not None:
+        return output_name(order)
+    if order.aggregation_function:
+        function = order.aggregation_function.upper()
+        for col in columns:
+            if col.alias and (col.aggregation_function or '').upper() == function and col.name == order.column:
+                return col.alias
+        return _aggregate(order.aggregation_function, order.column, alias)
+    return _property(order.column, alias)
+
+
+def _default_name(col):
+    if col.aggregation_function:
+        return f"{col.aggregation_function.lower()}_{(col.name or 'all').replace('*', 'all')}"
+    return col.name.replace('.', '_')
+
+
+def _property(column, alias):
+    if alias is None or '.' in column:
+        return column
+    return f"{alias}.{column}"
+
+
+def _condition(predicate, alias):
+    builder = _CONDITION_BUILDERS.get(type(predicate))
+    if builder is None:
+        raise Exception(f"Unsupported filter: {predicate}")
+    return builder(predicate, alias)
+
+
+def _comparison_condition(predicate: Comparison, alias):
+    column = _property(predicate.column, alias)
+    if predicate.operator in (Operator.LIKE, Operator.ILIKE):
+        return _like_condition(column, predicate.value, predicate.operator == Operator.ILIKE)
+    if isinstance(predicate.value, ColumnRef):
+        return f"{column} {_COMPARISON_OPERATORS[predicate.operator]} {_property(predicate.value.column, alias)}"
+    return f"{column} {_COMPARISON_OPERATORS[predicate.operator]} {_value(predicate.value)}"
+
+
+# STARTS WITH / ENDS WITH / CONTAINS are served by text and range indexes, =~ is not.
+# ILIKE compares toLower(column), which no index covers.
+_STRING_OPERATORS = {
+    LikeKind.PREFIX: 'STARTS WITH',
+    LikeKind.SUFFIX: 'ENDS WITH',
+    LikeKind.CONTAINS: 'CONTAINS'
+}
+
+
+def _like_condition(column, pattern, case_insensitive=False):
+    flags = '(?i)' if case_insensitive else ''
+    if isinstance(pattern, Parameter):
+        # The bound value is converted to a regex when it is bound, see _bind_transforms
+        return f"{column} =~ {_value(pattern)}"
+
+    like = analyze_like(pattern)
+    if case_insensitive and like.kind != LikeKind.PATTERN:
+        column, like = f"toLower({column})", analyze_like(pattern.lower())
+    if like.kind == LikeKind.EXACT:
+        return f"{column} = {_value(like.text)}"
+    if like.kind in _STRING_OPERATORS:
+        return f"{column} {_STRING_OPERATORS[like.kind]} {_value(like.text)}"
+    return f"{column} =~ {_value(flags + like.regex)}"
+
+
+def _logical_condition(predicate: Logical, alias):
+    operands = [_condition(operand, alias) for operand in predicate.operands]
+    return f"({f' {predicate.operator.value} '.join(operands)})" if len(operands) > 1 else operands[0]
+
+
+def _not_condition(predicate: Not, alias):
+    if isinstance(predicate.operand, IsNull):
+        return f"{_property(predicate.operand.column, alias)} IS NOT NULL"
+    return f"NOT {_condition(predicate.operand, alias)}"
+
+
+def _between_condition(predicate: Between, alias):
+    return f"{_value(predicate.low)} <= {_property(predicate.column, alias)} <= {_value(predicate.high)}"
+
+
+def _range_condition(predicate: Range, alias):
+    condition = _property(predicate.column, alias)
+    if predicate.low is not None:
+        condition = f"{_value(predicate.low)} {'<=' if predicate.low_inclusive else '<'} {condition}"
+    if predicate.high is not None:
+        condition = f"{condition} {'<=' if predicate.high_inclusive else '<'} {_value(predicate.high)}"
+    return condition
+
+
+_CONDITION_BUILDERS = {
+    Comparison: _comparison_condition,
+    Logical: _logical_condition,
+    Not: _not_condition,
+    InList: lambda predicate, alias: f"{_property(predicate.column, alias)} IN {_value(predicate.values)}",
+    Between: _between_condition,
+    Range: _range_condition,
+    Constant: lambda predicate, alias: _value(predicate.value),
+    IsNull: lambda predicate, alias: f"{_property(predicate.column, alias)} IS NULL",
+    RawCondition: lambda predicate, alias: predicate.sql
+}
+
+_STATEMENT_BUILDERS = {
+    SelectStatement: get_cypher_match_query,
+    ExistsStatement: _get_exists_query,
+    InsertStatement: _get_create_query,
+    UpdateStatement: _get_set_query,
+    DeleteStatement: _get_delete_query
+}
+
+
+
+# Render a literal as Cypher source, bind values become `$name` driver parameters
+def _value(value):
+    if isinstance(value, Parameter):
+        return f"${value.name}"
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    # Temporal and point values compare with the typed properties, and their indexes, directly
+    if isinstance(value, datetime.datetime):
+        function = 'datetime' if value.tzinfo is not None else 'localdatetime'
+        return f"{function}('{value.isoformat()}')"
+    if isinstance(value, datetime.date):
+        return f"date('{value.isoformat()}')"
+    if isinstance(value, Point):
+        coordinates = {'x': value.x, 'y': value.y} if value.z is None else {'x': value.x, 'y': value.y, 'z': value.z}
+        return f"point({{{', '.join(f'{axis}: {coordinate}' for axis, coordinate in coordinates.items())}}})"
+    if isinstance(value, (list, tuple)):
+        return f"[{', '.join(_value(item) for item in value)}]"
+    escaped = str(value).replace('\\', '\\\\').replace("'", "\\'")
+    return f"'{escaped}'"
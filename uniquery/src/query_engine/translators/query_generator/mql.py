@@ -1,3 +1,13 @@
+from uniquery.src.query_engine.translators.parameters import Parameter
+from uniquery.src.query_engine.translators.coercion import to_bson
+from uniquery.src.query_engine.translators.hints import hinted_indexes
+from uniquery.src.query_engine.translators.like_pattern import LikeKind, analyze_like, like_to_regex
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, InList, Between, IsNull, Range, Constant,
+                                                      Not, Logical, RawCondition, SelectStatement, ExistsStatement,
+                                                      InsertStatement, UpdateStatement, DeleteStatement, Command,
+                                                      map_columns, predicate_columns, statement_from_dict,
+                                                      predicate_from_dict, ColumnRef)
+
 _DATABASE_OPERATIONS = [
     'CREATE_DATABASE',
     'USE_DATABASE',
@@ -10,315 +20,730 @@ _INDEX_QUERIES = [
     'DROP_INDEX'
 ]
 
-def get_mongodb_query(parsed_data: dict):
-    if parsed_data['operation'] in _DATABASE_OPERATIONS:
-        return parsed_data
-
-    if parsed_data['operation'] == 'CREATE_TABLE':
+_COMPARISON_OPERATORS = {
+    Operator.EQ: '$eq',
+    Operator.NEQ: '$ne',
+    Operator.GT: '$gt',
+    Operator.GTE: '$gte',
+    Operator.LT: '$lt',
+    Operator.LTE: '$lte'
+}
+
+_ACCUMULATORS = {
+    'SUM': '$sum',
+    'AVG': '$avg',
+    'MIN': '$min',
+    'MAX': '$max'
+}
+
+_AGGREGATE_FUNCTIONS = set(_ACCUMULATORS) | {'COUNT', 'COUNT_DISTINCT'}
+
+# Operations the connector can compare several hinted indexes for with explain
+_HINT_CANDIDATE_OPERATIONS = ('FIND', 'FIND_ONE', 'COUNT')
+
+def get_mongodb_query(statement):
+    if isinstance(statement, dict):
+        statement = statement_from_dict(statement)
+
+    builder = _STATEMENT_BUILDERS.get(type(statement))
+    if builder is None:
+        raise Exception("This operation is not supported for MQL translation")
+    # Typed SQL literals are sent as BSON dates, decimals and GeoJSON points
+    plan = to_bson(builder(statement))
+    if getattr(statement, 'hints', None) is not None:
+        _add_hints(plan, statement)
+    return plan
+
+
+# Several INDEX names become `hint_candidates` for the connector to choose from
+def _add_hints(plan, statement):
+    hints = statement.hints
+    if isinstance(statement, SelectStatement):
+        indexes = hinted_indexes(hints, statement.table.name, statement.table.alias)
+    else:
+        indexes = hinted_indexes(hints, statement.table_name)
+    if len(indexes) == 1:
+        plan['hint'] = indexes[0]
+    elif indexes:
+        if plan['operation'] not in _HINT_CANDIDATE_OPERATIONS:
+            raise Exception("INDEX hint with several indexes is supported for plain filtered queries only")
+        plan['hint_candidates'] = list(indexes)
+    if hints.max_time_ms is not None:
+        plan['max_time_ms'] = hints.max_time_ms
+    if hints.batch_size is not None:
+        plan['batch_size'] = hints.batch_size
+
+
+def _get_command_query(command: Command):
+    operation = command.operation
+    details = command.details
+
+    if operation in _DATABASE_OPERATIONS:
+        return command.to_dict()
+
+    if operation == 'CREATE_TABLE':
         return {
             'operation': 'CREATE_COLLECTION',
-            'table': parsed_data['table_name']
+            'table': details['table_name']
         }
-    elif parsed_data['operation'] == 'DROP_TABLE':
+    elif operation == 'DROP_TABLE':
         return {
             'operation': 'DROP_COLLECTION',
-            'table': parsed_data['table_name']
+            'table': details['table_name']
         }
-    elif parsed_data['operation'] == 'RENAME_TABLE':
+    elif operation == 'RENAME_TABLE':
         return {
             'operation': 'RENAME_COLLECTION',
-            'old_name': parsed_data['old_name'],
-            'new_name': parsed_data['new_name']
+            'old_name': details['old_name'],
+            'new_name': details['new_name']
         }
-    elif parsed_data['operation'] == 'SHOW_TABLES':
+    elif operation == 'SHOW_TABLES':
         return {
             'operation': 'SHOW_COLLECTIONS'
         }
-    elif parsed_data['operation'] == 'SHOW_TABLE':
+    elif operation == 'SHOW_TABLE':
         return {
             'operation': 'SHOW_COLLECTION',
-            'table_name': parsed_data['table_name']
-        }
-    elif parsed_data['operation'] in _INDEX_QUERIES:
-        return parsed_data
-
-    elif parsed_data['operation'] == 'INSERT_DATA':
-        documents = []
-        for row in parsed_data['values']:
-            document = dict(zip(parsed_data['columns'], row))
-            documents.append(document)
-        return {
-            'operation': 'INSERT_DATA',
-            'collection': parsed_data['table_name'],
-            'documents': documents
-        }
-    elif parsed_data['operation'] == 'UPDATE_DATA':
-        update_fields = dict(zip(parsed_data['columns'], parsed_data['values']))
-        return {
-            'operation': 'UPDATE_DATA',
-            'collection': parsed_data['table_name'],
-            'updates': update_fields,
-            'filter': _convert_filter_to_mql(parsed_data.get('filter', {}))
-        }
-    elif parsed_data['operation'] == 'DELETE_DATA':
-        return {
-            'operation': 'DELETE_DATA',
-            'collection': parsed_data['table_name'],
-            'filter': _convert_filter_to_mql(parsed_data.get('filter', {}))
+            'table_name': details['table_name']
         }
-    elif parsed_data["operation"] == 'SELECT':
-        return get_mongodb_find_query(parsed_data)
+    elif operation in _INDEX_QUERIES:
+        return command.to_dict()
 
     raise Exception("This operation is not supported for MQL translation")
 
 
-# Helper function to convert SQL-style filters to MongoDB MQL filters
-def _convert_filter_to_mql(filter_expr):
-    if not filter_expr:
-        return {}
+def _get_insert_query(statement: InsertStatement):
+    documents = []
+    for row in statement.values:
+        document = dict(zip(statement.columns, row))
+        documents.append(document)
+    return {
+        'operation': 'INSERT_DATA',
+        'collection': statement.table_name,
+        'documents': documents
+    }
 
-    operator = filter_expr['operator'].upper()
-    if operator == '=':
-        return {filter_expr['column']: filter_expr['value']}
-    elif operator == '>':
-        return {filter_expr['column']: {'$gt': filter_expr['value']}}
-    elif operator == '<':
-        return {filter_expr['column']: {'$lt': filter_expr['value']}}
-    elif operator in ('AND', 'OR'):
-        operands = [_convert_filter_to_mql(op) for op in filter_expr['operands']]
-        return {'$' + operator.lower(): operands}
-    else:
-        raise Exception(f"Unsupported filter operator: {operator}")
-
-def get_mongodb_find_query(parsed_sql):
-    operation = parsed_sql.get('operation')
-    collection = parsed_sql['table']['name']
-    columns = parsed_sql.get('columns', [])
-    filter_clause = parsed_sql.get('filter', {})
-    order_by = parsed_sql.get('order_by')
-    limit = parsed_sql.get('limit')
-    aggregate = parsed_sql.get('aggregate')
-    having = parsed_sql.get('having')
-    joins = parsed_sql.get('joins')
 
-    # Projection (fields to include)
-    projection = None
-    if columns and not (len(columns) == 1 and columns[0]['name'] == '*'):
-        projection = {"_id": 0}
-        for col in columns:
-            col_name = col['name']
-            alias = col.get('alias')
-            if alias:
-                projection[alias] = f"${col_name}"
-            else:
-                projection[col_name] = 1
+def _get_update_query(statement: UpdateStatement):
+    update_fields = dict(zip(statement.columns, statement.values))
+    return {
+        'operation': 'UPDATE_DATA',
+        'collection': statement.table_name,
+        'updates': update_fields,
+        'filter': parse_filter(statement.filter)
+    }
+
 
-    # Parse filter to MongoDB filter dict
-    filter_ = parse_filter(filter_clause) if filter_clause else {}
+def _get_delete_query(statement: DeleteStatement):
+    return {
+        'operation': 'DELETE_DATA',
+        'collection': statement.table_name,
+        'filter': parse_filter(statement.filter)
+    }
 
-    # Handle aggregation
-    if aggregate:
-        pipeline = []
-        group_id = {}
-        for key in aggregate:
-            group_id[key] = f"${key}"
-        group_stage = {'_id': group_id}
 
-        func_col_map = {}
+# `build()` returns a plain find() plan when only filter, sort, skip, limit and projection are left
+class PipelineBuilder:
+    def __init__(self, collection):
+        self.collection = collection
+        self.stages = []
 
-        # Add aggregation fields
-        for col in columns:
-            if 'aggregation_function' in col:
-                func = col['aggregation_function'].upper()
-                col_name = col.get('name').replace("*", "all")
-                alias = col.get('alias') or f"{func.lower()}_{col_name}"
-                func_col_map[f"{func.lower()}_{col_name}"] = alias
-                if func == 'COUNT':
-                    group_stage[alias] = {'$sum': 1}
-                elif func == 'SUM':
-                    group_stage[alias] = {'$sum': f"${col_name}"}
-                # Add more aggregation functions if needed
-
-        pipeline.append({'$group': group_stage})
-
-        # Handle having clause
-        if having:
-            having_func = having.get('aggregation_function', '').upper()
-            having_col = having.get('column').replace("*", "all")
-            func = f"{having_func.lower()}_{having_col}"
-            having_alias = func_col_map[func]
-            operator = having.get('operator')
-            value = having.get('value')
-            mongo_op = convert_operator_to_mongo(operator)
-            pipeline.append({'$match': {having_alias: {mongo_op: value}}})
+    def add(self, operator, spec):
+        self.stages.append({operator: spec})
+        return self
+
+    def match(self, filter_):
+        return self.add('$match', filter_) if filter_ else self
+
+    def lookup(self, spec):
+        return self.add('$lookup', spec)
+
+    def unwind(self, spec):
+        return self.add('$unwind', spec)
+
+    def group(self, spec):
+        return self.add('$group', spec)
+
+    def set(self, spec):
+        return self.add('$set', spec) if spec else self
+
+    def sort(self, spec):
+        return self.add('$sort', spec) if spec else self
+
+    def skip(self, count):
+        return self.add('$skip', count) if count else self
 
+    def limit(self, count):
+        return self.add('$limit', count) if count is not None else self
+
+    def project(self, spec):
+        return self.add('$project', spec) if spec else self
+
+    def pipeline(self):
+        stages = list(self.stages)
+        while _reorder_stages(stages) or _coalesce_stages(stages):
+            pass
+        return stages
+
+    def build(self):
+        stages = self.pipeline()
+        find = _as_find(stages)
+        if find is not None and find.get('limit') == 1 and not find.get('skip'):
+            # Single document probes skip cursor setup and batching
+            del find['limit']
+            return {'operation': 'FIND_ONE', 'collection': self.collection, **find}
+        if find is not None:
+            return {'operation': 'FIND', 'collection': self.collection, **find}
         return {
             'operation': 'AGGREGATE',
-            'collection': collection,
-            'pipeline': pipeline
+            'collection': self.collection,
+            'pipeline': stages
         }
 
-    # Handle joins
-    if joins:
-        pipeline = []
-        base_alias = parsed_sql['table'].get('alias') or parsed_sql['table']['name']
-
-        for join in joins:
-            join_type = join.get('type', 'INNER').upper()
-            join_table = join['table']['name']
-            join_alias = join['table'].get('alias') or join_table
-            on = join.get('on', {})
-
-            left = on.get('left', '')
-            right = on.get('right', '')
-
-            # Initialize local and foreign fields
-            local_field = foreign_field = None
-
-            # Determine which side refers to base table and which to joined table
-            if '.' in left and '.' in right:
-                left_prefix, left_field = left.split('.', 1)
-                right_prefix, right_field = right.split('.', 1)
-
-                if left_prefix == join_alias:
-                    foreign_field = left_field
-                    if right_prefix == base_alias:
-                        local_field = right_field
-                    else:
-                        local_field = right
-                elif right_prefix == join_alias:
-                    foreign_field = right_field
-                    if left_prefix == base_alias:
-                        local_field = left_field
-                    else:
-                        local_field = left
-
-            pipeline.append({
-                '$lookup': {
-                    'from': join_table,
-                    'localField': local_field,
-                    'foreignField': foreign_field,
-                    'as': join_alias
-                }
-            })
 
-            unwind_stage = {'$unwind': f"${join_alias}"}
-            if join_type == 'LEFT':
-                unwind_stage['$unwind'] = {'path': f"${join_alias}", 'preserveNullAndEmptyArrays': True}
-            pipeline.append(unwind_stage)
+def _stage(stage):
+    return next(iter(stage.items()))
+
+
+# Fields a $match or $sort stage reads, None when they cannot be determined
+def _stage_fields(stage):
+    operator, spec = _stage(stage)
+    if operator == '$sort':
+        return set(spec)
+    if operator == '$match':
+        return _filter_fields(spec)
+    return None
+
+
+def _filter_fields(filter_):
+    fields = set()
+    for key, value in filter_.items():
+        if key in ('$and', '$or', '$nor'):
+            for item in value:
+                nested = _filter_fields(item)
+                if nested is None:
+                    return None
+                fields |= nested
+        elif key.startswith('$'):
+            return None
+        else:
+            fields.add(key)
+    return fields
+
+
+def _joined_alias(stage):
+    operator, spec = _stage(stage)
+    if operator == '$lookup':
+        return spec['as']
+    path = spec['path'] if isinstance(spec, dict) else spec
+    return path.lstrip('$')
+
+
+def _touches(fields, alias):
+    return any(field == alias or field.startswith(alias + '.') for field in fields)
+
+
+def _can_swap(stages, index):
+    first, first_spec = _stage(stages[index])
+    second, second_spec = _stage(stages[index + 1])
+
+    if first == '$project':
+        # Move projections late, past stages that only read fields it passes through unchanged
+        if second in ('$skip', '$limit'):
+            return True
+        fields = _stage_fields(stages[index + 1]) if second in ('$match', '$sort') else None
+        return fields is not None and all(
+            first_spec.get(field) in (1, True, f"${field}") for field in fields
+        )
+    if first == '$sort' and second == '$match':
+        return True
+    if first in ('$lookup', '$unwind') and second in ('$match', '$sort'):
+        fields = _stage_fields(stages[index + 1])
+        return fields is not None and not _touches(fields, _joined_alias(stages[index]))
+    if first == '$lookup' and second in ('$skip', '$limit'):
+        # A lookup keeps one output document per input unless a later $unwind fans it out
+        alias = _joined_alias(stages[index])
+        return not any(
+            _stage(stage)[0] == '$unwind' and _joined_alias(stage) == alias for stage in stages[index + 2:]
+        )
+    if first == '$set' and second in ('$skip', '$limit'):
+        return True
+    return False
+
+
+def _reorder_stages(stages):
+    changed = False
+    for index in range(len(stages) - 1):
+        if _can_swap(stages, index):
+            stages[index], stages[index + 1] = stages[index + 1], stages[index]
+            changed = True
+    return changed
+
+
+def _coalesce_stages(stages):
+    for index in range(len(stages) - 1):
+        first, first_spec = _stage(stages[index])
+        second, second_spec = _stage(stages[index + 1])
+        if first != second:
+            continue
+        if first == '$match':
+            if set(first_spec) & set(second_spec):
+                merged = {'$and': [first_spec, second_spec]}
+            else:
+                merged = {**first_spec, **second_spec}
+        elif first == '$limit':
+            merged = min(first_spec, second_spec)
+        elif first == '$skip':
+            merged = first_spec + second_spec
+        else:
+            continue
+        stages[index:index + 2] = [{first: merged}]
+        return True
+    return False
+
+
+_FIND_STAGES = ['$match', '$sort', '$skip', '$limit', '$project']
+
+
+def _as_find(stages):
+    operators = [_stage(stage)[0] for stage in stages]
+    if any(operator not in _FIND_STAGES for operator in operators):
+        return None
+    positions = [_FIND_STAGES.index(operator) for operator in operators]
+    if positions != sorted(set(positions)):
+        return None
+
+    specs = dict(_stage(stage) for stage in stages)
+    find = {
+        'filter': specs.get('$match', {}),
+        'projection': specs.get('$project')
+    }
+    if '$sort' in specs:
+        find['sort'] = list(specs['$sort'].items())
+    if '$skip' in specs:
+        find['skip'] = specs['$skip']
+    if '$limit' in specs:
+        find['limit'] = specs['$limit']
+    return find
+
+
+def get_mongodb_find_query(statement):
+    if isinstance(statement, dict):
+        statement = statement_from_dict(statement)
+
+    columns = statement.columns
+    base_alias = statement.table.reference
+    builder = PipelineBuilder(statement.table.name)
+
+    # Columns qualified with the base table alias live at the top level of the document
+    def path(column):
+        prefix, _, field = column.partition('.')
+        return field if field and prefix == base_alias else column
+
+    aggregated = statement.group_by or any(
+        (col.aggregation_function or '').upper() in _AGGREGATE_FUNCTIONS for col in columns
+    )
+    # LIMIT and OFFSET apply to the one result row, not to the counted documents
+    if aggregated and not statement.joins and not statement.group_by and statement.having is None \
+            and statement.limit is None and statement.offset is None \
+            and len(columns) == 1 and columns[0].aggregation_function.upper() == 'COUNT':
+        return _get_count_query(statement, path)
+
+    if statement.joins:
+        _add_joins(builder, statement)
+    else:
+        builder.match(parse_filter(map_columns(statement.filter, _strip_qualifier(base_alias))))
+
+    # Aggregates without GROUP BY fold the whole input into a single group
+    if aggregated:
+        _add_grouping(builder, statement, path)
+        return builder.build()
+
+    if statement.distinct and not any(col.is_star for col in columns):
+        if len(columns) == 1 and not statement.joins and not statement.order_by and statement.limit is None \
+                and statement.offset is None:
+            return _get_distinct_query(statement, path)
+        _add_distinct(builder, statement, path)
+        return builder.build()
+
+    # ORDER BY may name a select alias, sorting happens before the projection renames fields
+    aliases = {col.alias: path(col.name) for col in columns if col.alias and not col.aggregation_function}
+    builder.sort({
+        aliases.get(order.column, path(order.column)): -1 if order.descending else 1 for order in statement.order_by
+    })
+    builder.skip(statement.offset)
+    builder.limit(statement.limit)
 
-        # After joins, project columns with aliases handled
+    # Projection (fields to include)
+    if statement.joins:
         project_stage = {}
         for col in columns:
-            name = col['name']
-            alias = col.get('alias')
+            name = col.name
+            project_key = col.alias or name
             if '.' in name:
-                # name like e.name or d.name
-                prefix, field = name.split('.', 1)
-                if prefix == base_alias:
-                    project_key = alias or name
-                    project_stage[project_key] = f"${field}"  # from base collection
-                else:
-                    project_key = alias or name
-                    project_stage[project_key] = f"${prefix}.{field}"  # from joined alias
+                project_stage[project_key] = f"${path(name)}"
             else:
-                project_key = alias or name
                 project_stage[project_key] = 1
-        pipeline.append({'$project': project_stage})
-
-        # Apply any filter on joined data after joins as $match
-        if filter_:
-            base_alias = parsed_sql['table'].get('alias') or parsed_sql['table']['name']
-            base_filters = {}
-
-            for key, value in filter_.items():
-                if '.' in key and key.startswith(base_alias + '.'):
-                    # Strip alias from key if present
-                    actual_key = key.split('.', 1)[1] if '.' in key else key
-                    base_filters[actual_key] = value
-                else:
-                    base_filters[key] = value
+        builder.project(project_stage)
+    elif columns and not (len(columns) == 1 and columns[0].name == '*'):
+        projection = {"_id": 0}
+        for col in columns:
+            if col.alias:
+                projection[col.alias] = f"${path(col.name)}"
+            else:
+                projection[path(col.name)] = 1
+        builder.project(projection)
 
-            if base_filters:
-                pipeline.append({'$match': base_filters})
+    return builder.build()
 
-        return {
-            'operation': 'AGGREGATE',
-            'collection': collection,
-            'pipeline': pipeline
-        }
 
-    # Simple find query
+# Unfiltered counts use estimated_document_count from collection metadata
+def _get_count_query(statement, path):
+    column = statement.columns[0]
+    filter_ = parse_filter(map_columns(statement.filter, _strip_qualifier(statement.table.reference)))
+    if column.name != '*':
+        # COUNT(column) skips nulls and missing fields
+        not_null = {path(column.name): {'$ne': None}}
+        filter_ = {'$and': [filter_, not_null]} if filter_ else not_null
+
     query = {
-        'operation': 'FIND',
-        'collection': collection,
-        'filter': filter_,
-        'projection': projection,
+        'operation': 'COUNT',
+        'collection': statement.table.name,
+        'alias': column.alias or f"count_{column.name.replace('*', 'all').replace('.', '_')}"
     }
-    if order_by:
-        query['sort'] = []
-        for order in order_by:
-            col = order['column']
-            direction = 1 if order.get('order', 'ASC').upper() == 'ASC' else -1
-            query['sort'].append((col, direction))
-    if limit is not None:
-        query['limit'] = limit
+    if filter_:
+        query['filter'] = filter_
+    else:
+        query['estimated'] = True
+    return query
+
 
+# collection.distinct() walks an index on the column (DISTINCT_SCAN) when there is one
+def _get_distinct_query(statement, path):
+    column = statement.columns[0]
+    query = {
+        'operation': 'DISTINCT',
+        'collection': statement.table.name,
+        'key': path(column.name),
+        'alias': column.alias or column.name
+    }
+    filter_ = parse_filter(map_columns(statement.filter, _strip_qualifier(statement.table.reference)))
+    if filter_:
+        query['filter'] = filter_
     return query
 
 
+def _add_distinct(builder, statement, path):
+    # Several DISTINCT columns are deduplicated by grouping on all of them
+    keys = {}
+    for col in statement.columns:
+        keys[col.alias or col.name] = path(col.name).replace('.', '_')
+        keys.setdefault(col.name, keys[col.alias or col.name])
+    builder.group({'_id': {keys[col.alias or col.name]: f"${path(col.name)}" for col in statement.columns}})
+    builder.sort({
+        f"_id.{keys.get(order.column, order.column)}": -1 if order.descending else 1 for order in statement.order_by
+    })
+    builder.skip(statement.offset)
+    builder.limit(statement.limit)
+    project_stage = {'_id': 0}
+    for col in statement.columns:
+        project_stage[col.alias or col.name] = f"$_id.{keys[col.alias or col.name]}"
+    builder.project(project_stage)
+
+
+def _get_exists_query(statement: ExistsStatement):
+    plan = get_mongodb_find_query(statement.query)
+    query = {
+        'operation': 'EXISTS',
+        'collection': plan['collection'],
+        'alias': statement.alias
+    }
+    if plan['operation'] == 'AGGREGATE':
+        query['pipeline'] = plan['pipeline'] + [{'$limit': 1}]
+    else:
+        query['filter'] = plan.get('filter', {})
+    return query
+
+
+def _add_joins(builder, statement):
+    base_alias = statement.table.reference
+    joins = statement.joins
+
+    # Predicate pushdown: conjuncts on the base table filter before the first lookup,
+    # conjuncts on one joined table run inside its lookup and only cross-table ones stay behind
+    base_predicates, residual_predicates = [], []
+    join_predicates = {join.table.reference: [] for join in joins}
+    join_types = {join.table.reference: join.type for join in joins}
+    for predicate in _conjuncts(statement.filter):
+        qualifiers = _qualifiers(predicate)
+        if qualifiers <= {base_alias}:
+            base_predicates.append(predicate)
+        elif len(qualifiers) == 1 and next(iter(qualifiers)) in join_predicates \
+                and (join_types[next(iter(qualifiers))] != 'LEFT' or _rejects_nulls(predicate)):
+            # A null rejecting WHERE on the right side of a LEFT JOIN makes it an inner join
+            join_predicates[next(iter(qualifiers))].append(predicate)
+        else:
+            residual_predicates.append(predicate)
+
+    base_filter = _conjunction(base_predicates)
+    if base_filter is not None:
+        builder.match(parse_filter(map_columns(base_filter, _strip_qualifier(base_alias))))
+
+    for join in joins:
+        join_table = join.table.name
+        join_alias = join.table.reference
+
+        left = join.left or ''
+        right = join.right or ''
+
+        # Initialize local and foreign fields
+        local_field = foreign_field = None
+
+        # Determine which side refers to base table and which to joined table
+        if '.' in left and '.' in right:
+            left_prefix, left_field = left.split('.', 1)
+            right_prefix, right_field = right.split('.', 1)
+
+            if left_prefix == join_alias:
+                foreign_field = left_field
+                if right_prefix == base_alias:
+                    local_field = right_field
+                else:
+                    local_field = right
+            elif right_prefix == join_alias:
+                foreign_field = right_field
+                if left_prefix == base_alias:
+                    local_field = left_field
+                else:
+                    local_field = left
+
+        join_type = join.type
+        pushed_filter = _conjunction(join_predicates[join_alias])
+        if pushed_filter is not None and local_field and foreign_field:
+            match = {'$expr': {'$eq': [f"${foreign_field}", '$$local_key']}}
+            pushed_match = parse_filter(map_columns(pushed_filter, _strip_qualifier(join_alias)))
+            if '$expr' in pushed_match:
+                match = {'$and': [match, pushed_match]}
+            else:
+                match.update(pushed_match)
+            builder.lookup({
+                'from': join_table,
+                'let': {'local_key': f"${local_field}"},
+                'pipeline': [{'$match': match}],
+                'as': join_alias
+            })
+            join_type = 'INNER'
+        else:
+            residual_predicates.extend(join_predicates[join_alias])
+            builder.lookup({
+                'from': join_table,
+                'localField': local_field,
+                'foreignField': foreign_field,
+                'as': join_alias
+            })
+
+        if join_type == 'LEFT':
+            builder.unwind({'path': f"${join_alias}", 'preserveNullAndEmptyArrays': True})
+        else:
+            builder.unwind(f"${join_alias}")
+
+    # Conditions spanning several tables, evaluated on the joined document before projecting
+    residual_filter = _conjunction(residual_predicates)
+    if residual_filter is not None:
+        builder.match(parse_filter(map_columns(residual_filter, _strip_qualifier(base_alias))))
+
+
+def _add_grouping(builder, statement, path):
+    aggregate = statement.group_by
+
+    # Group keys are embedded field names and may not contain dots
+    group_keys = {key: path(key).replace('.', '_') for key in aggregate}
+    group_stage = {'_id': {group_keys[key]: f"${path(key)}" for key in aggregate}}
+    distinct_counts = {}
+
+    func_col_map = {}
+
+    def accumulator(function, column, alias=None):
+        function = function.upper()
+        col_name = column.replace("*", "all").replace(".", "_")
+        key = f"{function.lower()}_{col_name}"
+        if key in func_col_map:
+            return func_col_map[key]
+        alias = alias or key
+        func_col_map[key] = alias
+        field = path(column)
+        if function == 'COUNT_DISTINCT':
+            group_stage[alias] = {'$addToSet': f"${field}"}
+            distinct_counts[alias] = {'$size': f"${alias}"}
+        elif function == 'COUNT' and column == '*':
+            group_stage[alias] = {'$sum': 1}
+        elif function == 'COUNT':
+            # COUNT(column) skips nulls and missing fields
+            group_stage[alias] = {'$sum': {'$cond': [{'$gt': [f"${field}", None]}, 1, 0]}}
+        elif function in _ACCUMULATORS:
+            group_stage[alias] = {_ACCUMULATORS[function]: f"${field}"}
+        else:
+            raise Exception(f"Unsupported aggregation function: {function}")
+        return alias
+
+    # Add aggregation fields
+    for col in statement.columns:
+        if col.aggregation_function:
+            accumulator(col.aggregation_function, col.name, col.alias)
+
+    # Handle having clause, aggregated columns refer to their $group output field
+    having_filter = None
+    if statement.having is not None:
+        def having_column(leaf):
+            having_func = getattr(leaf, 'aggregation_function', None)
+            if not having_func:
+                return f"_id.{group_keys[leaf.column]}" if leaf.column in group_keys else leaf.column
+            return accumulator(having_func, leaf.column)
+
+        having_filter = parse_filter(map_columns(statement.having, having_column))
+
+    sort = {}
+    for order in statement.order_by:
+        if order.aggregation_function:
+            field = accumulator(order.aggregation_function, order.column)
+        elif order.column in group_keys:
+            field = f"_id.{group_keys[order.column]}"
+        else:
+            field = order.column
+        sort[field] = -1 if order.descending else 1
+
+    builder.group(group_stage)
+    builder.set(distinct_counts)
+    builder.match(having_filter)
+
+    # $sort directly followed by $limit lets the server keep only the top k groups
+    builder.sort(sort)
+    builder.skip(statement.offset)
+    builder.limit(statement.limit)
+
+
+def _conjuncts(predicate):
+    if predicate is None:
+        return ()
+    if isinstance(predicate, Logical) and predicate.operator == Operator.AND:
+        return predicate.operands
+    return (predicate,)
+
+
+def _conjunction(predicates):
+    if not predicates:
+        return None
+    return predicates[0] if len(predicates) == 1 else Logical(Operator.AND, tuple(predicates))
+
+
+# Table aliases a predicate refers to, unqualified columns resolve against the base document
+def _qualifiers(predicate):
+    return {column.split('.', 1)[0] for column in predicate_columns(predicate) if '.' in column}
+
+
+def _strip_qualifier(alias):
+    def mapper(leaf):
+        prefix, _, field = leaf.column.partition('.')
+        return field if field and prefix == alias else leaf.column
+    return mapper
+
+
+# False when the predicate can hold for a row whose joined side is missing
+def _rejects_nulls(predicate):
+    if isinstance(predicate, (IsNull, Not, Constant, RawCondition)):
+        return False
+    if isinstance(predicate, Logical):
+        return all(_rejects_nulls(operand) for operand in predicate.operands)
+    return True
+
+
 def parse_filter(filter_clause):
-    op = filter_clause.get('operator')
-    if not op:
-        return {}
-    op = op.upper()
-
-    if op == '=':
-        return {filter_clause['column']: filter_clause['value']}
-    elif op == 'AND':
-        operands = filter_clause.get('operands', [])
-        return {'$and': [parse_filter(cond) for cond in operands]}
-    elif op == 'OR':
-        operands = filter_clause.get('operands', [])
-        return {'$or': [parse_filter(cond) for cond in operands]}
-    elif op == '>':
-        return {filter_clause['column']: {'$gt': filter_clause['value']}}
-    elif op == '<':
-        return {filter_clause['column']: {'$lt': filter_clause['value']}}
-    elif op == '>=':
-        return {filter_clause['column']: {'$gte': filter_clause['value']}}
-    elif op == '<=':
-        return {filter_clause['column']: {'$lte': filter_clause['value']}}
-    elif op == 'LIKE':
-        pattern = filter_clause['value']
-        regex_pattern = '^' + pattern.replace('%', '.*').replace('_', '.') + '$'
-        return {filter_clause['column']: {'$regex': regex_pattern}}
-    elif op == 'IN':
-        return {filter_clause['column']: {'$in': filter_clause.get('values', [])}}
-    elif op == 'BETWEEN':
-        low = filter_clause.get('low')
-        high = filter_clause.get('high')
-        return {filter_clause['column']: {'$gte': low, '$lte': high}}
-    elif op == 'IS_NULL':
-        return {filter_clause['column']: None}
-    elif op == 'NOT':
-        operand = filter_clause.get('operand')
-        inner_filter = parse_filter(operand) if operand else {}
-        if inner_filter:
-            key, val = next(iter(inner_filter.items()))
-            if val is None:
-                return {key: {'$ne': None}}
+    if isinstance(filter_clause, dict):
+        filter_clause = predicate_from_dict(filter_clause)
+    if filter_clause is None:
         return {}
+
+    builder = _FILTER_BUILDERS.get(type(filter_clause))
+    return builder(filter_clause) if builder else {}
+
+
+def _comparison_filter(predicate: Comparison):
+    if isinstance(predicate.value, ColumnRef):
+        # Two fields of one document are compared with an aggregation expression
+        operator = _COMPARISON_OPERATORS[predicate.operator]
+        return {'$expr': {operator: [f"${predicate.column}", f"${predicate.value.column}"]}}
+    if predicate.operator == Operator.EQ:
+        return {predicate.column: predicate.value}
+    elif predicate.operator in (Operator.LIKE, Operator.ILIKE):
+        return {predicate.column: _like_condition(predicate.value, predicate.operator == Operator.ILIKE)}
+    return {predicate.column: {_COMPARISON_OPERATORS[predicate.operator]: predicate.value}}
+
+
+# Exact patterns become equality, prefixes a left-anchored regex that MongoDB turns into index bounds.
+# With the 'i' option (ILIKE) the regex cannot use index bounds and every index key is scanned.
+def _like_condition(pattern, case_insensitive=False):
+    if isinstance(pattern, Parameter):
+        condition = {'$regex': pattern.with_transform(like_to_regex)}
     else:
-        return {}
+        like = analyze_like(pattern)
+        if like.kind == LikeKind.EXACT and not case_insensitive:
+            return like.text
+        condition = {'$regex': like.search_regex()}
+    if case_insensitive:
+        condition['$options'] = 'i'
+    return condition
+
+
+def _range_filter(predicate: Range):
+    bounds = {}
+    if predicate.low is not None:
+        bounds['$gte' if predicate.low_inclusive else '$gt'] = predicate.low
+    if predicate.high is not None:
+        bounds['$lte' if predicate.high_inclusive else '$lt'] = predicate.high
+    return {predicate.column: bounds}
+
+
+def _constant_filter(predicate: Constant):
+    # An empty filter matches everything, no document lacks an _id
+    return {} if predicate.value else {'_id': {'$exists': False}}
+
+
+def _logical_filter(predicate: Logical):
+    return {'$' + predicate.operator.value.lower(): [parse_filter(operand) for operand in predicate.operands]}
+
+
+def _not_filter(predicate: Not):
+    inner_filter = parse_filter(predicate.operand)
+    if inner_filter:
+        key, val = next(iter(inner_filter.items()))
+        if val is None:
+            return {key: {'$ne': None}}
+        if len(inner_filter) == 1 and not key.startswith('$'):
+            if isinstance(val, dict):
+                return {key: {'$not': val}}
+            return {key: {'$ne': val}}
+        return {'$nor': [inner_filter]}
+    return {}
+
+
+_FILTER_BUILDERS = {
+    Comparison: _comparison_filter,
+    Logical: _logical_filter,
+    Not: _not_filter,
+    InList: lambda predicate: {predicate.column: {'$in': list(predicate.values)}},
+    Between: lambda predicate: {predicate.column: {'$gte': predicate.low, '$lte': predicate.high}},
+    Range: _range_filter,
+    Constant: _constant_filter,
+    IsNull: lambda predicate: {predicate.column: None},
+    RawCondition: lambda predicate: {}
+}
+
+_STATEMENT_BUILDERS = {
+    Command: _get_command_query,
+    InsertStatement: _get_insert_query,
+    UpdateStatement: _get_update_query,
+    DeleteStatement: _get_delete_query,
+    SelectStatement: get_mongodb_find_query,
+    ExistsStatement: _get_exists_query
+}
 
-def convert_operator_to_mongo(op):
-    mapping = {
-        '=': '$eq',
-        '>': '$gt',
-        '>=': '$gte',
-        '<': '$lt',
-        '<=': '$lte',
-        '!=': '$ne'
-    }
-    return mapping.get(op, '$eq')
\ No newline at end of file
@@ -1,24 +1,77 @@
 from uniquery.src.utils import DatabaseType
 from uniquery.src.query_engine.translators.sql_parser import SqlParser
 from uniquery.src.query_engine.translators.query_generator import get_mongodb_query, get_cypher_query
+from uniquery.src.query_engine.translators.plan_cache import PlanCache
+from uniquery.src.query_engine.translators.optimizer import PredicateOptimizer, default_rules
+from uniquery.src.query_engine.translators.ir import SelectStatement, FALSE
+from uniquery.src.query_engine.translators.coercion import coerce_plan, field_types
+from uniquery.src.query_engine.translators.index_planner import plan_indexes
+
+# Plan returned for queries whose filter can never match, the engine answers it without a round trip
+EMPTY_RESULT = 'EMPTY_RESULT'
 
 class QueryTranslator:
-    def __init__(self, database_type: DatabaseType):
+    def __init__(self, database_type: DatabaseType, plan_cache: PlanCache = None,
+                 optimizer: PredicateOptimizer = None):
         self.sql_parser = SqlParser()
         self.database_type = database_type
+        self.plan_cache = plan_cache
+        if optimizer is None:
+            # MongoDB fields may be arrays, comparisons on them are not scalar
+            optimizer = PredicateOptimizer(default_rules(scalar_fields=database_type != DatabaseType.MONGO_DB))
+        self.optimizer = optimizer
 
     def translate(self, sql_query: str):
         try:
-            parsed_data = self.sql_parser.parse(sql_query)
+            cache_key = None
+            if self.plan_cache is not None:
+                cache_key = self.plan_cache.make_key(sql_query, self.database_type)
+                plan = self.plan_cache.get(cache_key)
+                if plan is not None:
+                    return plan
 
-            if self.database_type.is_sql():
-                return sql_query
-            elif self.database_type.is_mql():
-                return get_mongodb_query(parsed_data)
-            elif self.database_type.is_cypher():
-                return get_cypher_query(parsed_data)
+            plan = self._translate(sql_query)
 
-            raise Exception(f"Translation is not supported for database type: {self.database_type.value}")
+            if cache_key is not None:
+                self.plan_cache.put(cache_key, plan)
+            return plan
 
         except Exception as err:
             raise Exception(f"Error Translating SQL query: {err}")
+
+    def _translate(self, sql_query: str):
+        statement = self.sql_parser.parse_ir(sql_query)
+
+        if self.database_type.is_sql():
+            return sql_query
+
+        return self.translate_statement(statement)
+
+    # Plans are cached without catalog details, the engine adds those of its connection on execution
+    @staticmethod
+    def with_catalog(plan, schema: dict = None, indexes: list = None):
+        if not isinstance(plan, dict) or not plan.get('collection'):
+            return plan
+        if schema:
+            # Literals compared with typed fields are converted so the field's index applies
+            plan = coerce_plan(plan, field_types(schema))
+            # SELECT * has no projection, its rows are ordered by the fields of the sampled schema
+            if plan.get('operation') in ('FIND', 'FIND_ONE') and not plan.get('projection'):
+                plan = {**plan, 'columns': list(schema['fields'])}
+        if indexes:
+            plan = plan_indexes(plan, indexes, schema)
+        return plan
+
+    # Bypasses the plan cache
+    def translate_statement(self, statement):
+        statement = self.optimizer.optimize_statement(statement)
+        # LIMIT 0 as well, MongoDB rejects $limit 0 and find() reads it as no limit
+        if isinstance(statement, SelectStatement) and (statement.filter == FALSE or statement.limit == 0):
+            return {'operation': EMPTY_RESULT}
+
+        if self.database_type.is_mql():
+            return get_mongodb_query(statement)
+        elif self.database_type.is_cypher():
+            return get_cypher_query(statement)
+
+        raise Exception(f"Translation is not supported for database type: {self.database_type.value}")
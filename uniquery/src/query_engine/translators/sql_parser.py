@@ -1,21 +1,54 @@
 import io
 import contextlib
+import operator
+from dataclasses import replace
 from sqlglot import expressions as exp, parse_one, TokenType
 
+from uniquery.src.query_engine.translators.parameters import Parameter, number_positional_placeholders
+from uniquery.src.query_engine.translators.like_pattern import escape_like, normalize_escape
+from uniquery.src.query_engine.translators.coercion import typed_literal
+from uniquery.src.query_engine.translators.hints import split_hints, parse_hints
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, InList, Between, IsNull, Not, Logical,
+                                                      RawCondition, TRUE, FALSE, TableRef, Projection, Join, OrderItem,
+                                                      SelectStatement, ExistsStatement, InsertStatement,
+                                                      UpdateStatement, DeleteStatement, Command, Statement, ColumnRef)
+
 _OPERATOR_MAP = {
-    exp.EQ: '=',
-    exp.NEQ: '!=',
-    exp.GT: '>',
-    exp.GTE: '>=',
-    exp.LT: '<',
-    exp.LTE: '<=',
-    exp.Like: 'LIKE'
+    exp.EQ: Operator.EQ,
+    exp.NEQ: Operator.NEQ,
+    exp.GT: Operator.GT,
+    exp.GTE: Operator.GTE,
+    exp.LT: Operator.LT,
+    exp.LTE: Operator.LTE,
+    exp.Like: Operator.LIKE,
+    exp.ILike: Operator.ILIKE
+}
+
+_CONSTANT_COMPARISONS = {
+    exp.EQ: operator.eq,
+    exp.NEQ: operator.ne,
+    exp.GT: operator.gt,
+    exp.GTE: operator.ge,
+    exp.LT: operator.lt,
+    exp.LTE: operator.le
 }
 
 _AGGREGATION_FUNCTION_MAP = {
-    exp.Sum: 'SUM'
+    exp.Count: 'COUNT',
+    exp.Sum: 'SUM',
+    exp.Avg: 'AVG',
+    exp.Min: 'MIN',
+    exp.Max: 'MAX'
 }
 
+# COUNT(DISTINCT col) becomes COUNT_DISTINCT
+def _aggregate_call(node):
+    function = _AGGREGATION_FUNCTION_MAP[type(node)]
+    argument = node.this
+    if isinstance(argument, exp.Distinct):
+        return f"{function}_DISTINCT", argument.expressions[0].sql()
+    return function, argument.sql() if argument else '*'
+
 def extract_details_from_reference(node):
     fk_columns = [c.this for c in node.args["expressions"]]
     ref_table = node.args["reference"].this.this.this.this
@@ -39,21 +72,16 @@ def extract_relationship_joins(expression):
         on_expr = join.args.get("on")
 
         if isinstance(on_expr, exp.Condition) or isinstance(on_expr, exp.EQ):
-            joins.append({
-                "type": join_type,
-                "table": {
-                    "name": table_expr.name,
-                    "alias": table_expr.alias,
-                },
-                "on": {
-                    "left": on_expr.left.sql(),
-                    "operator": _OPERATOR_MAP.get(type(on_expr), "="),
-                    "right": on_expr.right.sql(),
-                }
-            })
+            joins.append(Join(
+                type=join_type,
+                table=TableRef(table_expr.name, table_expr.alias),
+                left=on_expr.left.sql(),
+                right=on_expr.right.sql(),
+                operator=_OPERATOR_MAP.get(type(on_expr), Operator.EQ)
+            ))
         else:
             raise ValueError(f"Unsupported ON clause format in JOIN: {on_expr}")
-    return joins
+    return tuple(joins)
 
 def extract_group_by_fields(expression):
     group_expr = expression.args.get("group")
@@ -62,7 +90,7 @@ def extract_group_by_fields(expression):
         for e in group_expr.expressions:
             group_fields.append(e.sql())
     having = extract_having_conditions(expression)
-    return group_fields, having
+    return tuple(group_fields), having
 
 def extract_having_conditions(expression):
     having_expr = expression.args.get("having")
@@ -76,57 +104,116 @@ def extract_where_conditions(expression):
 
 def _parse_condition(expr):
     if isinstance(expr, (exp.And, exp.Or)):
-        return {
-            "operator": expr.key.upper(),
-            "operands": [_parse_condition(arg) for arg in expr.flatten()]
-        }
+        return Logical(
+            Operator.AND if isinstance(expr, exp.And) else Operator.OR,
+            tuple(_parse_condition(arg) for arg in expr.flatten())
+        )
     elif isinstance(expr, exp.Not):
-        return {
-            "operator": "NOT",
-            "operand": _parse_condition(expr.this)
-        }
+        return Not(_parse_condition(expr.this))
     elif isinstance(expr, exp.Paren):
         return _parse_condition(expr.this)
+    elif isinstance(expr, exp.Boolean):
+        return TRUE if expr.this else FALSE
+    elif type(expr) in _CONSTANT_COMPARISONS and isinstance(expr.left, exp.Literal) and isinstance(expr.right, exp.Literal):
+        # Literal-only comparisons such as `1 = 1` are evaluated up front
+        try:
+            return TRUE if _CONSTANT_COMPARISONS[type(expr)](expr.left.to_py(), expr.right.to_py()) else FALSE
+        except TypeError:
+            return RawCondition(expr.sql())
+    elif isinstance(expr, exp.Escape):
+        # Patterns are handed on with backslash as the escape character
+        condition = _parse_condition(expr.this)
+        escape = _literal(expr.expression)
+        if isinstance(condition, Comparison) and isinstance(condition.value, str) and escape != '\\':
+            condition = replace(condition, value=normalize_escape(condition.value, escape))
+        return condition
     elif isinstance(expr, exp.Is):
-        column = expr.this.sql()
-        return {
-            "operator": "IS_NULL",
-            "column": column
-        }
+        return IsNull(expr.this.sql())
     elif isinstance(expr, exp.In):
-        column = expr.this.sql()
-        values = [_literal(val) for val in expr.expressions]
-        return {
-            "operator": "IN",
-            "column": column,
-            "values": values
-        }
+        values = tuple(_literal(val) for val in expr.expressions)
+        if any(isinstance(value, ColumnRef) for value in values):
+            raise Exception(f"IN lists of columns are not supported: {expr.sql()}")
+        return InList(expr.this.sql(), values)
     elif isinstance(expr, exp.Between):
-        return {
-            'operator': 'BETWEEN',
-            'column': expr.this.sql(),
-            'low': _literal(expr.args['low']),
-            'high': _literal(expr.args['high'])
-        }
+        low, high = _literal(expr.args['low']), _literal(expr.args['high'])
+        if isinstance(low, ColumnRef) or isinstance(high, ColumnRef):
+            # Bounds taken from other columns are two comparisons, ranges hold values only
+            column = expr.this.sql()
+            return Logical(Operator.AND, (Comparison(column, Operator.GTE, low),
+                                          Comparison(column, Operator.LTE, high)))
+        return Between(expr.this.sql(), low, high)
     elif type(expr) in _OPERATOR_MAP:
-        if type(expr.this) in _AGGREGATION_FUNCTION_MAP:
-            return {
-                "aggregation_function": expr.left.sql_name().upper(),
-                "column": expr.left.this.sql(),
-                "operator": _OPERATOR_MAP[type(expr)],
-                "value": _literal(expr.right)
-            }
-        return {
-            "column": expr.left.sql(),
-            "operator": _OPERATOR_MAP[type(expr)],
-            "value": _literal(expr.right)
-        }
+        if isinstance(expr.left, (exp.Lower, exp.Upper)) and isinstance(expr.left.this, exp.Column) \
+                and isinstance(expr, (exp.Like, exp.ILike, exp.EQ)) and isinstance(_literal(expr.right), str):
+            return _case_insensitive_condition(expr)
+        if type(expr.left) in _AGGREGATION_FUNCTION_MAP:
+            aggregation_function, column = _aggregate_call(expr.left)
+            return Comparison(
+                column=column,
+                operator=_OPERATOR_MAP[type(expr)],
+                value=_literal(expr.right),
+                aggregation_function=aggregation_function
+            )
+        value = _literal(expr.right)
+        if isinstance(value, ColumnRef) and isinstance(expr, (exp.Like, exp.ILike)):
+            raise Exception(f"LIKE patterns taken from columns are not supported: {expr.sql()}")
+        return Comparison(expr.left.sql(), _OPERATOR_MAP[type(expr)], value)
     else:
-        return expr.sql()
+        return RawCondition(expr.sql())
+
+# LOWER(col) LIKE 'abc%' becomes an ILIKE on the bare column, which no index serves
+def _case_insensitive_condition(expr):
+    value = _literal(expr.right)
+    fold = str.lower if isinstance(expr.left, exp.Lower) else str.upper
+    if not isinstance(expr, exp.ILike) and fold(value) != value:
+        # The folded column can never equal a pattern in the other case
+        return FALSE
+    if isinstance(expr, exp.EQ):
+        value = escape_like(value)
+    return Comparison(expr.left.this.sql(), Operator.ILIKE, value)
+
+
+# Functions that build a typed literal, the type names match those of CAST
+_LITERAL_FUNCTIONS = {
+    exp.Date: 'DATE',
+    exp.TimeStrToTime: 'TIMESTAMP'
+}
+
+_LITERAL_CONSTRUCTORS = ('OBJECTID', 'POINT')
+
+
+def _is_typed_literal(node):
+    if isinstance(node, (exp.Cast, exp.TryCast)):
+        return True
+    if type(node) in _LITERAL_FUNCTIONS:
+        return isinstance(node.this, exp.Literal)
+    return isinstance(node, exp.Anonymous) and str(node.this).upper() in _LITERAL_CONSTRUCTORS
+
+
+# Typed literals and CASTs as values of their type, see coercion.typed_literal
+def _typed_literal(node):
+    if isinstance(node, (exp.Cast, exp.TryCast)):
+        data_type = node.to
+        type_name = data_type.args.get('kind') if data_type.this == exp.DataType.Type.USERDEFINED \
+            else data_type.this.name
+        return typed_literal(str(type_name), _literal(node.this))
+    if type(node) in _LITERAL_FUNCTIONS:
+        return typed_literal(_LITERAL_FUNCTIONS[type(node)], _literal(node.this))
+    arguments = [_literal(argument) for argument in node.expressions]
+    if str(node.this).upper() == 'POINT':
+        return typed_literal('POINT', arguments)
+    return typed_literal(str(node.this), arguments[0] if len(arguments) == 1 else arguments)
+
 
 def _literal(node):
     if isinstance(node, exp.Literal):
         return node.to_py()
+    elif _is_typed_literal(node):
+        return _typed_literal(node)
+    elif isinstance(node, exp.Placeholder):
+        return Parameter.from_placeholder(node.this)
+    elif isinstance(node, exp.Column):
+        return ColumnRef(node.sql())
     elif isinstance(node, exp.Identifier):
         return node.name  # For identifiers like column names
     elif hasattr(node, "this"):
@@ -140,52 +227,47 @@ def extract_return_fields(expression):
     if select_exprs:
         for expr in select_exprs:
             if isinstance(expr, exp.Column):
-                fields.append({
-                    'name': expr.sql(),
-                    'alias': None
-                })
+                fields.append(Projection(expr.sql()))
             if isinstance(expr, exp.Func) or isinstance(expr.this, exp.Func):
                 _alias = None
                 if not isinstance(expr, exp.Func):
                     _alias = expr.alias if expr.alias else None
                     expr = expr.this
-                fields.append({
-                    "aggregation_function": expr.sql().split('(')[0] if expr.sql() else None,
-                    "name": expr.this.sql() if expr.this else None,
-                    "alias": _alias if _alias else expr.alias if expr.alias else None
-                })
+                if type(expr) in _AGGREGATION_FUNCTION_MAP:
+                    aggregation_function, column = _aggregate_call(expr)
+                    fields.append(Projection(column, _alias, aggregation_function))
+                    continue
+                fields.append(Projection(
+                    name=expr.this.sql() if expr.this else None,
+                    alias=_alias if _alias else expr.alias if expr.alias else None,
+                    aggregation_function=expr.sql().split('(')[0] if expr.sql() else None
+                ))
             elif isinstance(expr, exp.Alias):
-                fields.append({
-                    'name': expr.this.sql(),
-                    'alias': expr.alias_or_name
-                })
+                fields.append(Projection(expr.this.sql(), expr.alias_or_name))
             elif isinstance(expr, exp.Star):
-                fields.append({
-                    'name': '*',
-                    'alias': None
-                })
+                fields.append(Projection('*'))
 
-    return fields, is_distinct
+    return tuple(fields), is_distinct
 
 
 def extract_order_by(expression):
     order_expr = expression.args.get("order")
     if not order_expr:
-        return None
+        return ()
 
     order_items = []
     for e in order_expr.expressions:
-        if isinstance(e, exp.Ordered):
-            order_items.append({
-                "column": e.this.name if hasattr(e.this, "name") else e.this.sql(),
-                "order": "DESC" if e.args.get("desc") else "ASC"
-            })
+        if isinstance(e, exp.Ordered) and type(e.this) in _AGGREGATION_FUNCTION_MAP:
+            aggregation_function, column = _aggregate_call(e.this)
+            order_items.append(OrderItem(column, bool(e.args.get("desc")), aggregation_function))
+        elif isinstance(e, exp.Ordered):
+            order_items.append(OrderItem(
+                e.this.name if hasattr(e.this, "name") else e.this.sql(),
+                bool(e.args.get("desc"))
+            ))
         else:
-            order_items.append({
-                "column": e.sql(),
-                "order": "ASC"
-            })
-    return order_items
+            order_items.append(OrderItem(e.sql()))
+    return tuple(order_items)
 
 
 def extract_limit(expression):
@@ -199,277 +281,284 @@ def extract_limit(expression):
     return None
 
 
+def extract_offset(expression):
+    offset_expr = expression.args.get("offset")
+    if offset_expr and offset_expr.args.get("expression"):
+        return _literal(offset_expr.args["expression"])
+    return None
+
+
+# Statements that carry optimizer hints
+_HINTED_STATEMENTS = (SelectStatement, UpdateStatement, DeleteStatement)
+
+
 def parse_sql_silently(sql):
     with contextlib.redirect_stderr(io.StringIO()):
-        return parse_one(sql)
+        return parse_one(number_positional_placeholders(sql))
 
 
 class SqlParser:
 
-    def parse(self, sql_query):
+    def parse(self, sql_query) -> dict:
+        return self.parse_ir(sql_query).to_dict()
+
+    def parse_ir(self, sql_query) -> Statement:
         try:
-            expression = parse_sql_silently(sql_query)
-
-            if isinstance(expression, exp.Create):
-                if expression.kind == 'DATABASE':
-                    database_name = expression.this.this.this
-                    return { 'operation': 'CREATE_DATABASE', 'database_name': database_name }
-                elif expression.kind == 'INDEX':
-                    index_name = expression.this.this.this
-                    table_name = expression.this.args["table"].this.this
-                    column_names = [col.this.this.name for col in expression.this.args["params"].args["columns"]]
-
-                    return {
-                        'operation': 'CREATE_INDEX',
-                        'index_name': index_name,
-                        'table': table_name,
-                        'columns': column_names
-                    }
-                elif expression.kind == 'TABLE':
-                    table_name = expression.this.this.this.this
-                    columns = []
-                    constraints = []
-
-                    for col_def in expression.this.expressions:
-                        if isinstance(col_def, exp.ColumnDef):
-                            col_name = col_def.this.this
-                            col_type = col_def.kind.sql() if col_def.kind else None
-                            col_constraints = []
-                            if col_def.constraints:
-                                for constraint in col_def.constraints:
-                                    col_constraints.append(constraint.sql())
-                            columns.append({'name': col_name, 'type': col_type, 'constraints': col_constraints})
-
-                        elif isinstance(col_def, exp.ForeignKey):
-                            fk_columns = [c.this for c in col_def.args["expressions"]]
-                            reference = col_def.args["reference"]
-                            ref_table = reference.this.this.this.this
-                            ref_columns = [c.this for c in reference.this.expressions]
-                            constraints.append({
-                                'type': 'FOREIGN KEY',
-                                'columns': fk_columns,
-                                'references': {'table_name': ref_table, 'columns': ref_columns}
-                            })
+            sql_query, hint_text = split_hints(sql_query)
+            statement = self._parse_expression(parse_sql_silently(sql_query), sql_query)
+            hints = parse_hints(hint_text) if hint_text else None
+            if hints is not None and isinstance(statement, _HINTED_STATEMENTS):
+                statement = replace(statement, hints=hints)
+            return statement if isinstance(statement, Statement) else Command(statement)
+        except Exception as e:
+            raise Exception(f"Error parsing SQL query: {e}")
+
+    def _parse_expression(self, expression, sql_query):
+        if isinstance(expression, exp.Create):
+            if expression.kind == 'DATABASE':
+                database_name = expression.this.this.this
+                return { 'operation': 'CREATE_DATABASE', 'database_name': database_name }
+            elif expression.kind == 'INDEX':
+                index_name = expression.this.this.this
+                table_name = expression.this.args["table"].this.this
+                column_names = [col.this.this.name for col in expression.this.args["params"].args["columns"]]
+
+                return {
+                    'operation': 'CREATE_INDEX',
+                    'index_name': index_name,
+                    'table': table_name,
+                    'columns': column_names
+                }
+            elif expression.kind == 'TABLE':
+                table_name = expression.this.this.this.this
+                columns = []
+                constraints = []
+
+                for col_def in expression.this.expressions:
+                    if isinstance(col_def, exp.ColumnDef):
+                        col_name = col_def.this.this
+                        col_type = col_def.kind.sql() if col_def.kind else None
+                        col_constraints = []
+                        if col_def.constraints:
+                            for constraint in col_def.constraints:
+                                col_constraints.append(constraint.sql())
+                        columns.append({'name': col_name, 'type': col_type, 'constraints': col_constraints})
+
+                    elif isinstance(col_def, exp.ForeignKey):
+                        fk_columns = [c.this for c in col_def.args["expressions"]]
+                        reference = col_def.args["reference"]
+                        ref_table = reference.this.this.this.this
+                        ref_columns = [c.this for c in reference.this.expressions]
+                        constraints.append({
+                            'type': 'FOREIGN KEY',
+                            'columns': fk_columns,
+                            'references': {'table_name': ref_table, 'columns': ref_columns}
+                        })
+
+                return {
+                    "operation": "CREATE_TABLE",
+                    "table_name": table_name,
+                    "columns": columns,
+                    "constraints": constraints
+                }
 
-                    return {
-                        "operation": "CREATE_TABLE",
-                        "table_name": table_name,
-                        "columns": columns,
-                        "constraints": constraints
-                    }
-
-            if isinstance(expression, exp.Alter):
-                if expression.kind == 'TABLE':
-                    table_name = expression.this.this.this
-                    actions = []
-
-                    for action in expression.actions:
-                        if isinstance(action, exp.ColumnDef):  # ADD COLUMN
-                            col_name = action.this.this
-                            col_type = action.kind.this.name
-                            default_value = None
-                            if hasattr(action, "constraints"):
-                                for constraint in action.constraints:
-                                    if hasattr(constraint, "kind") and constraint.kind.__class__.__name__ == "DefaultColumnConstraint":
-                                        default_value = constraint.kind.this.this
+        if isinstance(expression, exp.Alter):
+            if expression.kind == 'TABLE':
+                table_name = expression.this.this.this
+                actions = []
+
+                for action in expression.actions:
+                    if isinstance(action, exp.ColumnDef):  # ADD COLUMN
+                        col_name = action.this.this
+                        col_type = action.kind.this.name
+                        default_value = None
+                        if hasattr(action, "constraints"):
+                            for constraint in action.constraints:
+                                if hasattr(constraint, "kind") and constraint.kind.__class__.__name__ == "DefaultColumnConstraint":
+                                    default_value = constraint.kind.this.this
+                        actions.append({
+                            "column": col_name,
+                            "type": col_type,
+                            "default_value": default_value,
+                            "action_type": "ADD_COLUMN"
+                        })
+
+                    elif isinstance(action, exp.Drop):
+                        if action.kind == 'COLUMN':
+                            col_name = action.this.name
                             actions.append({
+                                "action_type": "DROP_COLUMN",
                                 "column": col_name,
-                                "type": col_type,
-                                "default_value": default_value,
-                                "action_type": "ADD_COLUMN"
+                            })
+                        elif action.kind == 'CONSTRAINT':
+                            col_name = action.this.name
+                            actions.append({
+                                "action_type": "DROP_CONSTRAINT",
+                                "constraint_name": col_name,
                             })
 
-                        elif isinstance(action, exp.Drop):
-                            if action.kind == 'COLUMN':
-                                col_name = action.this.name
-                                actions.append({
-                                    "action_type": "DROP_COLUMN",
-                                    "column": col_name,
-                                })
-                            elif action.kind == 'CONSTRAINT':
-                                col_name = action.this.name
-                                actions.append({
-                                    "action_type": "DROP_CONSTRAINT",
-                                    "constraint_name": col_name,
-                                })
-
-                        elif isinstance(action, exp.RenameColumn):
-                            old_name = action.args["this"].this.name
-                            new_name = action.args['to'].this.name
+                    elif isinstance(action, exp.RenameColumn):
+                        old_name = action.args["this"].this.name
+                        new_name = action.args['to'].this.name
+                        actions.append({
+                            "old_name": old_name,
+                            "new_name": new_name,
+                            "action_type": "RENAME_COLUMN"
+                        })
+
+                    elif isinstance(action, exp.AlterColumn):
+                        if action.args.get('default'):
+                            column = action.this.this
+                            actions.append({
+                                'action_type': 'SET_DEFAULT',
+                                'column': column,
+                                'value': action.args.get('default').this
+                            })
+                        elif action.args.get('drop'):
+                            column = action.this.this
                             actions.append({
-                                "old_name": old_name,
-                                "new_name": new_name,
-                                "action_type": "RENAME_COLUMN"
+                                'action_type': 'DROP_DEFAULT',
+                                'column': column
                             })
 
-                        elif isinstance(action, exp.AlterColumn):
-                            if action.args.get('default'):
-                                column = action.this.this
+                    elif isinstance(action, exp.AddConstraint):
+                        for constraint_expr in action.expressions:
+                            if isinstance(constraint_expr, exp.PrimaryKey):
+                                columns = [col.this.name for col in constraint_expr.expressions]
                                 actions.append({
-                                    'action_type': 'SET_DEFAULT',
-                                    'column': column,
-                                    'value': action.args.get('default').this
+                                    'action_type': 'ADD_CONSTRAINT',
+                                    'constraint_type': 'PRIMARY_KEY',
+                                    'columns': columns
                                 })
-                            elif action.args.get('drop'):
-                                column = action.this.this
+                            elif isinstance(constraint_expr, exp.ForeignKey):
+                                columns = [col.this for col in constraint_expr.args['expressions']]
+                                ref_table = constraint_expr.args["reference"].this.this.this.this
+                                ref_columns = [col.this for col in constraint_expr.args["reference"].this.expressions]
                                 actions.append({
-                                    'action_type': 'DROP_DEFAULT',
-                                    'column': column
+                                    'action_type': 'ADD_CONSTRAINT',
+                                    'constraint_type': 'FOREIGN_KEY',
+                                    'columns': columns,
+                                    'references': {
+                                        'table': ref_table,
+                                        'columns': ref_columns
+                                    }
                                 })
 
-                        elif isinstance(action, exp.AddConstraint):
-                            for constraint_expr in action.expressions:
-                                if isinstance(constraint_expr, exp.PrimaryKey):
-                                    columns = [col.this.name for col in constraint_expr.expressions]
-                                    actions.append({
-                                        'action_type': 'ADD_CONSTRAINT',
-                                        'constraint_type': 'PRIMARY_KEY',
-                                        'columns': columns
-                                    })
-                                elif isinstance(constraint_expr, exp.ForeignKey):
-                                    columns = [col.this for col in constraint_expr.args['expressions']]
-                                    ref_table = constraint_expr.args["reference"].this.this.this.this
-                                    ref_columns = [col.this for col in constraint_expr.args["reference"].this.expressions]
-                                    actions.append({
-                                        'action_type': 'ADD_CONSTRAINT',
-                                        'constraint_type': 'FOREIGN_KEY',
-                                        'columns': columns,
-                                        'references': {
-                                            'table': ref_table,
-                                            'columns': ref_columns
-                                        }
-                                    })
-
-                        elif isinstance(action, exp.AlterRename):
-                            old_name = expression.this.this.this
-                            new_name = action.this.this.this
-                            return {
-                                'operation': 'RENAME_TABLE',
-                                'old_name': old_name,
-                                'new_name': new_name
-                            }
-
-                    result = {
-                        "operation": "ALTER_TABLE",
-                        "table_name": table_name,
-                        "actions": actions
-                    }
-                    return result
-
-            if isinstance(expression, exp.Drop):
-                if expression.kind == 'DATABASE':
-                    database_name = expression.this.this.this
-                    return {
-                        'operation': 'DROP_DATABASE',
-                        'database_name': database_name
-                    }
-                if expression.kind == 'TABLE':
-                    table_name = expression.this.this.this
-                    return {
-                        'operation': 'DROP_TABLE',
-                        'table_name': table_name
-                    }
-                if expression.kind == 'INDEX':
-                    index_name = expression.this.this.this
-                    table_name = expression.args["cluster"].this.this
-                    return {
-                        'operation': 'DROP_INDEX',
-                        'index_name': index_name,
-                        'table': table_name
-                    }
-
-            if isinstance(expression, exp.Use):
-                database_name = expression.this.this.this
-                return {
-                    'operation': 'USE_DATABASE',
-                    'database_name': database_name
+                    elif isinstance(action, exp.AlterRename):
+                        old_name = expression.this.this.this
+                        new_name = action.this.this.this
+                        return {
+                            'operation': 'RENAME_TABLE',
+                            'old_name': old_name,
+                            'new_name': new_name
+                        }
+
+                result = {
+                    "operation": "ALTER_TABLE",
+                    "table_name": table_name,
+                    "actions": actions
                 }
+                return result
 
-            if isinstance(expression, exp.Command):
-                cmd_part = [part for part in expression.expression.this.split(" ") if part.strip()]
-                command = expression.this.upper()
-                if command == 'SHOW':
-                    if len(cmd_part) == 1 and cmd_part[0].upper() == 'DATABASES':
-                        return {'operation': 'SHOW_DATABASES'}
-                    if len(cmd_part) == 1 and cmd_part[0].upper() == 'TABLES':
-                        return {'operation': 'SHOW_TABLES'}
-                    if len(cmd_part) == 2 and cmd_part[0].upper() == 'TABLE':
-                        return {'operation': 'SHOW_TABLE', 'table_name': cmd_part[1]}
-                    else:
-                        raise Exception(f"Unsupported SHOW command")
-
-            if isinstance(expression, exp.Insert):
-                table_name = expression.this.this.this.this
-                columns = [col.sql() for col in expression.this.expressions]
-                values = []
-                for row in expression.expression.expressions:
-                    values.append([val.to_py() for val in row.expressions])
+        if isinstance(expression, exp.Drop):
+            if expression.kind == 'DATABASE':
+                database_name = expression.this.this.this
                 return {
-                    'operation': 'INSERT_DATA',
-                    'table_name': table_name,
-                    'columns': columns,
-                    'values': values
+                    'operation': 'DROP_DATABASE',
+                    'database_name': database_name
                 }
-
-            if isinstance(expression, exp.Update):
+            if expression.kind == 'TABLE':
                 table_name = expression.this.this.this
-                columns = []
-                values = []
-                filter = extract_where_conditions(expression)
-                for assignment in expression.expressions:
-                    col_name = assignment.this.this.this
-                    value = assignment.expression.to_py() if hasattr(assignment.expression, 'to_py') else assignment.expression.sql()
-                    columns.append(col_name)
-                    values.append(value)
-
                 return {
-                    'operation': 'UPDATE_DATA',
-                    'table_name': table_name,
-                    'columns': columns,
-                    'values': values,
-                    'filter': filter
+                    'operation': 'DROP_TABLE',
+                    'table_name': table_name
                 }
-
-            if isinstance(expression, exp.Delete):
-                table_name = expression.this.this.this
-                filter = extract_where_conditions(expression)
-
+            if expression.kind == 'INDEX':
+                index_name = expression.this.this.this
+                table_name = expression.args["cluster"].this.this
                 return {
-                    'operation': 'DELETE_DATA',
-                    'table_name': table_name,
-                    'filter': filter,
-                }
-
-            if isinstance(expression, (exp.Select, exp.Join)):
-                table = extract_table(expression)
-                return_fields, is_distinct = extract_return_fields(expression)
-                where_clause = extract_where_conditions(expression)
-                order_by_clause = extract_order_by(expression)
-                limit_clause = extract_limit(expression)
-                aggregate, having = extract_group_by_fields(expression)
-                joins = extract_relationship_joins(expression)
-
-                select_obj = {
-                    'operation': 'SELECT',
-                    'table': {'name': table['label'], 'alias': table['alias']},
-                    'columns': return_fields
+                    'operation': 'DROP_INDEX',
+                    'index_name': index_name,
+                    'table': table_name
                 }
 
-                if where_clause:
-                    select_obj['filter'] = where_clause
-                if order_by_clause:
-                    select_obj['order_by'] = order_by_clause
-                if limit_clause:
-                    select_obj['limit'] = limit_clause
-                if aggregate:
-                    select_obj['aggregate'] = aggregate
-                if having:
-                    select_obj['having'] = having
-                if joins:
-                    select_obj['joins'] = joins
-                return select_obj
-
-            raise Exception(f"Unsupported SQL query: {sql_query}")
+        if isinstance(expression, exp.Use):
+            database_name = expression.this.this.this
+            return {
+                'operation': 'USE_DATABASE',
+                'database_name': database_name
+            }
 
-        except Exception as e:
-            raise Exception(f"Error parsing SQL query: {e}")
\ No newline at end of file
+        if isinstance(expression, exp.Command):
+            cmd_part = [part for part in expression.expression.this.split(" ") if part.strip()]
+            command = expression.this.upper()
+            if command == 'SHOW':
+                if len(cmd_part) == 1 and cmd_part[0].upper() == 'DATABASES':
+                    return {'operation': 'SHOW_DATABASES'}
+                if len(cmd_part) == 1 and cmd_part[0].upper() == 'TABLES':
+                    return {'operation': 'SHOW_TABLES'}
+                if len(cmd_part) == 2 and cmd_part[0].upper() == 'TABLE':
+                    return {'operation': 'SHOW_TABLE', 'table_name': cmd_part[1]}
+                else:
+                    raise Exception(f"Unsupported SHOW command")
+
+        if isinstance(expression, exp.Insert):
+            table_name = expression.this.this.this.this
+            columns = [col.sql() for col in expression.this.expressions]
+            values = []
+            for row in expression.expression.expressions:
+                values.append(tuple(_literal(val) if isinstance(val, exp.Placeholder) or _is_typed_literal(val)
+                                    else val.to_py() for val in row.expressions))
+            return InsertStatement(table_name, tuple(columns), tuple(values))
+
+        if isinstance(expression, exp.Update):
+            table_name = expression.this.this.this
+            columns = []
+            values = []
+            filter = extract_where_conditions(expression)
+            for assignment in expression.expressions:
+                col_name = assignment.this.this.this
+                if isinstance(assignment.expression, exp.Placeholder) or _is_typed_literal(assignment.expression):
+                    value = _literal(assignment.expression)
+                else:
+                    value = assignment.expression.to_py() if hasattr(assignment.expression, 'to_py') else assignment.expression.sql()
+                columns.append(col_name)
+                values.append(value)
+
+            return UpdateStatement(table_name, tuple(columns), tuple(values), filter)
+
+        if isinstance(expression, exp.Delete):
+            table_name = expression.this.this.this
+            filter = extract_where_conditions(expression)
+
+            return DeleteStatement(table_name, filter)
+
+        if isinstance(expression, exp.Select) and not expression.args.get("from") \
+                and len(expression.expressions) == 1 and isinstance(expression.expressions[0].unalias(), exp.Exists):
+            probe = expression.expressions[0]
+            return ExistsStatement(self._parse_expression(probe.unalias().this, sql_query), probe.alias or 'exists')
+
+        if isinstance(expression, (exp.Select, exp.Join)):
+            table = extract_table(expression)
+            return_fields, is_distinct = extract_return_fields(expression)
+            where_clause = extract_where_conditions(expression)
+            order_by_clause = extract_order_by(expression)
+            limit_clause = extract_limit(expression)
+            offset_clause = extract_offset(expression)
+            aggregate, having = extract_group_by_fields(expression)
+            joins = extract_relationship_joins(expression)
+
+            return SelectStatement(
+                table=TableRef(table['label'], table['alias']),
+                columns=return_fields,
+                filter=where_clause,
+                order_by=order_by_clause,
+                limit=limit_clause,
+                group_by=aggregate,
+                having=having,
+                joins=joins,
+                distinct=bool(is_distinct),
+                offset=offset_clause
+            )
+
+        raise Exception(f"Unsupported SQL query: {sql_query}")
\ No newline at end of file
@@ -1,6 +1,8 @@
 from .console import Console
 from .constants import (DatabaseType, TOOL_DESCRIPTION, TOOL_SHORT_DESCRIPTION, AVAILABLE_COMMANDS_INFO,
-                       ALIAS_SUBCOMMANDS_INFO, NO_ALIAS_FOUND, ALIAS_CONNECTION_OPTIONS_INFO, ALIAS_CONNECTION_DETAILS_PATH)
+                       ALIAS_SUBCOMMANDS_INFO, NO_ALIAS_FOUND, ALIAS_CONNECTION_OPTIONS_INFO, ALIAS_CONNECTION_DETAILS_PATH,
+                       ALIAS_USAGE_FILE)
 
 __all__ = ['Console', 'DatabaseType', 'TOOL_DESCRIPTION', 'TOOL_SHORT_DESCRIPTION', 'AVAILABLE_COMMANDS_INFO',
-           'ALIAS_SUBCOMMANDS_INFO', 'NO_ALIAS_FOUND', 'ALIAS_CONNECTION_OPTIONS_INFO', 'ALIAS_CONNECTION_DETAILS_PATH']
\ No newline at end of file
+           'ALIAS_SUBCOMMANDS_INFO', 'NO_ALIAS_FOUND', 'ALIAS_CONNECTION_OPTIONS_INFO', 'ALIAS_CONNECTION_DETAILS_PATH',
+           'ALIAS_USAGE_FILE']
\ No newline at end of file
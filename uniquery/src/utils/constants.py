@@ -40,9 +40,13 @@ AVAILABLE_COMMANDS_INFO = f"""Available commands:
     alias edit <alias> [options]          - Edit an existing database alias
     alias delete <alias>                  - Delete a database alias
     alias use <alias>                     - Connect to a configured database alias
+    pools                                 - Show connection pool statistics per alias
     <query>                               - Execute SQL or native query
     set_native <true|false>               - Enable/disable native query mode
-    set_output <tabular|json|raw>         - Set query output format
+    set_output <format>                   - Set output format: table, json, ndjson, csv, raw or bson
+    set_raw_bson <true|false>             - Decode MongoDB results lazily from raw BSON
+    prepare <name> <query>                - Prepare a query with ? or :name placeholders
+    execute <name> [values|key=value]     - Execute a prepared query with bound values
     info, help                            - Show command help and usage
     exit, quit, Ctrl+D                    - Exit the application
 """
@@ -65,6 +69,26 @@ ALIAS_CONNECTION_OPTIONS_INFO = """Expected connection options:
     --username : Database username
     --password : Database password
     --database : Database name (optional)
+
+Optional performance profile:
+    MongoDB : --max-pool-size, --min-pool-size, --compressors [zstd,snappy,zlib],
+              --read-preference, --write-concern, --allow-disk-use [true|false], --batch-size
+    Neo4j   : --fetch-size, --routing [auto|read|write]
+    MySQL   : --pool-size, --compress [true|false], --max-execution-time (milliseconds)
 """
 
 ALIAS_CONNECTION_DETAILS_PATH = 'alias_connection_details.json'
+
+# Kept in the directory of the connection details file
+ALIAS_USAGE_FILE = 'alias_usage.json'
+
+# Aliases whose connections stay open between switches, and seconds an unused one stays open
+MAX_OPEN_ALIASES = 4
+ALIAS_IDLE_TIMEOUT = 900
+
+# Most used aliases connected in the background at startup, pre-warming is off while it is 0
+PREWARM_ALIAS_COUNT = 0
+
+# Translated plans kept in memory, and the file they are saved to on exit and loaded from at startup
+PLAN_CACHE_SIZE = 512
+PLAN_CACHE_PATH = 'plan_cache.json'
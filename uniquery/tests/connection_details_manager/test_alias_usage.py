@@ -0,0 +1,45 @@
+import os
+import tempfile
+import unittest
+
+from uniquery.src.connection_details_manager import ConnectionDetailsManager
+
+
+class TestAliasUsage(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.details_path = os.path.join(self.directory.name, 'aliases.json')
+        self.usage_path = os.path.join(self.directory.name, 'usage.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def manager(self):
+        return ConnectionDetailsManager(self.details_path, self.usage_path)
+
+    def test_most_used_aliases(self):
+        manager = self.manager()
+        for alias in ('hr', 'crm', 'sales'):
+            manager.add_connection(alias, {'type': 'mysql'})
+        for alias in ('crm', 'hr', 'crm', 'sales', 'crm', 'hr'):
+            manager.record_use(alias)
+
+        self.assertEqual(self.manager().most_used(2), ['crm', 'hr'])
+
+    def test_usage_is_stored_next_to_the_connection_details(self):
+        manager = ConnectionDetailsManager(self.details_path)
+        manager.add_connection('hr', {'type': 'mysql'})
+        manager.record_use('hr')
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'alias_usage.json')))
+
+    def test_removed_alias_is_forgotten(self):
+        manager = self.manager()
+        manager.add_connection('hr', {'type': 'mysql'})
+        manager.record_use('hr')
+        manager.remove_connection('hr')
+        self.assertEqual(self.manager().most_used(2), [])
+        self.assertEqual(self.manager().usage, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
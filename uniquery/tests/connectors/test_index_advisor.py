@@ -0,0 +1,60 @@
+import unittest
+
+from uniquery.src.connectors.index_advisor import IndexAdvisor, query_shape
+
+
+class FakeDatabase:
+    name = 'shop'
+
+    def __init__(self, server_choice, examined):
+        self.server_choice = server_choice
+        self.examined = examined
+        self.commands = []
+
+    def command(self, name, command, verbosity):
+        self.commands.append((verbosity, command.get('hint')))
+        if verbosity == 'queryPlanner':
+            stage = {'stage': 'FETCH', 'inputStage': {'stage': 'IXSCAN', 'indexName': self.server_choice}}
+            return {'queryPlanner': {'winningPlan': stage}}
+        return {'executionStats': {'nReturned': 10, 'totalKeysExamined': self.examined[command['hint']],
+                                   'totalDocsExamined': 10}}
+
+
+def plan(status):
+    return {'operation': 'FIND', 'collection': 'orders', 'filter': {'$and': [{'status': status},
+                                                                              {'total': {'$gt': 10}}]}}
+
+
+class TestIndexAdvisor(unittest.TestCase):
+    def test_hints_the_cheaper_index_when_server_picks_another(self):
+        database = FakeDatabase('status_1', {'status_1': 5000, 'status_1_total_1': 10})
+        advisor = IndexAdvisor()
+        self.assertEqual(advisor.choose(database, plan('new'), ['status_1_total_1', 'status_1']), 'status_1_total_1')
+        self.assertEqual(len(database.commands), 3)
+
+        # Same shape with another value reuses the verified choice
+        self.assertEqual(advisor.choose(database, plan('paid'), ['status_1_total_1', 'status_1']), 'status_1_total_1')
+        self.assertEqual(len(database.commands), 3)
+
+    def test_no_hint_when_server_choice_is_best(self):
+        database = FakeDatabase('status_1_total_1', {'status_1': 5000, 'status_1_total_1': 10})
+        self.assertIsNone(IndexAdvisor().choose(database, plan('new'), ['status_1_total_1', 'status_1']))
+
+    def test_invalidate_forgets_choices(self):
+        database = FakeDatabase('status_1', {'status_1': 5000, 'status_1_total_1': 10})
+        advisor = IndexAdvisor()
+        advisor.choose(database, plan('new'), ['status_1_total_1', 'status_1'])
+        advisor.invalidate('shop', 'orders')
+        advisor.choose(database, plan('new'), ['status_1_total_1', 'status_1'])
+        self.assertEqual(len(database.commands), 6)
+
+    def test_query_shape_ignores_values(self):
+        in_plan = {'collection': 'orders', 'filter': {'status': {'$in': ['a', 'b']}}}
+        self.assertEqual(query_shape('shop', plan('new')), query_shape('shop', plan('paid')))
+        self.assertEqual(query_shape('shop', in_plan),
+                         query_shape('shop', {'collection': 'orders', 'filter': {'status': {'$in': ['c']}}}))
+        self.assertNotEqual(query_shape('shop', plan('new')), query_shape('shop', in_plan))
+
+
+if __name__ == "__main__":
+    unittest.main()
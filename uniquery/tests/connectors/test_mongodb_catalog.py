@@ -0,0 +1,207 @@
+import time
+import unittest
+
+from uniquery.src.connectors import MongoDBConnector
+from uniquery.src.connectors.catalog import MongoCatalog
+from uniquery.src.connectors.schema import infer_schema
+from uniquery.src.query_engine import QueryEngine
+from uniquery.src.utils import DatabaseType
+
+
+class FakeCollection:
+    def __init__(self, database, name):
+        self.database = database
+        self.name = name
+
+    def list_indexes(self):
+        self.database.client.calls.append(('list_indexes', self.name))
+        return [{'name': name, 'key': {'_id': 1}} for name in self.database.indexes.get(self.name, ['_id_'])]
+
+    def create_index(self, keys, name):
+        self.database.indexes.setdefault(self.name, ['_id_']).append(name)
+
+    def insert_many(self, documents):
+        return len(documents)
+
+    def update_many(self, filter_criteria, update):
+        return 0
+
+    def aggregate(self, pipeline, **options):
+        self.database.client.calls.append(('aggregate', self.name, pipeline[0]))
+        return iter(self.database.documents.get(self.name, []))
+
+    def find(self, filter_criteria, projection=None, **options):
+        return FakeCursor(self.database.documents.get(self.name, []))
+
+    def estimated_document_count(self):
+        return self.database.counts.get(self.name, len(self.database.documents.get(self.name, [])))
+
+
+class FakeCursor(list):
+    def batch_size(self, size):
+        return self
+
+
+class FakeDatabase:
+    def __init__(self, client, name):
+        self.client = client
+        self.name = name
+        self.collections = []
+        self.indexes = {}
+        self.documents = {}
+        self.counts = {}
+
+    def list_collection_names(self):
+        self.client.calls.append(('list_collection_names', self.name))
+        return list(self.collections)
+
+    def create_collection(self, name):
+        self.collections.append(name)
+
+    def command(self, name, collection):
+        return {'size': 10, 'storageSize': 4096}
+
+    def __getitem__(self, name):
+        return FakeCollection(self, name)
+
+
+class FakeClient:
+    def __init__(self):
+        self.calls = []
+        self.databases = {}
+
+    def list_database_names(self):
+        self.calls.append(('list_database_names',))
+        return list(self.databases)
+
+    def __getitem__(self, name):
+        return self.databases.setdefault(name, FakeDatabase(self, name))
+
+
+class TestMongoCatalog(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+        self.client['shop'].collections = ['orders']
+        self.connector = MongoDBConnector(None, None, None, None, 'shop', client=self.client)
+
+    def test_writes_skip_the_metadata_round_trip(self):
+        for _ in range(3):
+            self.connector.run_query({'operation': 'UPDATE_DATA', 'collection': 'orders', 'updates': {'a': 1}})
+        self.assertEqual(self.client.calls, [('list_collection_names', 'shop')])
+
+    def test_insert_into_new_collection_updates_the_catalog(self):
+        self.connector.run_query({'operation': 'SHOW_COLLECTIONS'})
+        self.connector.run_query({'operation': 'INSERT_DATA', 'collection': 'items', 'documents': [{'a': 1}]})
+        self.connector.run_query({'operation': 'INSERT_DATA', 'collection': 'items', 'documents': [{'a': 2}]})
+        self.assertEqual(self.client['shop'].collections, ['orders', 'items'])
+        self.assertEqual(self.connector.run_query({'operation': 'SHOW_COLLECTIONS'}), ['orders', 'items'])
+        # The first miss is confirmed with the server, later checks are answered from the cache
+        self.assertEqual(self.client.calls.count(('list_collection_names', 'shop')), 2)
+
+    def test_collection_created_elsewhere_is_found(self):
+        self.connector.run_query({'operation': 'SHOW_COLLECTIONS'})
+        self.client['shop'].collections.append('returns')
+        self.connector.run_query({'operation': 'UPDATE_DATA', 'collection': 'returns', 'updates': {'a': 1}})
+
+    def test_index_ddl_invalidates_indexes(self):
+        query = {'operation': 'CREATE_INDEX', 'table': 'orders', 'index_name': 'by_date', 'columns': ['date']}
+        self.connector.run_query(query)
+        with self.assertRaises(Exception) as context:
+            self.connector.run_query(query)
+        self.assertIn("Index `by_date` already exist", str(context.exception))
+
+    def test_expired_entries_refresh_in_the_background(self):
+        catalog = MongoCatalog(self.client, ttl=0.01)
+        self.assertEqual(catalog.collection_names('shop'), ['orders'])
+        self.client['shop'].collections.append('items')
+        time.sleep(0.02)
+        # The stale entry is answered at once while it is reloaded
+        self.assertEqual(catalog.collection_names('shop'), ['orders'])
+        for _ in range(100):
+            if 'items' in catalog.collection_names('shop'):
+                break
+            time.sleep(0.01)
+        self.assertEqual(catalog.collection_names('shop'), ['orders', 'items'])
+
+    def test_failed_refresh_is_logged(self):
+        catalog = MongoCatalog(self.client, ttl=0.01)
+        catalog.collection_names('shop')
+        self.client['shop'].list_collection_names = lambda: 1 / 0
+        time.sleep(0.02)
+        with self.assertLogs('uniquery.src.connectors.catalog', 'WARNING') as logs:
+            self.assertEqual(catalog.collection_names('shop'), ['orders'])
+            for _ in range(100):
+                if not catalog._refreshing:
+                    break
+                time.sleep(0.01)
+        self.assertIn('division by zero', logs.output[0])
+
+    def test_invalidate_forgets_entries(self):
+        catalog = MongoCatalog(self.client)
+        catalog.collection_names('shop')
+        catalog.invalidate('shop')
+        catalog.collection_names('shop')
+        self.assertEqual(self.client.calls.count(('list_collection_names', 'shop')), 2)
+
+
+class TestSampledSchema(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeClient()
+        database = self.client['shop']
+        database.collections = ['orders']
+        database.documents['orders'] = [
+            {'_id': 1, 'status': 'new', 'total': 10},
+            {'_id': 2, 'status': 'paid', 'total': 12.5, 'note': None},
+            {'_id': 3, 'status': 'new', 'tags': ['a']},
+            {'_id': 4, 'status': 'paid', 'total': 7}
+        ]
+        database.counts['orders'] = 400
+        self.connector = MongoDBConnector(None, None, None, None, 'shop', client=self.client)
+
+    def test_infer_schema(self):
+        schema = infer_schema(self.client['shop'].documents['orders'], total=400)
+        self.assertEqual(schema['sample_size'], 4)
+        self.assertEqual(list(schema['fields']), ['_id', 'status', 'total', 'note', 'tags'])
+        self.assertEqual(schema['fields']['_id'], {'types': ['int'], 'presence': 1.0, 'cardinality': 400})
+        self.assertEqual(schema['fields']['status'], {'types': ['string'], 'presence': 1.0, 'cardinality': 2})
+        self.assertEqual(schema['fields']['total']['types'], ['int', 'double'])
+        self.assertEqual(schema['fields']['total']['presence'], 0.75)
+        self.assertEqual(schema['fields']['note'], {'types': ['null'], 'presence': 0.25, 'cardinality': 0})
+
+    def test_show_table_reports_the_sampled_schema(self):
+        result = self.connector.run_query({'operation': 'SHOW_COLLECTION', 'table_name': 'orders'})
+        self.assertEqual(result['stats'], {'count': 400, 'size': 10, 'storageSize': 4096})
+        self.assertEqual(result['indexes'], [{'name': '_id_', 'keys': [('_id', 1)]}])
+        self.assertEqual(result['sample_fields'], ['_id', 'status', 'total', 'note', 'tags'])
+        self.assertEqual(result['schema']['fields']['status']['cardinality'], 2)
+        self.assertIn(('aggregate', 'orders', {'$sample': {'size': 100}}), self.client.calls)
+
+        # The schema is sampled once and reused until it expires or the collection changes
+        self.connector.run_query({'operation': 'SHOW_COLLECTION', 'table_name': 'orders'})
+        self.assertEqual(sum(call[0] == 'aggregate' for call in self.client.calls), 1)
+        self.connector.catalog.invalidate('shop', 'orders')
+        self.connector.run_query({'operation': 'SHOW_COLLECTION', 'table_name': 'orders'})
+        self.assertEqual(sum(call[0] == 'aggregate' for call in self.client.calls), 2)
+
+    def test_translation_does_not_read_the_catalog(self):
+        engine = QueryEngine(DatabaseType.MONGO_DB, self.connector)
+        engine.build_query("SELECT * FROM orders WHERE status = 'new'")
+        engine.prepare("SELECT * FROM orders WHERE status = ?")
+        self.assertEqual(self.client.calls, [])
+
+        engine.execute_query("SELECT * FROM orders WHERE status = 'new'")
+        self.assertEqual([call[0] for call in self.client.calls], ['aggregate', 'list_indexes'])
+
+    def test_select_star_rows_follow_the_schema_order(self):
+        self.connector.catalog.schema('shop', 'orders')
+        self.client['shop'].documents['orders'] = [{'total': 3, 'extra': 1, 'status': 'new', '_id': 9}]
+        engine = QueryEngine(DatabaseType.MONGO_DB, self.connector)
+        plan = engine.build_query("SELECT * FROM orders")
+        self.assertNotIn('columns', plan)
+        rows = engine.run(plan)
+        self.assertEqual([list(row) for row in rows], [['_id', 'status', 'total', 'extra']])
+        self.assertNotIn('columns', engine.build_query("SELECT status FROM orders"))
+
+
+if __name__ == "__main__":
+    unittest.main()
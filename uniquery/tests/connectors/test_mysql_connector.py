@@ -0,0 +1,89 @@
+import unittest
+
+import mysql.connector
+
+from uniquery.src.connectors import MySQLConnector
+from uniquery.src.query_engine import ResultSet
+
+
+class FakeCursor:
+    def __init__(self, columns, rows, rowcount=-1):
+        self.column_names = columns
+        self.rows = list(rows)
+        self.with_rows = bool(columns)
+        self.rowcount = rowcount
+        self.fetch_sizes = []
+        self.closed = False
+
+    def execute(self, query, parameters=None):
+        pass
+
+    def fetchmany(self, size):
+        self.fetch_sizes.append(size)
+        batch, self.rows = self.rows[:size], self.rows[size:]
+        return batch
+
+    def fetchall(self):
+        raise AssertionError("fetchall must not be used")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, **options):
+        assert not options, "rows are read from a plain tuple cursor"
+        return self._cursor
+
+
+def connector_for(cursor, batch_size=2):
+    connector = MySQLConnector.__new__(MySQLConnector)
+    connector.connection = FakeConnection(cursor)
+    connector.batch_size = batch_size
+    return connector
+
+
+class TestMySQLConnector(unittest.TestCase):
+    def test_pure_python_driver_without_c_extension(self):
+        calls = []
+        connect, have_cext = mysql.connector.connect, mysql.connector.HAVE_CEXT
+        mysql.connector.connect = lambda **options: calls.append(options) or FakeConnection(None)
+        try:
+            for available in (False, True):
+                mysql.connector.HAVE_CEXT = available
+                MySQLConnector('localhost', 3306, 'root', 'secret')
+        finally:
+            mysql.connector.connect, mysql.connector.HAVE_CEXT = connect, have_cext
+        self.assertEqual([options['use_pure'] for options in calls], [True, False])
+
+    def test_select_returns_result_set(self):
+        cursor = FakeCursor(('id', 'name'), [(1, 'Ann'), (2, 'Bob'), (3, None)])
+        result = connector_for(cursor).run_query("SELECT id, name FROM employees")
+        self.assertIsInstance(result, ResultSet)
+        self.assertEqual(result.schema, {'id': 'int', 'name': 'object'})
+        self.assertEqual(result.column('name'), ['Ann', 'Bob', None])
+        self.assertEqual(cursor.fetch_sizes, [2, 2, 2])
+        self.assertTrue(cursor.closed)
+
+    def test_repeated_column_names_are_kept(self):
+        cursor = FakeCursor(('id', 'id'), [(1, 10)])
+        result = connector_for(cursor).run_query("SELECT e.id, d.id FROM employees e JOIN departments d")
+        self.assertEqual(list(result), [{'id': 1, 'id_1': 10}])
+
+    def test_statement_without_rows_reports_rowcount(self):
+        cursor = FakeCursor((), [], rowcount=3)
+        self.assertEqual(connector_for(cursor).run_query("UPDATE employees SET age = 1"), {'rows_affected': 3})
+        self.assertEqual(connector_for(FakeCursor((), [], 0)).stream("DELETE FROM employees"), {'rows_affected': 0})
+
+    def test_stream(self):
+        cursor = FakeCursor(('id',), [(1,), (2,), (3,)])
+        rows = connector_for(cursor).stream("SELECT id FROM employees", batch_size=2, prefetch=False)
+        self.assertEqual(list(rows), [{'id': 1}, {'id': 2}, {'id': 3}])
+        self.assertTrue(cursor.closed)
+
+
+if __name__ == "__main__":
+    unittest.main()
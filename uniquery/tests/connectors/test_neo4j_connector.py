@@ -0,0 +1,132 @@
+import io
+import unittest
+
+from neo4j import Query, Record, READ_ACCESS, WRITE_ACCESS
+from neo4j.graph import Graph, Node
+
+from uniquery.src.connectors import Neo4jConnector
+from uniquery.src.query_engine.translators.query_generator.cyper import CypherQuery
+from uniquery.src.query_engine.translators import QueryTranslator
+from uniquery.src.formatters import get_writer
+from uniquery.src.utils import DatabaseType
+
+
+class FakeResult:
+    def __init__(self, records):
+        self.records = records
+
+    def keys(self):
+        return list(self.records[0].keys()) if self.records else []
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def consume(self):
+        self.records = []
+
+
+class FakeSession:
+    def __init__(self, config, records):
+        self.config = config
+        self.records = records
+        self.calls = []
+        self.works = []
+        self.is_closed = False
+
+    def closed(self):
+        return self.is_closed
+
+    def close(self):
+        self.is_closed = True
+
+    def run(self, query, parameters=None):
+        self.calls.append(('run', query))
+        return FakeResult(self.records)
+
+    def execute_read(self, work, *args):
+        self.calls.append(('read', args[0]))
+        self.works.append(work)
+        return work(self, *args)
+
+    def execute_write(self, work, *args):
+        self.calls.append(('write', args[0]))
+        return work(self, *args)
+
+
+class FakeDriver:
+    def __init__(self, records):
+        self.records = records
+        self.sessions = []
+
+    def session(self, **config):
+        session = FakeSession(config, self.records)
+        self.sessions.append(session)
+        return session
+
+    def close(self):
+        pass
+
+
+def connector_for(records, fetch_size=500):
+    return Neo4jConnector(None, None, None, fetch_size=fetch_size, driver=FakeDriver(records))
+
+
+class TestNeo4jConnector(unittest.TestCase):
+    def setUp(self):
+        self.node = Node(Graph(), '4:x:1', 1, ['Person'], {'name': 'Ann', 'age': 30})
+        self.records = [Record({'p': self.node, 'name': 'Ann'}), Record({'p': self.node, 'name': 'Bob'})]
+
+    def test_sessions_are_reused_per_access_mode(self):
+        connector = connector_for(self.records)
+        connector.run_query(CypherQuery("MATCH (p:Person) RETURN p, p.name AS name;", read_only=True))
+        connector.run_query(CypherQuery("MATCH (p:Person) RETURN p.name AS name;", read_only=True))
+        connector.run_query("CREATE (p:Person {name: 'Cy'});")
+
+        sessions = connector.driver.sessions
+        self.assertEqual([session.config['default_access_mode'] for session in sessions], [READ_ACCESS, WRITE_ACCESS])
+        self.assertEqual(sessions[0].config['fetch_size'], 500)
+        # The fake session also acts as the transaction, so its `run` calls are skipped
+        self.assertEqual([call[0] for call in sessions[0].calls if call[0] != 'run'], ['read', 'read'])
+        self.assertEqual([call[0] for call in sessions[1].calls if call[0] != 'run'], ['write'])
+
+    def test_access_mode_follows_the_translated_statement(self):
+        translator = QueryTranslator(DatabaseType.NEO4J)
+        connector = connector_for(self.records)
+        connector.run_query(translator.translate("SELECT name FROM Person WHERE status = 'DELETE' AND note = 'SET'"))
+        connector.run_query(translator.translate("UPDATE Person SET status = 'x' WHERE name = 'Ann'"))
+        connector.run_query("MATCH (p:Person) RETURN p.name;")
+        self.assertEqual([session.config['default_access_mode'] for session in connector.driver.sessions],
+                         [READ_ACCESS, WRITE_ACCESS])
+        self.assertEqual([call[0] for call in connector.driver.sessions[1].calls if call[0] != 'run'],
+                         ['write', 'write'])
+
+    def test_rows_keep_return_order_and_nodes(self):
+        rows = connector_for(self.records).run_query("MATCH (p:Person) RETURN p, p.name AS name;")
+        self.assertEqual(list(rows[0]), ['p', 'name'])
+        self.assertIs(rows[0]['p'], self.node)
+
+    def test_stream_uses_session(self):
+        connector = connector_for(self.records)
+        rows = list(connector.stream("MATCH (p:Person) RETURN p, p.name AS name;", prefetch=False))
+        self.assertEqual([row['name'] for row in rows], ['Ann', 'Bob'])
+        self.assertEqual(connector.driver.sessions[0].calls, [('run', "MATCH (p:Person) RETURN p, p.name AS name;")])
+
+    def test_query_timeout_bounds_the_transaction(self):
+        connector = connector_for(self.records)
+        query = CypherQuery("MATCH (p:Person) RETURN p.name AS name;", timeout=1.5, read_only=True)
+        connector.run_query(query)
+        self.assertEqual(connector.driver.sessions[0].works[0].timeout, 1.5)
+
+        list(connector.stream(query, prefetch=False))
+        streamed = connector.driver.sessions[0].calls[-1][1]
+        self.assertIsInstance(streamed, Query)
+        self.assertEqual((streamed.text, streamed.timeout), (query, 1.5))
+
+    def test_nodes_are_converted_by_writers(self):
+        out = io.StringIO()
+        get_writer('ndjson').write(iter([{'p': self.node, 'name': 'Ann'}]), out)
+        self.assertEqual(out.getvalue(), '{"p": {"name": "Ann", "age": 30}, "name": "Ann"}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,206 @@
+import threading
+import time
+import unittest
+
+import mysql.connector
+
+from uniquery.src.connectors import PoolConfig, ConnectorPool, PoolManager
+
+
+class FakeConnector:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+        self.resets = 0
+
+    def ping(self):
+        return self.alive
+
+    def reset(self):
+        self.resets += 1
+
+    def close(self):
+        self.closed = True
+
+
+class FakeMySQLConnection:
+    def __init__(self, options):
+        self.options = options
+        self.closed = False
+
+    def ping(self, reconnect=False):
+        pass
+
+    def reset_session(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectorPool(unittest.TestCase):
+    def setUp(self):
+        self.created = []
+
+    def factory(self):
+        connector = FakeConnector()
+        self.created.append(connector)
+        return connector
+
+    def test_reuses_released_connectors(self):
+        pool = ConnectorPool(self.factory, PoolConfig(max_size=2))
+        first = pool.acquire()
+        pool.release(first)
+        self.assertIs(pool.acquire(), first)
+        self.assertEqual(first.resets, 1)
+        self.assertEqual(pool.stats()['created'], 1)
+
+    def test_waits_for_a_free_connector(self):
+        pool = ConnectorPool(self.factory, PoolConfig(max_size=1))
+        connector = pool.acquire()
+        threading.Timer(0.05, pool.release, (connector,)).start()
+        self.assertIs(pool.acquire(timeout=5), connector)
+        self.assertGreater(pool.stats()['wait_time_max'], 0)
+
+    def test_times_out_when_exhausted(self):
+        pool = ConnectorPool(self.factory, PoolConfig(max_size=1))
+        pool.acquire()
+        with self.assertRaises(Exception):
+            pool.acquire(timeout=0.01)
+        self.assertEqual(pool.stats()['timeouts'], 1)
+
+    def test_concurrent_checkouts_stay_within_max_size(self):
+        pool = ConnectorPool(self.factory, PoolConfig(max_size=3))
+        peak = []
+        lock = threading.Lock()
+
+        def work():
+            for _ in range(20):
+                with pool.connection(timeout=5):
+                    with lock:
+                        peak.append(pool.stats()['in_use'])
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertLessEqual(max(peak), 3)
+        self.assertLessEqual(len(self.created), 3)
+        self.assertEqual(pool.stats()['checkouts'], 160)
+
+    def test_unhealthy_connector_is_replaced(self):
+        pool = ConnectorPool(self.factory, PoolConfig(health_check_interval=0))
+        first = pool.acquire()
+        pool.release(first)
+        first.alive = False
+        second = pool.acquire()
+        self.assertIsNot(second, first)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.stats()['unhealthy'], 1)
+
+    def test_idle_connectors_are_evicted_down_to_min_size(self):
+        pool = ConnectorPool(self.factory, PoolConfig(min_size=1, max_size=3, max_idle_time=0.01))
+        connectors = [pool.acquire() for _ in range(3)]
+        for connector in connectors:
+            pool.release(connector)
+        time.sleep(0.02)
+        self.assertEqual(pool.evict_idle(), 2)
+        self.assertEqual(pool.stats()['size'], 1)
+
+    def test_close_waits_for_checked_out_connectors(self):
+        closed = []
+        pool = ConnectorPool(self.factory, on_close=lambda: closed.append(True))
+        connector = pool.acquire()
+        pool.close()
+        self.assertEqual(closed, [])
+        pool.release(connector)
+        self.assertTrue(connector.closed)
+        self.assertEqual(closed, [True])
+
+
+class TestPoolManager(unittest.TestCase):
+    def test_pools_per_alias(self):
+        built = []
+
+        def factory_builder(alias, connection_details, config):
+            built.append(alias)
+            return FakeConnector, None
+
+        manager = PoolManager(factory_builder=factory_builder)
+        details = {'type': 'mysql', 'host': 'localhost'}
+        with manager.connection('hr', details) as connector:
+            self.assertIsInstance(connector, FakeConnector)
+        manager.acquire('crm', details)
+        self.assertEqual(manager.pool('hr', details), manager.pool('hr', dict(details)))
+        self.assertEqual(set(manager.stats()), {'hr', 'crm'})
+        self.assertEqual(manager.stats()['crm']['in_use'], 1)
+
+        manager.pool('hr', {**details, 'host': 'db2'})
+        self.assertEqual(built, ['hr', 'crm', 'hr'])
+
+    def test_least_recently_used_alias_is_closed(self):
+        closed = []
+
+        def factory_builder(alias, connection_details, config):
+            return FakeConnector, lambda: closed.append(alias)
+
+        manager = PoolManager(factory_builder=factory_builder, max_pools=2)
+        for alias in ('hr', 'crm'):
+            manager.release(alias, manager.acquire(alias, {'alias': alias}))
+        manager.pool('hr', {'alias': 'hr'})
+        manager.release('sales', manager.acquire('sales', {'alias': 'sales'}))
+        self.assertEqual(closed, ['crm'])
+        self.assertEqual(set(manager.stats()), {'hr', 'sales'})
+
+    def test_evicted_mysql_alias_closes_its_connections(self):
+        connections = []
+
+        def connect(**options):
+            connections.append(FakeMySQLConnection(options))
+            return connections[-1]
+
+        original_connect = mysql.connector.connect
+        mysql.connector.connect = connect
+        try:
+            manager = PoolManager(max_pools=1)
+            for alias in ('hr', 'crm'):
+                details = {'type': 'mysql', 'host': alias, 'port': 3306, 'username': 'root', 'password': 'secret',
+                           'database': alias}
+                manager.release(alias, manager.acquire(alias, details))
+        finally:
+            mysql.connector.connect = original_connect
+
+        hr, crm = connections
+        self.assertNotIn('pool_name', hr.options)
+        self.assertTrue(hr.closed)
+        self.assertFalse(crm.closed)
+        manager.close()
+        self.assertTrue(crm.closed)
+
+    def test_checked_out_alias_is_kept_open(self):
+        manager = PoolManager(factory_builder=lambda *args: (FakeConnector, None), max_pools=1)
+        active = manager.acquire('hr', {'alias': 'hr'})
+        manager.acquire('crm', {'alias': 'crm'})
+        self.assertEqual(set(manager.stats()), {'hr', 'crm'})
+        manager.release('hr', active)
+        self.assertFalse(active.closed)
+
+    def test_unused_aliases_time_out(self):
+        manager = PoolManager(factory_builder=lambda *args: (FakeConnector, None), idle_timeout=0.01)
+        connector = manager.acquire('hr', {'alias': 'hr'})
+        manager.release('hr', connector)
+        time.sleep(0.02)
+        manager.evict_idle()
+        self.assertEqual(manager.stats(), {})
+        self.assertTrue(connector.closed)
+
+    def test_prewarm_opens_a_connection(self):
+        manager = PoolManager(factory_builder=lambda *args: (FakeConnector, None))
+        manager.prewarm('hr', {'alias': 'hr'}).join(timeout=5)
+        self.assertEqual(manager.stats()['hr']['idle'], 1)
+        self.assertEqual(manager.stats()['hr']['created'], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
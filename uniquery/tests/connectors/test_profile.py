@@ -0,0 +1,94 @@
+import unittest
+
+from neo4j import READ_ACCESS
+
+from uniquery.src.connectors import Neo4jConnector, PoolConfig, PoolManager, validate_profile
+from uniquery.src.connectors.profile import mongodb_client_options, mysql_connector_options, profile_pool_config
+
+
+class FakeSession:
+    def __init__(self, config):
+        self.config = config
+
+    def closed(self):
+        return False
+
+    def execute_read(self, work, *args):
+        return []
+
+    def execute_write(self, work, *args):
+        return []
+
+
+class FakeDriver:
+    def __init__(self):
+        self.sessions = []
+
+    def session(self, **config):
+        self.sessions.append(FakeSession(config))
+        return self.sessions[-1]
+
+
+class TestValidateProfile(unittest.TestCase):
+    def test_options_are_normalized(self):
+        profile = validate_profile('mongodb', {'compressors': 'zstd, snappy', 'write_concern': '2',
+                                               'read_preference': 'secondaryPreferred', 'batch_size': None})
+        self.assertEqual(profile, {'compressors': ['zstd', 'snappy'], 'write_concern': 2,
+                                   'read_preference': 'secondaryPreferred'})
+
+    def test_option_of_another_database_type_is_rejected(self):
+        with self.assertRaises(Exception) as context:
+            validate_profile('mysql', {'routing': 'read'})
+        self.assertIn("`routing` is not available for mysql", str(context.exception))
+
+    def test_invalid_values_are_rejected(self):
+        for database_type, profile in [('mongodb', {'compressors': 'lz4'}),
+                                       ('mongodb', {'read_preference': 'any'}),
+                                       ('mongodb', {'write_concern': 'all'}),
+                                       ('mongodb', {'min_pool_size': 10, 'max_pool_size': 5}),
+                                       ('neo4j', {'routing': 'leader'}),
+                                       ('neo4j', {'fetch_size': 0}),
+                                       ('mysql', {'max_execution_time': True})]:
+            with self.subTest(profile=profile), self.assertRaises(Exception):
+                validate_profile(database_type, profile)
+
+
+class TestProfileOptions(unittest.TestCase):
+    def test_mongodb_client_options(self):
+        options = mongodb_client_options({'max_pool_size': 20, 'compressors': ['zstd', 'zlib'],
+                                          'read_preference': 'secondary', 'write_concern': 'majority'})
+        self.assertEqual(options, {'maxPoolSize': 20, 'compressors': 'zstd,zlib',
+                                   'readPreference': 'secondary', 'w': 'majority'})
+
+    def test_mysql_max_execution_time_is_a_session_variable(self):
+        options = mysql_connector_options({'compress': True, 'max_execution_time': 5000})
+        self.assertEqual(options, {'compress': True, 'session_variables': {'max_execution_time': 5000}})
+
+    def test_pool_sizes_override_the_pool_config(self):
+        config = PoolConfig(min_size=1, max_size=8)
+        self.assertIs(profile_pool_config(config, {'compress': True}), config)
+        self.assertEqual(profile_pool_config(config, {'pool_size': 16}).max_size, 16)
+        resized = profile_pool_config(config, {'max_pool_size': 4, 'min_pool_size': 2})
+        self.assertEqual((resized.min_size, resized.max_size), (2, 4))
+
+    def test_pool_manager_sizes_alias_pools_from_profile(self):
+        configs = []
+
+        def factory_builder(alias, connection_details, config):
+            configs.append(config)
+            return object, None
+
+        manager = PoolManager(factory_builder=factory_builder)
+        manager.pool('reports', {'type': 'mysql', 'profile': {'pool_size': 3}})
+        self.assertEqual(configs[0].max_size, 3)
+        self.assertEqual(manager.stats()['reports']['max_size'], 3)
+
+    def test_neo4j_routing_pins_access_mode(self):
+        driver = FakeDriver()
+        connector = Neo4jConnector(None, None, None, driver=driver, routing='read')
+        connector.run_query("CREATE (p:Person {name: 'Ann'})")
+        self.assertEqual(driver.sessions[0].config['default_access_mode'], READ_ACCESS)
+
+
+if __name__ == "__main__":
+    unittest.main()
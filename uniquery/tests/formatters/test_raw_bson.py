@@ -0,0 +1,69 @@
+import datetime
+import io
+import unittest
+
+import bson
+from bson.raw_bson import RawBSONDocument
+
+from uniquery.src.connectors import MongoDBConnector
+from uniquery.src.formatters import get_writer
+from uniquery.src.query_engine import ResultSet
+
+
+def raw(document):
+    return RawBSONDocument(bson.encode(document))
+
+
+class TestRawBsonResults(unittest.TestCase):
+    def setUp(self):
+        object_id = bson.ObjectId('64b7f0c2a1b2c3d4e5f60718')
+        self.documents = [
+            raw({'_id': object_id, 'name': 'Ann', 'joined': datetime.datetime(2024, 1, 2)}),
+            raw({'_id': object_id, 'name': 'Bob', 'address': {'city': 'Oslo'}})
+        ]
+
+    def test_bson_writer_copies_raw_bytes(self):
+        out = io.BytesIO()
+        self.assertEqual(get_writer('bson').write(iter(self.documents), out), 2)
+        self.assertEqual(out.getvalue(), b''.join(document.raw for document in self.documents))
+        self.assertEqual(bson.decode_all(out.getvalue())[1]['address'], {'city': 'Oslo'})
+
+    def test_ndjson_writes_extended_json(self):
+        out = io.StringIO()
+        get_writer('ndjson').write(iter(self.documents[:1]), out)
+        self.assertEqual(bson.json_util.loads(out.getvalue())['joined'], datetime.datetime(2024, 1, 2))
+        self.assertIn('"$oid"', out.getvalue())
+
+    def test_table_reads_raw_fields(self):
+        out = io.StringIO()
+        get_writer('table').write(iter(self.documents), out)
+        self.assertIn('{"city": "Oslo"}', out.getvalue())
+        self.assertIn('64b7f0c2a1b2c3d4e5f60718', out.getvalue())
+
+    def test_result_set_from_raw_documents(self):
+        self.assertEqual(ResultSet.from_rows(self.documents).column('name'), ['Ann', 'Bob'])
+
+    def test_connector_uses_raw_document_class(self):
+        connector = MongoDBConnector("127.0.0.1", 27017, "admin", "admin", "test_database", raw_bson=True)
+        try:
+            collection = connector._result_collection('employees')
+            self.assertIs(collection.codec_options.document_class, RawBSONDocument)
+            connector.raw_bson = False
+            self.assertIs(connector._result_collection('employees').codec_options.document_class, dict)
+        finally:
+            connector.close()
+
+    def test_raw_documents_keep_client_codec_options(self):
+        connector = MongoDBConnector("127.0.0.1", 27017, "admin", "admin", "test_database", raw_bson=True,
+                                     tz_aware=True, uuidRepresentation='standard')
+        try:
+            options = connector._result_collection('employees').codec_options
+            self.assertIs(options.document_class, RawBSONDocument)
+            self.assertTrue(options.tz_aware)
+            self.assertEqual(options.uuid_representation, bson.binary.UuidRepresentation.STANDARD)
+        finally:
+            connector.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import contextlib
+import datetime
+import io
+import unittest
+
+from bson import ObjectId, Decimal128
+
+from uniquery.src.formatters import get_writer, write_result, encode_value, to_json
+from uniquery.src.formatters.writers import Writer
+from uniquery.src.query_engine import QueryEngine
+from uniquery.src.utils import DatabaseType
+
+
+def render(output_format, rows):
+    out = io.StringIO()
+    count = get_writer(output_format).write(rows, out)
+    return out.getvalue(), count
+
+
+class TestEncoder(unittest.TestCase):
+    def test_bson_values(self):
+        object_id = ObjectId('64b7f0c2a1b2c3d4e5f60718')
+        self.assertEqual(encode_value(object_id), '64b7f0c2a1b2c3d4e5f60718')
+        self.assertEqual(encode_value(Decimal128('12.50')), '12.50')
+        self.assertEqual(encode_value(datetime.datetime(2024, 1, 2, 3, 4, 5)), '2024-01-02T03:04:05')
+        self.assertEqual(to_json({'_id': object_id, 'tags': ('a',)}),
+                         '{"_id": "64b7f0c2a1b2c3d4e5f60718", "tags": ["a"]}')
+
+
+class TestWriters(unittest.TestCase):
+    rows = [{'id': 1, 'name': 'Ann'}, {'id': 2, 'name': 'Bob', 'extra': True}]
+
+    def test_table(self):
+        text, count = render('table', iter(self.rows))
+        self.assertEqual(count, 2)
+        self.assertEqual(text.splitlines(), [
+            '+----+------+-------+',
+            '| id | name | extra |',
+            '+----+------+-------+',
+            '| 1  | Ann  |       |',
+            '| 2  | Bob  | True  |',
+            '+----+------+-------+'
+        ])
+
+    def test_table_layout_comes_from_sample(self):
+        writer = get_writer('table')
+        writer.sample_size = 1
+        out = io.StringIO()
+        writer.write(iter([{'name': 'Al'}, {'name': 'Christopher', 'id': 3}]), out)
+        self.assertIn('| Chr… |', out.getvalue())
+        self.assertEqual(out.getvalue().splitlines()[-1], 'Columns not shown, first seen after row 1: id')
+
+    def test_writer_must_implement_write(self):
+        with self.assertRaises(TypeError):
+            Writer()
+
+    def test_json(self):
+        text, count = render('json', iter(self.rows))
+        self.assertEqual(count, 2)
+        self.assertEqual(text, '[\n  {"id": 1, "name": "Ann"},\n  {"id": 2, "name": "Bob", "extra": true}\n]\n')
+        self.assertEqual(render('json', iter([]))[0], '[]\n')
+
+    def test_ndjson(self):
+        text, _ = render('ndjson', iter(self.rows))
+        self.assertEqual(text, '{"id": 1, "name": "Ann"}\n{"id": 2, "name": "Bob", "extra": true}\n')
+
+    def test_csv(self):
+        text, _ = render('csv', iter([{'id': 1, 'tags': ['a', 'b']}, {'id': 2}]))
+        self.assertEqual(text, 'id,tags\n1,"[""a"", ""b""]"\n2,\n')
+
+    def test_scalars_and_acknowledgements(self):
+        out = io.StringIO()
+        self.assertEqual(write_result(['db1', 'db2'], 'csv', out), 2)
+        self.assertEqual(out.getvalue(), 'value\ndb1\ndb2\n')
+
+        out = io.StringIO()
+        self.assertEqual(write_result(True, 'table', out), 0)
+        self.assertEqual(out.getvalue(), 'True\n')
+
+    def test_unknown_format(self):
+        with self.assertRaises(Exception):
+            get_writer('xml')
+
+    def test_stdout_holds_only_the_result(self):
+        class FakeConnector:
+            def run_query(self, query):
+                return [{'id': 1}]
+
+        engine = QueryEngine(DatabaseType.MONGO_DB, FakeConnector(), output_format='ndjson')
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            engine.write_result(engine.execute_query("SELECT id FROM employees"))
+        self.assertEqual(stdout.getvalue(), '{"id": 1}\n')
+        self.assertIn("Translated query", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -78,7 +78,8 @@ class TestEngineMongo(unittest.TestCase):
                 'size': 0,
                 'storageSize': 4096
             },
-            'sample_fields': []
+            'sample_fields': [],
+            'schema': {'sample_size': 0, 'fields': {}}
         }
         self.assertEqual(expected_output, self.query_engine.execute_query(sql))
 
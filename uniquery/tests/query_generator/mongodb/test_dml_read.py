@@ -116,7 +116,7 @@ class TestTableOperationsMqlGenerator(unittest.TestCase):
             'operation': 'FIND',
             'collection': 'employees',
             'filter': {
-                'name': {'$regex': '^.*Art .$'}  # Convert SQL LIKE '%Art _' to regex
+                'name': {'$regex': 'Art .$'}  # Convert SQL LIKE '%Art _' to regex
             },
             'projection': None
         }
@@ -377,6 +377,87 @@ class TestTableOperationsMqlGenerator(unittest.TestCase):
         }
         self.assertEqual(get_mongodb_query(parsed_sql), expected_mql)
 
+    def test_select_with_aggregation_filter_order_and_limit(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'employees', 'alias': 'employees'},
+            'columns': [
+                {'name': 'department', 'alias': None},
+                {'aggregation_function': 'AVG', 'name': 'salary', 'alias': 'avg_pay'},
+                {'aggregation_function': 'MAX', 'name': 'age', 'alias': None},
+                {'aggregation_function': 'COUNT_DISTINCT', 'name': 'title', 'alias': 'titles'}
+            ],
+            'filter': {'column': 'status', 'operator': '=', 'value': 'active'},
+            'aggregate': ['department'],
+            'having': {'aggregation_function': 'COUNT_DISTINCT', 'column': 'title', 'operator': '>', 'value': 1},
+            'order_by': [
+                {'column': 'salary', 'order': 'DESC', 'aggregation_function': 'AVG'},
+                {'column': 'department', 'order': 'ASC'}
+            ],
+            'limit': 5
+        }
+        expected_mql = {
+            'operation': 'AGGREGATE',
+            'collection': 'employees',
+            'pipeline': [
+                {'$match': {'status': 'active'}},
+                {
+                    '$group': {
+                        '_id': {'department': '$department'},
+                        'avg_pay': {'$avg': '$salary'},
+                        'max_age': {'$max': '$age'},
+                        'titles': {'$addToSet': '$title'}
+                    }
+                },
+                {'$set': {'titles': {'$size': '$titles'}}},
+                {'$match': {'titles': {'$gt': 1}}},
+                {'$sort': {'avg_pay': -1, '_id.department': 1}},
+                {'$limit': 5}
+            ]
+        }
+        self.assertEqual(get_mongodb_query(parsed_sql), expected_mql)
+
+    def test_select_distinct_single_column(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'employees', 'alias': 'employees'},
+            'columns': [{'name': 'department_id', 'alias': None}],
+            'filter': {'column': 'age', 'operator': '>', 'value': 30},
+            'distinct': True
+        }
+        expected_mql = {
+            'operation': 'DISTINCT',
+            'collection': 'employees',
+            'key': 'department_id',
+            'alias': 'department_id',
+            'filter': {'age': {'$gt': 30}}
+        }
+        self.assertEqual(get_mongodb_query(parsed_sql), expected_mql)
+
+    def test_select_distinct_multiple_columns_with_order_and_limit(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'employees', 'alias': 'employees'},
+            'columns': [
+                {'name': 'department_id', 'alias': 'dept'},
+                {'name': 'title', 'alias': None}
+            ],
+            'order_by': [{'column': 'dept', 'order': 'ASC'}],
+            'limit': 10,
+            'distinct': True
+        }
+        expected_mql = {
+            'operation': 'AGGREGATE',
+            'collection': 'employees',
+            'pipeline': [
+                {'$group': {'_id': {'department_id': '$department_id', 'title': '$title'}}},
+                {'$sort': {'_id.department_id': 1}},
+                {'$limit': 10},
+                {'$project': {'_id': 0, 'dept': '$_id.department_id', 'title': '$_id.title'}}
+            ]
+        }
+        self.assertEqual(get_mongodb_query(parsed_sql), expected_mql)
+
     def test_select_with_inner_join(self):
         parsed_sql = {
             'operation': 'SELECT',
@@ -487,27 +568,26 @@ class TestTableOperationsMqlGenerator(unittest.TestCase):
                 {
                     '$lookup': {
                         'from': 'orders',
-                        'localField': 'id',
-                        'foreignField': 'customer_id',
+                        'let': {'local_key': '$id'},
+                        'pipeline': [
+                            {
+                                '$match': {
+                                    '$expr': {'$eq': ['$customer_id', '$$local_key']},
+                                    'status': 'pending'
+                                }
+                            }
+                        ],
                         'as': 'o'
                     }
                 },
                 {
-                    '$unwind': {
-                        'path': '$o',
-                        'preserveNullAndEmptyArrays': True
-                    }
+                    '$unwind': '$o'
                 },
                 {
                     '$project': {
                         'c.name': '$name',
                         'o.id': '$o.id'
                     }
-                },
-                {
-                    '$match': {
-                        'o.status': 'pending'
-                    }
                 }
             ]
         }
@@ -538,6 +618,11 @@ class TestTableOperationsMqlGenerator(unittest.TestCase):
             'operation': 'AGGREGATE',
             'collection': 'customers',
             'pipeline': [
+                {
+                    '$match': {
+                        'status': 'pending'
+                    }
+                },
                 {
                     '$lookup': {
                         'from': 'orders',
@@ -557,10 +642,72 @@ class TestTableOperationsMqlGenerator(unittest.TestCase):
                         'c.name': '$name',
                         'o.id': '$o.id'
                     }
+                }
+            ]
+        }
+        self.assertEqual(get_mongodb_query(parsed_sql), expected_mql)
+
+    def test_select_with_join_filter_spanning_tables(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'customers', 'alias': 'c'},
+            'columns': [
+                {'name': 'c.name', 'alias': None}
+            ],
+            'joins': [
+                {
+                    'type': 'LEFT',
+                    'table': {'name': 'orders', 'alias': 'o'},
+                    'on': {'left': 'c.id', 'operator': '=', 'right': 'o.customer_id'}
+                }
+            ],
+            'filter': {
+                'operator': 'AND',
+                'operands': [
+                    {'column': 'c.region', 'operator': '=', 'value': 'EU'},
+                    {'operator': 'IS_NULL', 'column': 'o.id'},
+                    {
+                        'operator': 'OR',
+                        'operands': [
+                            {'column': 'c.vip', 'operator': '=', 'value': True},
+                            {'column': 'o.total', 'operator': '>', 'value': 100}
+                        ]
+                    }
+                ]
+            }
+        }
+        expected_mql = {
+            'operation': 'AGGREGATE',
+            'collection': 'customers',
+            'pipeline': [
+                {
+                    '$match': {'region': 'EU'}
+                },
+                {
+                    '$lookup': {
+                        'from': 'orders',
+                        'localField': 'id',
+                        'foreignField': 'customer_id',
+                        'as': 'o'
+                    }
+                },
+                {
+                    '$unwind': {
+                        'path': '$o',
+                        'preserveNullAndEmptyArrays': True
+                    }
                 },
                 {
                     '$match': {
-                        'status': 'pending'
+                        '$and': [
+                            {'o.id': None},
+                            {'$or': [{'vip': True}, {'o.total': {'$gt': 100}}]}
+                        ]
+                    }
+                },
+                {
+                    '$project': {
+                        'c.name': '$name'
                     }
                 }
             ]
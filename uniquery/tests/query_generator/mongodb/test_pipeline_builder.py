@@ -0,0 +1,115 @@
+import unittest
+
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+from uniquery.src.query_engine.translators.query_generator import get_mongodb_query
+from uniquery.src.query_engine.translators.query_generator.mql import PipelineBuilder
+
+class TestPipelineBuilder(unittest.TestCase):
+
+    def test_trivial_pipeline_becomes_find(self):
+        builder = PipelineBuilder('employees')
+        builder.project({'_id': 0, 'name': 1, 'age': 1}).match({'age': {'$gt': 30}}).sort({'name': 1}).limit(10)
+        self.assertEqual(builder.build(), {
+            'operation': 'FIND',
+            'collection': 'employees',
+            'filter': {'age': {'$gt': 30}},
+            'projection': {'_id': 0, 'name': 1, 'age': 1},
+            'sort': [('name', 1)],
+            'limit': 10
+        })
+
+    def test_project_stays_before_stage_reading_renamed_field(self):
+        builder = PipelineBuilder('employees')
+        builder.project({'full_name': '$name'}).sort({'full_name': 1})
+        self.assertEqual(builder.build()['pipeline'], [
+            {'$project': {'full_name': '$name'}},
+            {'$sort': {'full_name': 1}}
+        ])
+
+    def test_adjacent_stages_are_coalesced(self):
+        builder = PipelineBuilder('employees')
+        builder.match({'age': {'$gt': 30}}).sort({'age': 1}).match({'age': {'$lt': 60}}).match({'dept': 'HR'})
+        builder.limit(10).limit(5).group({'_id': '$dept'})
+        self.assertEqual(builder.pipeline(), [
+            {'$match': {'$and': [{'age': {'$gt': 30}}, {'age': {'$lt': 60}}], 'dept': 'HR'}},
+            {'$sort': {'age': 1}},
+            {'$limit': 5},
+            {'$group': {'_id': '$dept'}}
+        ])
+
+    def test_limit_moves_before_lookup_without_unwind(self):
+        builder = PipelineBuilder('orders')
+        builder.lookup({'from': 'customers', 'localField': 'customer_id', 'foreignField': 'id', 'as': 'c'})
+        builder.limit(10)
+        self.assertEqual(builder.pipeline()[0], {'$limit': 10})
+
+    def test_limit_stays_after_unwound_lookup(self):
+        builder = PipelineBuilder('orders')
+        builder.lookup({'from': 'customers', 'localField': 'customer_id', 'foreignField': 'id', 'as': 'c'})
+        builder.unwind('$c').limit(10)
+        self.assertEqual(builder.pipeline()[-1], {'$limit': 10})
+
+    def test_join_with_group_order_and_limit(self):
+        sql = """SELECT d.name, COUNT(*) AS headcount, AVG(e.salary) AS avg_salary
+            FROM employees e JOIN departments d ON e.department_id = d.id
+            WHERE e.active = true AND d.region = 'EU'
+            GROUP BY d.name HAVING COUNT(*) > 3 ORDER BY headcount DESC LIMIT 5"""
+        self.assertEqual(get_mongodb_query(SqlParser().parse_ir(sql)), {
+            'operation': 'AGGREGATE',
+            'collection': 'employees',
+            'pipeline': [
+                {'$match': {'active': True}},
+                {
+                    '$lookup': {
+                        'from': 'departments',
+                        'let': {'local_key': '$department_id'},
+                        'pipeline': [{'$match': {'$expr': {'$eq': ['$id', '$$local_key']}, 'region': 'EU'}}],
+                        'as': 'd'
+                    }
+                },
+                {'$unwind': '$d'},
+                {
+                    '$group': {
+                        '_id': {'d_name': '$d.name'},
+                        'headcount': {'$sum': 1},
+                        'avg_salary': {'$avg': '$salary'}
+                    }
+                },
+                {'$match': {'headcount': {'$gt': 3}}},
+                {'$sort': {'headcount': -1}},
+                {'$limit': 5}
+            ]
+        })
+
+    def test_join_order_by_base_column_sorts_before_lookup(self):
+        sql = """SELECT e.name, d.name AS department FROM employees e
+            JOIN departments d ON e.department_id = d.id ORDER BY e.name LIMIT 5"""
+        self.assertEqual(get_mongodb_query(SqlParser().parse_ir(sql))['pipeline'], [
+            {'$sort': {'name': 1}},
+            {'$lookup': {'from': 'departments', 'localField': 'department_id', 'foreignField': 'id', 'as': 'd'}},
+            {'$unwind': '$d'},
+            {'$limit': 5},
+            {'$project': {'e.name': '$name', 'department': '$d.name'}}
+        ])
+
+    def test_column_comparison_across_tables_stays_after_unwind(self):
+        sql = """SELECT e.name FROM employees e JOIN departments d ON e.department_id = d.id
+            WHERE e.age > 30 AND e.budget_code = d.code AND d.size < d.capacity"""
+        self.assertEqual(get_mongodb_query(SqlParser().parse_ir(sql))['pipeline'], [
+            {'$match': {'age': {'$gt': 30}}},
+            {'$lookup': {'from': 'departments', 'let': {'local_key': '$department_id'}, 'pipeline': [
+                {'$match': {'$and': [{'$expr': {'$eq': ['$id', '$$local_key']}},
+                                     {'$expr': {'$lt': ['$size', '$capacity']}}]}}
+            ], 'as': 'd'}},
+            {'$unwind': '$d'},
+            {'$match': {'$expr': {'$eq': ['$budget_code', '$d.code']}}},
+            {'$project': {'e.name': '$name'}}
+        ])
+
+    def test_column_comparison_on_one_collection(self):
+        plan = get_mongodb_query(SqlParser().parse_ir("SELECT * FROM staff WHERE salary > bonus AND age > 30"))
+        self.assertEqual(plan['filter'], {'$and': [{'$expr': {'$gt': ['$salary', '$bonus']}}, {'age': {'$gt': 30}}]})
+
+
+if __name__ == '__main__':
+    unittest.main()
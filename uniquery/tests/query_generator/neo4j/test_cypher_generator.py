@@ -0,0 +1,103 @@
+import unittest
+
+from uniquery.src.query_engine.translators.query_generator import get_cypher_query
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+
+class TestCypherGenerator(unittest.TestCase):
+
+    def test_select_with_alias(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'Person', 'alias': 'p'},
+            'columns': [{'name': 'p.name', 'alias': 'person_name'}]
+        }
+        self.assertEqual(get_cypher_query(parsed_sql), "MATCH (p:Person)\nRETURN p.name AS person_name;")
+
+    def test_select_all_with_filter_order_and_limit(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'Person', 'alias': 'Person'},
+            'columns': [{'name': '*', 'alias': None}],
+            'filter': {
+                'operator': 'AND',
+                'operands': [
+                    {'operator': '>', 'column': 'age', 'value': 30},
+                    {'operator': 'IN', 'column': 'city', 'values': ['Berlin', "O'Hare"]}
+                ]
+            },
+            'order_by': [{'column': 'name', 'order': 'DESC'}],
+            'limit': 5
+        }
+        expected = ("MATCH (Person:Person)\n"
+                    "WHERE (Person.age > 30 AND Person.city IN ['Berlin', 'O\\'Hare'])\n"
+                    "RETURN Person\n"
+                    "ORDER BY Person.name DESC\n"
+                    "LIMIT 5;")
+        self.assertEqual(get_cypher_query(parsed_sql), expected)
+
+    def test_like_uses_string_predicates(self):
+        def where(operator, pattern):
+            parsed_sql = {
+                'operation': 'SELECT',
+                'table': {'name': 'Person', 'alias': 'p'},
+                'columns': [{'name': '*', 'alias': None}],
+                'filter': {'operator': operator, 'column': 'p.name', 'value': pattern}
+            }
+            return get_cypher_query(parsed_sql).split('\n')[1]
+
+        self.assertEqual(where('LIKE', 'Al%'), "WHERE p.name STARTS WITH 'Al'")
+        self.assertEqual(where('LIKE', '%ce'), "WHERE p.name ENDS WITH 'ce'")
+        self.assertEqual(where('LIKE', '%li%'), "WHERE p.name CONTAINS 'li'")
+        self.assertEqual(where('LIKE', 'Alice'), "WHERE p.name = 'Alice'")
+        self.assertEqual(where('LIKE', 'A_i.%'), "WHERE p.name =~ 'A.i\\\\..*'")
+        self.assertEqual(where('ILIKE', 'AL%'), "WHERE toLower(p.name) STARTS WITH 'al'")
+        self.assertEqual(where('ILIKE', 'A_%'), "WHERE p.name =~ '(?i)A..*'")
+
+    def test_select_with_aggregation_with_having(self):
+        parsed_sql = {
+            'operation': 'SELECT',
+            'table': {'name': 'employees', 'alias': 'e'},
+            'columns': [
+                {'name': 'department', 'alias': None},
+                {'aggregation_function': 'SUM', 'name': 'salary', 'alias': None}
+            ],
+            'aggregate': ['department'],
+            'having': {'aggregation_function': 'SUM', 'column': 'salary', 'operator': '>', 'value': 1000}
+        }
+        expected = ("MATCH (e:employees)\n"
+                    "WITH e.department AS department, sum(e.salary) AS sum_salary\n"
+                    "WHERE sum_salary > 1000\n"
+                    "RETURN department, sum_salary;")
+        self.assertEqual(get_cypher_query(parsed_sql), expected)
+
+    def test_group_by_order_by_alias_and_aggregate(self):
+        sql_parser = SqlParser()
+        query = get_cypher_query(sql_parser.parse_ir(
+            "SELECT department_id, SUM(salary) AS s, COUNT(*) FROM employees e GROUP BY department_id "
+            "ORDER BY s DESC, COUNT(*)"))
+        self.assertEqual(query, "MATCH (e:employees)\n"
+                                "RETURN e.department_id, sum(e.salary) AS s, count(e)\n"
+                                "ORDER BY s DESC, count(e);")
+
+    def test_having_order_by_uses_with_names(self):
+        sql_parser = SqlParser()
+        query = get_cypher_query(sql_parser.parse_ir(
+            "SELECT department_id, SUM(salary) AS s FROM employees e GROUP BY department_id "
+            "HAVING SUM(salary) > 1000 ORDER BY s DESC, AVG(age), department_id"))
+        self.assertEqual(query, "MATCH (e:employees)\n"
+                                "WITH e.department_id AS department_id, sum(e.salary) AS s, avg(e.age) AS avg_age\n"
+                                "WHERE s > 1000\n"
+                                "RETURN department_id, s\n"
+                                "ORDER BY s DESC, avg_age, department_id;")
+
+    def test_delete(self):
+        parsed_sql = {
+            'operation': 'DELETE_DATA',
+            'table_name': 'Person',
+            'filter': {'operator': 'IS_NULL', 'column': 'name'}
+        }
+        self.assertEqual(get_cypher_query(parsed_sql), "MATCH (n:Person)\nWHERE n.name IS NULL\nDETACH DELETE n;")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+
+from uniquery.src.query_engine import QueryEngine
+from uniquery.src.query_engine.translators import QueryTranslator
+from uniquery.src.utils import DatabaseType
+
+class TestFastPaths(unittest.TestCase):
+    def setUp(self):
+        self.mongodb = QueryTranslator(DatabaseType.MONGO_DB)
+        self.neo4j = QueryTranslator(DatabaseType.NEO4J)
+
+    def test_unfiltered_count_uses_estimate(self):
+        self.assertEqual(self.mongodb.translate("SELECT COUNT(*) FROM employees"), {
+            'operation': 'COUNT',
+            'collection': 'employees',
+            'alias': 'count_all',
+            'estimated': True
+        })
+
+    def test_filtered_count_uses_count_documents(self):
+        self.assertEqual(self.mongodb.translate("SELECT COUNT(manager_id) AS managed FROM employees WHERE age > 30"), {
+            'operation': 'COUNT',
+            'collection': 'employees',
+            'alias': 'managed',
+            'filter': {'$and': [{'age': {'$gt': 30}}, {'manager_id': {'$ne': None}}]}
+        })
+
+    def test_count_with_limit_or_offset_uses_pipeline(self):
+        self.assertEqual(self.mongodb.translate("SELECT COUNT(*) FROM employees LIMIT 0"), {'operation': 'EMPTY_RESULT'})
+        query = self.mongodb.translate("SELECT COUNT(*) FROM employees WHERE age > 30 LIMIT 1 OFFSET 1")
+        self.assertEqual(query['operation'], 'AGGREGATE')
+        self.assertEqual(query['pipeline'], [
+            {'$match': {'age': {'$gt': 30}}},
+            {'$group': {'_id': {}, 'count_all': {'$sum': 1}}},
+            {'$skip': 1},
+            {'$limit': 1}
+        ])
+
+    def test_aggregate_without_group_by(self):
+        query = self.mongodb.translate("SELECT SUM(salary) AS total FROM employees WHERE age > 30")
+        self.assertEqual(query['pipeline'], [
+            {'$match': {'age': {'$gt': 30}}},
+            {'$group': {'_id': {}, 'total': {'$sum': '$salary'}}}
+        ])
+
+    def test_limit_one_becomes_find_one(self):
+        self.assertEqual(self.mongodb.translate("SELECT * FROM employees WHERE name = 'Alice' ORDER BY age LIMIT 1"), {
+            'operation': 'FIND_ONE',
+            'collection': 'employees',
+            'filter': {'name': 'Alice'},
+            'projection': None,
+            'sort': [('age', 1)]
+        })
+
+    def test_exists_probe(self):
+        self.assertEqual(self.mongodb.translate("SELECT EXISTS(SELECT 1 FROM employees WHERE age > 60) AS has_senior"), {
+            'operation': 'EXISTS',
+            'collection': 'employees',
+            'alias': 'has_senior',
+            'filter': {'age': {'$gt': 60}}
+        })
+        self.assertEqual(
+            self.neo4j.translate("SELECT EXISTS(SELECT 1 FROM Person p WHERE p.age > 60)"),
+            "RETURN EXISTS {\nMATCH (p:Person)\nWHERE p.age > 60\n} AS exists;"
+        )
+
+    def test_cypher_count_uses_count_store(self):
+        self.assertEqual(self.neo4j.translate("SELECT COUNT(*) FROM Person p"), "MATCH (p:Person)\nRETURN count(p);")
+
+    def test_engine_labels_estimated_count(self):
+        class CountingConnector:
+            def run_query(self, query):
+                return [{query['alias']: 42}]
+
+        engine = QueryEngine(DatabaseType.MONGO_DB, CountingConnector())
+        self.assertEqual(engine.execute_query("SELECT COUNT(*) FROM employees"), [{'count_all': 42}])
+        self.assertTrue(engine.last_result_approximate)
+        engine.execute_query("SELECT COUNT(*) FROM employees WHERE age > 30")
+        self.assertFalse(engine.last_result_approximate)
+
+
+if __name__ == "__main__":
+    unittest.main()
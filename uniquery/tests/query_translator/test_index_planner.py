@@ -0,0 +1,69 @@
+import unittest
+
+from uniquery.src.query_engine.translators import QueryTranslator, PlanCache
+from uniquery.src.query_engine.translators.index_planner import index_score, plan_indexes, predicate_kinds
+from uniquery.src.utils import DatabaseType
+
+INDEXES = [
+    {'v': 2, 'key': {'_id': 1}, 'name': '_id_'},
+    {'v': 2, 'key': {'department': 1, 'age': 1}, 'name': 'department_1_age_1'},
+    {'v': 2, 'key': {'department': 1, 'name': 1, 'age': 1}, 'name': 'department_1_name_1_age_1'},
+    {'v': 2, 'key': {'email': 1}, 'name': 'email_1', 'sparse': True},
+    {'v': 2, 'key': {'bio': 'text'}, 'name': 'bio_text'}
+]
+
+
+class TestIndexPlanner(unittest.TestCase):
+    def setUp(self):
+        self.translator = QueryTranslator(DatabaseType.MONGO_DB)
+
+    def translate(self, sql):
+        return self.translator.with_catalog(self.translator.translate(sql), indexes=INDEXES)
+
+    def test_predicate_kinds(self):
+        kinds = predicate_kinds({'$and': [{'age': {'$gt': 30}}, {'department': 'IT'}],
+                                 'name': {'$regex': '^An'}, 'bio': {'$regex': 'x', '$options': 'i'}})
+        self.assertEqual(kinds, {'age': 'range', 'department': 'eq', 'name': 'range', 'bio': 'other'})
+
+    def test_equality_sort_range_scoring(self):
+        kinds = {'department': 'eq', 'age': 'range'}
+        self.assertEqual(index_score(['department', 'age'], kinds), 3)
+        self.assertEqual(index_score(['department', 'name', 'age'], kinds, [('name', 1)]), 4)
+        self.assertEqual(index_score(['age', 'department'], {'department': 'eq'}), 0)
+
+    def test_conjuncts_follow_the_index_key_order(self):
+        plan = self.translate("SELECT * FROM staff WHERE age > 30 AND department = 'IT'")
+        self.assertEqual(plan['filter'], {'$and': [{'department': 'IT'}, {'age': {'$gt': 30}}]})
+        self.assertEqual(plan['hint_candidates'], ['department_1_age_1', 'department_1_name_1_age_1'])
+        self.assertNotIn('hint', plan)
+
+    def test_covered_projection(self):
+        plan = self.translate("SELECT department, age FROM staff WHERE department = 'IT' AND age > 30")
+        self.assertEqual(plan['projection'], {'_id': 0, 'department': 1, 'age': 1})
+        self.assertEqual(plan['hint'], 'department_1_age_1')
+        self.assertNotIn('hint_candidates', plan)
+
+    def test_projection_outside_the_index_is_not_covered(self):
+        plan = self.translate("SELECT salary FROM staff WHERE department = 'IT' AND age > 30")
+        self.assertNotIn('hint', plan)
+
+    def test_array_fields_are_not_covered(self):
+        schema = {'fields': {'department': {'types': ['array']}}}
+        plan = plan_indexes({'operation': 'FIND', 'collection': 'staff', 'filter': {'department': 'IT'},
+                             'projection': {'_id': 0, 'department': 1}}, INDEXES, schema)
+        self.assertNotIn('hint', plan)
+
+    def test_sparse_and_text_indexes_are_never_hinted(self):
+        plan = self.translate("SELECT email FROM staff WHERE email = 'a@b.c'")
+        self.assertNotIn('hint', plan)
+        self.assertNotIn('hint_candidates', plan)
+
+    def test_cached_plan_is_left_unplanned(self):
+        sql = "SELECT * FROM staff WHERE age > 30 AND department = 'IT'"
+        translator = QueryTranslator(DatabaseType.MONGO_DB, PlanCache())
+        self.assertIn('hint_candidates', translator.with_catalog(translator.translate(sql), indexes=INDEXES))
+        cached = translator.plan_cache.get(translator.plan_cache.make_key(sql, DatabaseType.MONGO_DB))
+        self.assertNotIn('hint_candidates', cached)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+from uniquery.src.query_engine.translators import QueryTranslator
+from uniquery.src.query_engine.translators.like_pattern import LikeKind, analyze_like, normalize_escape
+from uniquery.src.utils import DatabaseType
+
+class TestLikePattern(unittest.TestCase):
+
+    def test_classifies_patterns(self):
+        self.assertEqual(analyze_like('abc').kind, LikeKind.EXACT)
+        self.assertEqual(analyze_like('abc%').kind, LikeKind.PREFIX)
+        self.assertEqual(analyze_like('%abc').kind, LikeKind.SUFFIX)
+        self.assertEqual(analyze_like('%%abc%').kind, LikeKind.CONTAINS)
+        self.assertEqual(analyze_like('a_c%').kind, LikeKind.PATTERN)
+        self.assertEqual(analyze_like('%a%c%').kind, LikeKind.PATTERN)
+
+    def test_escaped_wildcards_are_literals(self):
+        like = analyze_like('50\\%%')
+        self.assertEqual((like.kind, like.text), (LikeKind.PREFIX, '50%'))
+        self.assertEqual(normalize_escape('50!%!!', '!'), '50\\%\\!')
+
+    def test_regex_metacharacters_are_escaped(self):
+        self.assertEqual(analyze_like('a.b+%').search_regex(), '^a\\.b\\+')
+        self.assertEqual(analyze_like('%(x)_').search_regex(), '\\(x\\).$')
+
+    def test_mongodb_translation(self):
+        translator = QueryTranslator(DatabaseType.MONGO_DB)
+
+        def where(condition):
+            return translator.translate(f"SELECT * FROM employees WHERE {condition}")['filter']
+
+        self.assertEqual(where("name LIKE 'Alice'"), {'name': 'Alice'})
+        self.assertEqual(where("name LIKE 'Al%'"), {'name': {'$regex': '^Al'}})
+        self.assertEqual(where("name LIKE '%!_x' ESCAPE '!'"), {'name': {'$regex': '_x$'}})
+        self.assertEqual(where("name ILIKE 'al%'"), {'name': {'$regex': '^al', '$options': 'i'}})
+        self.assertEqual(where("LOWER(name) = 'a_b'"), {'name': {'$regex': '^a_b$', '$options': 'i'}})
+        self.assertEqual(where("name NOT LIKE 'Al%'"), {'name': {'$not': {'$regex': '^Al'}}})
+
+    def test_folded_column_against_other_case_never_matches(self):
+        translator = QueryTranslator(DatabaseType.MONGO_DB)
+        plan = translator.translate("SELECT * FROM employees WHERE LOWER(name) LIKE 'Al%'")
+        self.assertEqual(plan, {'operation': 'EMPTY_RESULT'})
+
+
+if __name__ == "__main__":
+    unittest.main()
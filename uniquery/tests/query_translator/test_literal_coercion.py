@@ -0,0 +1,113 @@
+import datetime
+import unittest
+
+from bson import Decimal128, ObjectId
+from bson.int64 import Int64
+
+from uniquery.src.query_engine.translators import QueryTranslator, PlanCache
+from uniquery.src.utils import DatabaseType
+
+OBJECT_ID = '64f1a2b3c4d5e6f708091a2b'
+
+SCHEMA = {
+    'sample_size': 10,
+    'fields': {
+        '_id': {'types': ['objectId'], 'presence': 1.0, 'cardinality': 1000},
+        'hired_at': {'types': ['date', 'null'], 'presence': 1.0, 'cardinality': 900},
+        'salary': {'types': ['decimal'], 'presence': 1.0, 'cardinality': 50},
+        'badge': {'types': ['long'], 'presence': 0.5, 'cardinality': 500},
+        'name': {'types': ['string'], 'presence': 1.0, 'cardinality': 1000}
+    }
+}
+
+
+class TestTypedLiterals(unittest.TestCase):
+    def setUp(self):
+        self.mongodb = QueryTranslator(DatabaseType.MONGO_DB)
+        self.neo4j = QueryTranslator(DatabaseType.NEO4J)
+
+    def test_mongodb_typed_literals_become_bson(self):
+        query = self.mongodb.translate(
+            "SELECT * FROM employees WHERE hired_at >= DATE '2024-01-01' "
+            "AND salary = CAST('1200.50' AS DECIMAL(10, 2)) AND manager = OBJECTID('" + OBJECT_ID + "')"
+        )
+        self.assertEqual(query['filter'], {'$and': [
+            {'hired_at': {'$gte': datetime.datetime(2024, 1, 1)}},
+            {'salary': Decimal128('1200.50')},
+            {'manager': ObjectId(OBJECT_ID)}
+        ]})
+
+    def test_mongodb_point_becomes_geojson(self):
+        query = self.mongodb.translate("SELECT * FROM stores WHERE location = POINT(4.9, 52.3)")
+        self.assertEqual(query['filter'], {'location': {'type': 'Point', 'coordinates': [4.9, 52.3]}})
+
+    def test_mongodb_insert_with_timestamp(self):
+        query = self.mongodb.translate("INSERT INTO events (name, at) VALUES ('login', TIMESTAMP '2024-03-01 08:30:00')")
+        self.assertEqual(query['documents'], [{'name': 'login', 'at': datetime.datetime(2024, 3, 1, 8, 30)}])
+
+    def test_cypher_temporal_and_point_literals(self):
+        query = self.neo4j.translate(
+            "SELECT name FROM Person WHERE born < DATE '1990-05-01' AND seen >= TIMESTAMP '2024-01-01T10:00:00Z' "
+            "AND home = POINT(1, 2)"
+        )
+        self.assertIn("n.born < date('1990-05-01')", query)
+        self.assertIn("n.seen >= datetime('2024-01-01T10:00:00+00:00')", query)
+        self.assertIn("n.home = point({x: 1.0, y: 2.0})", query)
+
+    def test_invalid_typed_literal_is_reported(self):
+        with self.assertRaises(Exception) as context:
+            self.mongodb.translate("SELECT * FROM employees WHERE hired_at >= DATE 'yesterday'")
+        self.assertIn("Cannot convert 'yesterday' to DATE", str(context.exception))
+
+
+class TestSchemaCoercion(unittest.TestCase):
+    def setUp(self):
+        self.plan_cache = PlanCache()
+        self.translator = QueryTranslator(DatabaseType.MONGO_DB, self.plan_cache)
+
+    def translate(self, sql, schema=SCHEMA):
+        return self.translator.with_catalog(self.translator.translate(sql), schema)
+
+    def test_literals_follow_field_types(self):
+        query = self.translate(
+            f"SELECT name FROM staff WHERE _id = '{OBJECT_ID}' AND hired_at >= '2024-01-01' "
+            "AND salary > 1000 AND badge IN ('17', '18') AND name = '2024-01-01'"
+        )
+        self.assertEqual(query['filter'], {'$and': [
+            {'_id': ObjectId(OBJECT_ID)},
+            {'hired_at': {'$gte': datetime.datetime(2024, 1, 1)}},
+            {'salary': {'$gt': Decimal128('1000')}},
+            {'badge': {'$in': [Int64(17), Int64(18)]}},
+            {'name': '2024-01-01'}
+        ]})
+
+    def test_cached_plan_stays_uncoerced(self):
+        sql = f"SELECT name FROM staff WHERE _id = '{OBJECT_ID}'"
+        self.translate(sql)
+        cached = self.plan_cache.get(self.plan_cache.make_key(sql, DatabaseType.MONGO_DB))
+        self.assertEqual(cached['filter'], {'_id': OBJECT_ID})
+        self.assertEqual(self.translate(sql)['filter'], {'_id': ObjectId(OBJECT_ID)})
+
+    def test_unconvertible_literal_is_left_alone(self):
+        query = self.translate("SELECT name FROM staff WHERE _id = 'not-an-id'")
+        self.assertEqual(query['filter'], {'_id': 'not-an-id'})
+
+    def test_inserted_and_updated_values_are_stored_as_written(self):
+        insert = self.translate("INSERT INTO staff (badge, hired_at) VALUES ('007', '2023-06-01')")
+        self.assertEqual(insert['documents'], [{'badge': '007', 'hired_at': '2023-06-01'}])
+        update = self.translate("UPDATE staff SET salary = 1500 WHERE badge = '7'")
+        self.assertEqual(update['updates'], {'salary': 1500})
+        self.assertEqual(update['filter'], {'badge': Int64(7)})
+
+    def test_mixed_type_field_is_not_coerced(self):
+        schema = {'fields': {'badge': {'types': ['long', 'string', 'null'], 'presence': 1.0, 'cardinality': 9}}}
+        query = self.translate("SELECT name FROM staff WHERE badge = '17'", schema)
+        self.assertEqual(query['filter'], {'badge': '17'})
+
+    def test_collection_without_schema_is_unchanged(self):
+        query = self.translate("SELECT name FROM other WHERE hired_at >= '2024-01-01'", None)
+        self.assertEqual(query['filter'], {'hired_at': {'$gte': '2024-01-01'}})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import unittest
+
+from uniquery.src.query_engine import QueryEngine
+from uniquery.src.query_engine.translators import QueryTranslator, PredicateOptimizer, Rule
+from uniquery.src.query_engine.translators.optimizer import default_rules
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, InList, IsNull, Range, Not, Logical,
+                                                      TRUE, FALSE)
+from uniquery.src.utils import DatabaseType
+
+class TestPredicateOptimizer(unittest.TestCase):
+    def setUp(self):
+        self.parser = SqlParser()
+        self.optimizer = PredicateOptimizer()
+
+    def optimize_where(self, where):
+        statement = self.parser.parse_ir(f"SELECT * FROM employees WHERE {where}")
+        return self.optimizer.optimize(statement.filter)
+
+    def test_flattens_nested_logical(self):
+        result = self.optimize_where("a = 1 AND (b = 2 AND (c = 3 AND d = 4))")
+        self.assertEqual(result.operator, Operator.AND)
+        self.assertEqual([operand.column for operand in result.operands], ['a', 'b', 'c', 'd'])
+
+    def test_removes_duplicates(self):
+        result = self.optimize_where("a = 1 AND b = 2 AND a = 1")
+        self.assertEqual(result, Logical(Operator.AND, (
+            Comparison('a', Operator.EQ, 1),
+            Comparison('b', Operator.EQ, 2)
+        )))
+
+    def test_or_equalities_become_in(self):
+        result = self.optimize_where("a = 1 OR a = 2 OR b = 5 OR a IN (3, 1)")
+        self.assertEqual(result, Logical(Operator.OR, (
+            InList('a', (1, 2, 3)),
+            Comparison('b', Operator.EQ, 5)
+        )))
+
+    def test_merges_ranges(self):
+        self.assertEqual(self.optimize_where("x > 1 AND x < 5"), Range('x', 1, 5, False, False))
+        self.assertEqual(
+            self.optimize_where("x >= 1 AND x BETWEEN 0 AND 10 AND x < 5 AND y = 2"),
+            Logical(Operator.AND, (Range('x', 1, 5, True, False), Comparison('y', Operator.EQ, 2)))
+        )
+        self.assertEqual(self.optimize_where("x >= 3 AND x <= 3"), Comparison('x', Operator.EQ, 3))
+
+    def test_keeps_incomparable_bounds(self):
+        result = self.optimize_where("x > 1 AND x < 'z'")
+        self.assertEqual(len(result.operands), 2)
+
+    def test_folds_constants(self):
+        self.assertEqual(self.optimize_where("1 = 1 AND x = 2"), Comparison('x', Operator.EQ, 2))
+        self.assertEqual(self.optimize_where("x = 2 OR 1 = 1"), TRUE)
+        self.assertEqual(self.optimize_where("x = 2 AND false"), FALSE)
+
+    def test_detects_contradictions(self):
+        self.assertEqual(self.optimize_where("x > 5 AND x < 2"), FALSE)
+        self.assertEqual(self.optimize_where("x = 1 AND x = 2"), FALSE)
+        self.assertEqual(self.optimize_where("x IS NULL AND x = 1"), FALSE)
+        self.assertEqual(self.optimize_where("x = 4 AND x IN (1, 2)"), FALSE)
+        self.assertEqual(self.optimize_where("x IS NULL AND NOT x IS NULL"), FALSE)
+
+    def test_mixed_kind_literals_are_not_compared(self):
+        self.assertEqual(len(self.optimize_where("x = true AND x = 1").operands), 2)
+        self.assertEqual(len(self.optimize_where("x = 1 AND x IN (true)").operands), 2)
+        self.assertEqual(self.optimize_where("x = 1 AND x = 2.5"), FALSE)
+
+    def test_array_fields_are_not_folded(self):
+        optimizer = PredicateOptimizer(default_rules(scalar_fields=False))
+
+        def optimize_where(where):
+            return optimizer.optimize(self.parser.parse_ir(f"SELECT * FROM employees WHERE {where}").filter)
+
+        # [1, 2] equals both values, [1, 9] is above 5 and below 3
+        self.assertEqual(len(optimize_where("x = 1 AND x = 2").operands), 2)
+        self.assertEqual(optimize_where("x > 5 AND x < 3"), Range('x', 5, 3, False, False))
+        self.assertEqual(optimize_where("x >= 3 AND x <= 3"), Range('x', 3, 3, True, True))
+        self.assertEqual(len(optimize_where("x IS NULL AND x = 1").operands), 2)
+        self.assertEqual(optimize_where("x IS NULL AND NOT x IS NULL"), FALSE)
+
+    def test_contradiction_inside_or_is_dropped(self):
+        self.assertEqual(self.optimize_where("(x > 5 AND x < 2) OR y = 1"), Comparison('y', Operator.EQ, 1))
+
+    def test_parameters_are_not_merged(self):
+        result = self.optimize_where("x > ? AND x < 5")
+        self.assertEqual(len(result.operands), 2)
+
+    def test_reports_rule_counts(self):
+        self.optimize_where("a = 1 OR a = 2")
+        self.optimize_where("x > 1 AND x < 5")
+        stats = self.optimizer.stats()
+        self.assertEqual(stats['or_equalities_to_in'], 1)
+        self.assertEqual(stats['merge_ranges'], 1)
+        self.assertEqual(stats['detect_contradictions'], 0)
+
+    def test_custom_rule(self):
+        class DropNotNull(Rule):
+            name = 'drop_not_null'
+
+            def rewrite(self, predicate):
+                if isinstance(predicate, Not) and isinstance(predicate.operand, IsNull):
+                    return TRUE
+                return predicate
+
+        optimizer = PredicateOptimizer()
+        optimizer.add_rule(DropNotNull())
+        statement = self.parser.parse_ir("SELECT * FROM employees WHERE x IS NOT NULL AND y = 1")
+        self.assertEqual(optimizer.optimize(statement.filter), Comparison('y', Operator.EQ, 1))
+        self.assertEqual(optimizer.stats()['drop_not_null'], 1)
+
+
+class TestOptimizedTranslation(unittest.TestCase):
+    def test_mongodb_filter_is_optimized(self):
+        translator = QueryTranslator(DatabaseType.MONGO_DB)
+        query = translator.translate("SELECT * FROM employees WHERE (age > 20 AND age <= 30) AND (dept = 'HR' OR dept = 'IT')")
+        self.assertEqual(query['filter'], {'$and': [
+            {'age': {'$gt': 20, '$lte': 30}},
+            {'dept': {'$in': ['HR', 'IT']}}
+        ]})
+
+    def test_cypher_filter_is_optimized(self):
+        translator = QueryTranslator(DatabaseType.NEO4J)
+        query = translator.translate("SELECT * FROM Person p WHERE p.age > 20 AND p.age < 30 AND 1 = 1")
+        self.assertEqual(query, "MATCH (p:Person)\nWHERE 20 < p.age < 30\nRETURN p;")
+
+    def test_contradiction_skips_connector(self):
+        class FailingConnector:
+            def run_query(self, *args):
+                raise AssertionError("connector must not be called")
+
+        engine = QueryEngine(DatabaseType.NEO4J, FailingConnector())
+        self.assertEqual(engine.execute_query("SELECT * FROM Person p WHERE p.age > 50 AND p.age < 20"), [])
+
+    def test_mongodb_contradiction_reaches_the_server(self):
+        translator = QueryTranslator(DatabaseType.MONGO_DB)
+        query = translator.translate("SELECT * FROM employees WHERE age > 50 AND age < 20")
+        self.assertEqual(query['filter'], {'age': {'$gt': 50, '$lt': 20}})
+
+
+if __name__ == "__main__":
+    unittest.main()
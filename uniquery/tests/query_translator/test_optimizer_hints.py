@@ -0,0 +1,101 @@
+import pickle
+import unittest
+
+from uniquery.src.query_engine.translators import QueryTranslator, PlanCache
+from uniquery.src.query_engine.translators.hints import parse_hints, split_hints
+from uniquery.src.query_engine.translators.ir import QueryHints, statement_from_dict
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+from uniquery.src.utils import DatabaseType
+
+INDEXES = [
+    {'v': 2, 'key': {'_id': 1}, 'name': '_id_'},
+    {'v': 2, 'key': {'department': 1, 'age': 1}, 'name': 'department_1_age_1'},
+    {'v': 2, 'key': {'age': 1}, 'name': 'age_1'}
+]
+
+
+class TestHintParsing(unittest.TestCase):
+    def test_split_hints_leaves_strings_alone(self):
+        sql, text = split_hints("UPDATE /*+ INDEX(t idx) */ t SET a = '/*+ BATCH(1) */'")
+        self.assertEqual(sql, "UPDATE  t SET a = '/*+ BATCH(1) */'")
+        self.assertEqual(text, " INDEX(t idx) ")
+        self.assertEqual(split_hints("SELECT a FROM t /* note */"), ("SELECT a FROM t /* note */", None))
+
+    def test_parse_hints(self):
+        self.assertEqual(parse_hints("INDEX(t idx_a, idx_b) MAX_TIME(500) BATCH(1000) NO_ICP(t)"),
+                         QueryHints(('idx_a', 'idx_b'), 't', 500, 1000))
+        self.assertEqual(parse_hints("index(`idx`)"), QueryHints(('idx',)))
+        self.assertIsNone(parse_hints("NO_ICP(t) BKA(t)"))
+        with self.assertRaises(Exception):
+            parse_hints("MAX_TIME(soon)")
+
+    def test_parser_carries_hints(self):
+        statement = SqlParser().parse_ir("DELETE /*+ INDEX(staff age_1) MAX_TIME(200) */ FROM staff WHERE age > 60")
+        self.assertEqual(statement.hints, QueryHints(('age_1',), 'staff', 200))
+        self.assertEqual(statement_from_dict(statement.to_dict()), statement)
+        self.assertNotIn('hints', SqlParser().parse("SELECT /*+ NO_ICP(t) */ a FROM t"))
+
+
+class TestMongoDBHints(unittest.TestCase):
+    def setUp(self):
+        self.translator = QueryTranslator(DatabaseType.MONGO_DB)
+
+    def translate(self, sql):
+        return self.translator.with_catalog(self.translator.translate(sql), indexes=INDEXES)
+
+    def test_hints_map_to_find_options(self):
+        plan = self.translate(
+            "SELECT /*+ INDEX(s age_1) MAX_TIME(500) BATCH(1000) */ name FROM staff s "
+            "WHERE age > 30 AND department = 'IT'")
+        self.assertEqual(plan['hint'], 'age_1')
+        self.assertEqual((plan['max_time_ms'], plan['batch_size']), (500, 1000))
+        # The index planner leaves a hinted plan as written
+        self.assertNotIn('hint_candidates', plan)
+        self.assertEqual(plan['filter'], {'$and': [{'age': {'$gt': 30}}, {'department': 'IT'}]})
+
+    def test_several_indexes_become_candidates(self):
+        plan = self.translate("SELECT /*+ INDEX(staff age_1 department_1_age_1) */ COUNT(*) "
+                                         "FROM staff WHERE age > 30")
+        self.assertEqual(plan['hint_candidates'], ['age_1', 'department_1_age_1'])
+        with self.assertRaises(Exception):
+            self.translator.translate("SELECT /*+ INDEX(staff a b) */ department, COUNT(*) FROM staff "
+                                      "GROUP BY department")
+
+    def test_write_hints(self):
+        plan = self.translate("UPDATE /*+ INDEX(age_1) MAX_TIME(50) */ staff SET retired = 1 "
+                                         "WHERE age > 60")
+        self.assertEqual((plan['hint'], plan['max_time_ms']), ('age_1', 50))
+
+    def test_index_hint_must_name_the_queried_table(self):
+        with self.assertRaises(Exception):
+            self.translator.translate("SELECT /*+ INDEX(orders age_1) */ name FROM staff WHERE age > 30")
+
+    def test_hint_text_is_part_of_the_cache_key(self):
+        key = PlanCache.make_key
+        self.assertNotEqual(key("SELECT /*+ INDEX(t Idx) */ a FROM t", DatabaseType.MONGO_DB),
+                            key("SELECT /*+ INDEX(t idx) */ a FROM t", DatabaseType.MONGO_DB))
+
+
+class TestCypherAndSqlHints(unittest.TestCase):
+    def test_cypher_timeout(self):
+        query = QueryTranslator(DatabaseType.NEO4J, PlanCache()).translate(
+            "SELECT /*+ MAX_TIME(1500) */ p.name FROM Person p WHERE p.name = 'Ann'")
+        self.assertEqual(query, "MATCH (p:Person)\nWHERE p.name = 'Ann'\nRETURN p.name;")
+        self.assertEqual(query.timeout, 1.5)
+        self.assertEqual(pickle.loads(pickle.dumps(query)).timeout, 1.5)
+
+    def test_cypher_rejects_index_hints(self):
+        translator = QueryTranslator(DatabaseType.NEO4J)
+        for sql in ("SELECT /*+ INDEX(p person_name) */ p.name FROM Person p WHERE p.name = 'Ann'",
+                    "DELETE /*+ INDEX(person_name) */ FROM Person WHERE name = 'Ann'"):
+            with self.assertRaises(Exception) as context:
+                translator.translate(sql)
+            self.assertIn("INDEX hints are not supported for Neo4j", str(context.exception))
+
+    def test_mysql_query_is_sent_as_written(self):
+        sql = "SELECT /*+ INDEX(t idx_a) MAX_EXECUTION_TIME(500) */ a FROM t WHERE a > 1"
+        self.assertEqual(QueryTranslator(DatabaseType.MYSQL).translate(sql), sql)
+
+
+if __name__ == "__main__":
+    unittest.main()
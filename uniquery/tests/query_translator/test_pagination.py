@@ -0,0 +1,126 @@
+import unittest
+
+from uniquery.src.query_engine import QueryEngine, KeysetPage
+from uniquery.src.query_engine.pagination import seek_predicate
+from uniquery.src.query_engine.translators import QueryTranslator
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+from uniquery.src.query_engine.translators.ir import Operator, Comparison, Logical, OrderItem
+from uniquery.src.utils import DatabaseType
+
+
+class FakeMongoConnector:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def run_query(self, query):
+        self.queries.append(query)
+        rows = [row for row in self.rows if self._matches(row, query.get('filter') or {})]
+        for field, direction in reversed(query.get('sort', [])):
+            rows.sort(key=lambda row: row[field], reverse=direction < 0)
+        fields = [field for field, shown in query.get('projection', {}).items() if shown]
+        return [{field: row[field] for field in fields} for row in rows[:query['limit']]]
+
+    # Understands only the filters of a seek predicate
+    @classmethod
+    def _matches(cls, row, filter_):
+        for key, condition in filter_.items():
+            if key == '$or' and not any(cls._matches(row, operand) for operand in condition):
+                return False
+            if key == '$and' and not all(cls._matches(row, operand) for operand in condition):
+                return False
+            if key.startswith('$'):
+                continue
+            if not isinstance(condition, dict):
+                condition = {'$eq': condition}
+            for operator, value in condition.items():
+                if not {'$eq': row[key] == value, '$gt': row[key] > value, '$lt': row[key] < value}[operator]:
+                    return False
+        return True
+
+
+class TestOffset(unittest.TestCase):
+    def test_mongodb_offset(self):
+        query = QueryTranslator(DatabaseType.MONGO_DB).translate(
+            "SELECT name FROM employees ORDER BY name LIMIT 10 OFFSET 20")
+        self.assertEqual(query['operation'], 'FIND')
+        self.assertEqual(query['skip'], 20)
+        self.assertEqual(query['limit'], 10)
+
+    def test_cypher_offset(self):
+        query = QueryTranslator(DatabaseType.NEO4J).translate(
+            "SELECT p.name FROM Person p ORDER BY p.name LIMIT 10 OFFSET 20")
+        self.assertIn("SKIP 20\nLIMIT 10", query)
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def test_seek_predicate(self):
+        order_by = (OrderItem('a', False), OrderItem('b', True))
+        self.assertEqual(seek_predicate(order_by, [1, 2]), Logical(Operator.OR, (
+            Comparison('a', Operator.GT, 1),
+            Logical(Operator.AND, (Comparison('a', Operator.EQ, 1), Comparison('b', Operator.LT, 2)))
+        )))
+
+    def test_requires_order_by(self):
+        statement = SqlParser().parse_ir("SELECT id FROM employees")
+        with self.assertRaises(Exception):
+            KeysetPage(statement, "SELECT id FROM employees", 10)
+
+    def test_pages_follow_tokens(self):
+        connector = FakeMongoConnector([{'_id': index, 'id': index} for index in range(1, 6)])
+        engine = QueryEngine(DatabaseType.MONGO_DB, connector)
+        query = "SELECT id FROM employees ORDER BY id"
+
+        rows, token = engine.execute_page(query, 2)
+        self.assertEqual(rows, [{'id': 1}, {'id': 2}])
+        rows, token = engine.execute_page(query, 2, token)
+        self.assertEqual(rows, [{'id': 3}, {'id': 4}])
+        self.assertEqual(connector.queries[-1]['filter'], {'$or': [
+            {'id': {'$gt': 2}}, {'$and': [{'id': 2}, {'_id': {'$gt': 2}}]}
+        ]})
+        self.assertEqual(connector.queries[-1]['sort'], [('id', 1), ('_id', 1)])
+        rows, token = engine.execute_page(query, 2, token)
+        self.assertEqual(rows, [{'id': 5}])
+        self.assertIsNone(token)
+
+    def test_ties_are_broken_by_unique_key(self):
+        connector = FakeMongoConnector([{'_id': index, 'team': index // 3} for index in range(6)])
+        engine = QueryEngine(DatabaseType.MONGO_DB, connector)
+        query = "SELECT team FROM employees ORDER BY team"
+
+        rows, token = engine.execute_page(query, 2)
+        pages = [rows]
+        while token is not None:
+            rows, token = engine.execute_page(query, 2, token)
+            pages.append(rows)
+        self.assertEqual(pages, [[{'team': 0}, {'team': 0}], [{'team': 0}, {'team': 1}], [{'team': 1}, {'team': 1}]])
+
+    def test_limit_caps_all_pages(self):
+        connector = FakeMongoConnector([{'_id': index, 'id': index} for index in range(1, 10)])
+        engine = QueryEngine(DatabaseType.MONGO_DB, connector)
+        query = "SELECT _id, id FROM employees ORDER BY id LIMIT 3"
+
+        rows, token = engine.execute_page(query, 2)
+        self.assertEqual(rows, [{'_id': 1, 'id': 1}, {'_id': 2, 'id': 2}])
+        rows, token = engine.execute_page(query, 2, token)
+        self.assertEqual(rows, [{'_id': 3, 'id': 3}])
+        self.assertIsNone(token)
+        self.assertEqual(connector.queries[-1]['limit'], 2)
+
+    def test_neo4j_requires_unique_key(self):
+        engine = QueryEngine(DatabaseType.NEO4J, FakeMongoConnector([]))
+        with self.assertRaises(Exception):
+            engine.execute_page("SELECT p.name FROM Person p ORDER BY p.name", 2)
+        statement = engine.translator.sql_parser.parse_ir("SELECT p.name FROM Person p ORDER BY p.name")
+        page = KeysetPage(statement, "", 2, 'p.id')
+        self.assertIn("ORDER BY p.name, p.id", engine.translator.translate_statement(page.statement_after()))
+
+    def test_rejects_foreign_token(self):
+        engine = QueryEngine(DatabaseType.MONGO_DB, FakeMongoConnector([{'_id': 1, 'id': 1}, {'_id': 2, 'id': 2}]))
+        _, token = engine.execute_page("SELECT id FROM employees ORDER BY id", 1)
+        with self.assertRaises(Exception):
+            engine.execute_page("SELECT id FROM departments ORDER BY id", 1, token)
+
+
+if __name__ == "__main__":
+    unittest.main()
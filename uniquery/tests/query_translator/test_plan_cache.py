@@ -0,0 +1,106 @@
+import os
+import tempfile
+import unittest
+
+import sqlglot
+
+from uniquery.src.query_engine.translators import QueryTranslator, PlanCache
+from uniquery.src.query_engine.translators.plan_cache import normalize_sql
+from uniquery.src.utils import DatabaseType
+
+class TestPlanCache(unittest.TestCase):
+    def setUp(self):
+        self.plan_cache = PlanCache(max_size=2)
+        self.translator = QueryTranslator(DatabaseType.MONGO_DB, self.plan_cache)
+
+    def test_normalize_sql_ignores_whitespace_and_keyword_case(self):
+        self.assertEqual(
+            normalize_sql("select *   from employees\n where name = 'Alice'"),
+            normalize_sql("SELECT * FROM employees WHERE name = 'Alice'")
+        )
+
+    def test_normalize_sql_keeps_literals_and_identifiers(self):
+        self.assertNotEqual(
+            normalize_sql("SELECT * FROM employees WHERE name = 'Alice'"),
+            normalize_sql("SELECT * FROM employees WHERE name = 'alice'")
+        )
+        self.assertNotEqual(
+            normalize_sql("SELECT * FROM Employees"),
+            normalize_sql("SELECT * FROM employees")
+        )
+
+    def test_translate_hits_cache(self):
+        first = self.translator.translate("SELECT * FROM employees WHERE name = 'Alice'")
+        second = self.translator.translate("select * from employees where name = 'Alice'")
+        self.assertEqual(first, second)
+        self.assertEqual(self.plan_cache.stats()['hits'], 1)
+        self.assertEqual(self.plan_cache.stats()['misses'], 1)
+
+    def test_cached_plan_is_isolated_from_mutation(self):
+        sql = "INSERT INTO employees (id, name) VALUES (1, 'Alice')"
+        plan = self.translator.translate(sql)
+        plan['documents'][0]['_id'] = 'mutated'
+        self.assertNotIn('_id', self.translator.translate(sql)['documents'][0])
+
+    def test_cache_keyed_by_database_type(self):
+        key = PlanCache.make_key("SELECT * FROM employees", DatabaseType.MONGO_DB)
+        self.plan_cache.put(key, {'operation': 'FIND'})
+        self.assertIsNone(self.plan_cache.get(PlanCache.make_key("SELECT * FROM employees", DatabaseType.MYSQL)))
+
+    def test_lru_eviction(self):
+        self.translator.translate("SELECT * FROM a")
+        self.translator.translate("SELECT * FROM b")
+        self.translator.translate("SELECT * FROM a")
+        self.translator.translate("SELECT * FROM c")
+        self.assertEqual(self.plan_cache.stats()['evictions'], 1)
+        self.assertIsNotNone(self.plan_cache.get(PlanCache.make_key("SELECT * FROM a", DatabaseType.MONGO_DB)))
+        self.assertIsNone(self.plan_cache.get(PlanCache.make_key("SELECT * FROM b", DatabaseType.MONGO_DB)))
+
+    def test_save_and_load(self):
+        self.translator.translate("SELECT * FROM employees ORDER BY id")
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'plans.json')
+            self.plan_cache.save(path)
+            warm_cache = PlanCache(path=path)
+            self.assertEqual(len(warm_cache), 1)
+            key = PlanCache.make_key("SELECT * FROM employees ORDER BY id", DatabaseType.MONGO_DB)
+            self.assertEqual(warm_cache.get(key)['sort'], [('id', 1)])
+
+    def test_saved_plans_keep_their_types(self):
+        queries = {
+            DatabaseType.MONGO_DB: ["SELECT * FROM staff WHERE _id = OBJECTID('64f1a2b3c4d5e6f708091a2b') "
+                                    "AND hired < DATE '2024-01-01' AND salary = CAST('1.5' AS DECIMAL)",
+                                    "SELECT * FROM staff WHERE name LIKE ? AND age > :age"],
+            DatabaseType.NEO4J: ["SELECT /*+ MAX_TIME(500) */ p.name FROM Person p WHERE p.name ILIKE ?"]
+        }
+        cache = PlanCache()
+        plans = {}
+        for database_type, sqls in queries.items():
+            translator = QueryTranslator(database_type, cache)
+            for sql in sqls:
+                plans[sql] = translator.translate(sql)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'plans.json')
+            cache.save(path)
+            warm_cache = PlanCache(path=path)
+        for database_type, sqls in queries.items():
+            for sql in sqls:
+                self.assertEqual(warm_cache.get(PlanCache.make_key(sql, database_type)), plans[sql])
+
+        cypher = warm_cache.get(PlanCache.make_key(queries[DatabaseType.NEO4J][0], DatabaseType.NEO4J))
+        self.assertEqual(cypher.timeout, 0.5)
+        self.assertEqual(cypher.bind_transforms['p0']('a_%'), '(?i)a..*')
+        mongodb = warm_cache.get(PlanCache.make_key(queries[DatabaseType.MONGO_DB][1], DatabaseType.MONGO_DB))
+        self.assertEqual(mongodb['filter']['$and'][0]['name']['$regex'].resolve(['An%']), '^An')
+
+    def test_unreadable_cache_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'plans.json')
+            for content in ('[1, 2]', '{"sqlglot_version": "%s", "plans": [1]}' % sqlglot.__version__, 'not json'):
+                with open(path, 'w') as f:
+                    f.write(content)
+                self.assertFalse(PlanCache().load(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from uniquery.src.query_engine import QueryEngine
+from uniquery.src.query_engine.translators.parameters import Parameter, bind_parameters, to_pyformat_sql
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+from uniquery.src.utils import DatabaseType
+
+class TestPreparedStatements(unittest.TestCase):
+
+    def test_positional_placeholders_keep_textual_order(self):
+        parsed = SqlParser().parse("SELECT * FROM employees WHERE name = ? AND salary > ? LIMIT ?")
+        self.assertEqual(parsed['filter']['operands'][0]['value'], Parameter(0))
+        self.assertEqual(parsed['filter']['operands'][1]['value'], Parameter(1))
+        self.assertEqual(parsed['limit'], Parameter(2))
+
+    def test_named_placeholders(self):
+        parsed = SqlParser().parse("UPDATE employees SET salary = :salary WHERE name = :name")
+        self.assertEqual(parsed['values'], [Parameter('salary')])
+        self.assertEqual(parsed['filter']['value'], Parameter('name'))
+
+    def test_bind_mongodb_template(self):
+        engine = QueryEngine(DatabaseType.MONGO_DB, None)
+        statement = engine.prepare("SELECT * FROM employees WHERE name = ? AND title LIKE ?")
+        query, driver_parameters = statement.bind(['Alice', 'Eng%'])
+        self.assertIsNone(driver_parameters)
+        self.assertEqual(query['filter'], {'$and': [{'name': 'Alice'}, {'title': {'$regex': '^Eng'}}]})
+        query, _ = statement.bind(['Bob', '%'])
+        self.assertEqual(query['filter']['$and'][0], {'name': 'Bob'})
+
+    def test_bind_missing_parameter(self):
+        template = {'filter': {'name': Parameter('name')}}
+        with self.assertRaises(Exception):
+            bind_parameters(template, {})
+
+    def test_bind_cypher_parameters(self):
+        engine = QueryEngine(DatabaseType.NEO4J, None)
+        statement = engine.prepare("SELECT p.name FROM Person p WHERE p.age > ?")
+        query, driver_parameters = statement.bind([30])
+        self.assertEqual(query, "MATCH (p:Person)\nWHERE p.age > $p0\nRETURN p.name;")
+        self.assertEqual(driver_parameters, {'p0': 30})
+
+    def test_bind_cypher_like_pattern_is_escaped(self):
+        engine = QueryEngine(DatabaseType.NEO4J, None)
+        statement = engine.prepare("SELECT p.name FROM Person p WHERE p.email LIKE ? AND p.age > ?")
+        query, driver_parameters = statement.bind(['a.b\\_c%', 30])
+        self.assertEqual(query, "MATCH (p:Person)\nWHERE (p.email =~ $p0 AND p.age > $p1)\nRETURN p.name;")
+        self.assertEqual(driver_parameters, {'p0': 'a\\.b_c.*', 'p1': 30})
+        statement = engine.prepare("SELECT p.name FROM Person p WHERE p.name ILIKE :name")
+        _, driver_parameters = statement.bind({'name': '(x)_'})
+        self.assertEqual(driver_parameters, {'name': '(?i)\\(x\\).'})
+
+    def test_bind_mysql_parameters(self):
+        engine = QueryEngine(DatabaseType.MYSQL, None)
+        statement = engine.prepare("SELECT * FROM employees WHERE name LIKE 'A%' AND id = :id")
+        query, driver_parameters = statement.bind({'id': 7})
+        self.assertEqual(query, "SELECT * FROM employees WHERE name LIKE 'A%%' AND id = %(id)s")
+        self.assertEqual(driver_parameters, {'id': 7})
+
+    def test_pyformat_without_placeholders_is_unchanged(self):
+        sql = "SELECT * FROM employees WHERE name LIKE 'A%'"
+        self.assertEqual(to_pyformat_sql(sql), (sql, []))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import io
+import unittest
+from array import array
+
+from uniquery.src.query_engine import QueryEngine, ResultSet
+from uniquery.src.formatters import write_result
+from uniquery.src.utils import DatabaseType
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+
+ROWS = [
+    {'id': 1, 'score': 1.5, 'active': True, 'name': 'Ann'},
+    {'id': 2, 'score': None, 'active': False, 'name': 'Bob'},
+    {'id': None, 'score': 3, 'name': 'Cy', 'tags': ['x']}
+]
+
+
+class TestResultSet(unittest.TestCase):
+    def test_columnar_storage(self):
+        result_set = ResultSet.from_rows(ROWS)
+        self.assertEqual(len(result_set), 3)
+        self.assertEqual(result_set.columns, ['id', 'score', 'active', 'name', 'tags'])
+        self.assertEqual(result_set.schema,
+                         {'id': 'int', 'score': 'float', 'active': 'bool', 'name': 'object', 'tags': 'object'})
+        self.assertIsInstance(result_set._columns['id'].values, array)
+        self.assertEqual(result_set.column('score'), [1.5, None, 3.0])
+        self.assertEqual(result_set.column('active'), [True, False, None])
+        self.assertEqual(result_set.column('tags'), [None, None, ['x']])
+
+    def test_rows_round_trip(self):
+        rows = list(ResultSet.from_rows([{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}]))
+        self.assertEqual(rows, [{'a': 1, 'b': 'x'}, {'a': 2, 'b': 'y'}])
+
+    def test_mixed_types_widen_to_object(self):
+        result_set = ResultSet.from_rows([{'a': 1}, {'a': 'two'}, {'a': True}, {'a': 2 ** 70}])
+        self.assertEqual(result_set.schema, {'a': 'object'})
+        self.assertEqual(result_set.column('a'), [1, 'two', True, 2 ** 70])
+
+    def test_is_written_by_formatters(self):
+        out = io.StringIO()
+        self.assertEqual(write_result(ResultSet.from_rows([{'a': 1}]), 'ndjson', out), 1)
+        self.assertEqual(out.getvalue(), '{"a": 1}\n')
+
+    def test_engine_builds_result_set(self):
+        class ListConnector:
+            def run_query(self, query):
+                return [{'id': 1}, {'id': 2}]
+
+        engine = QueryEngine(DatabaseType.MONGO_DB, ListConnector())
+        self.assertEqual(engine.fetch_result_set("SELECT id FROM employees").column('id'), [1, 2])
+
+    @unittest.skipUnless(numpy, "numpy is not installed")
+    def test_to_numpy(self):
+        arrays = ResultSet.from_rows(ROWS).to_numpy()
+        self.assertEqual(arrays['score'].dtype, numpy.float64)
+        self.assertTrue(numpy.isnan(arrays['score'][1]))
+        self.assertEqual(list(arrays['id'].mask), [False, False, True])
+        self.assertEqual(arrays['name'].dtype, object)
+
+    @unittest.skipUnless(pandas, "pandas is not installed")
+    def test_to_pandas(self):
+        frame = ResultSet.from_rows(ROWS).to_pandas()
+        self.assertEqual(str(frame['id'].dtype), 'Int64')
+        self.assertEqual(list(frame.columns), ['id', 'score', 'active', 'name', 'tags'])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import threading
+import unittest
+
+from uniquery.src.query_engine import QueryEngine
+from uniquery.src.connectors.streaming import batched, fetchmany_batches, prefetch, stream_rows
+from uniquery.src.utils import DatabaseType
+
+
+class StreamingConnector:
+    def __init__(self, rows):
+        self.rows = rows
+        self.batch_sizes = []
+
+    def run_query(self, query):
+        raise AssertionError("run_query must not be called when streaming")
+
+    def stream(self, query, parameters=None, batch_size=1000, prefetch=True):
+        self.batch_sizes.append(batch_size)
+        return stream_rows(batched(iter(self.rows), batch_size), prefetch)
+
+
+class TestStreamingHelpers(unittest.TestCase):
+    def test_batched(self):
+        self.assertEqual(list(batched(range(5), 2)), [[0, 1], [2, 3], [4]])
+
+    def test_prefetch_preserves_order(self):
+        batches = [[index] for index in range(50)]
+        self.assertEqual(list(prefetch(iter(batches))), batches)
+
+    def test_prefetch_reads_ahead(self):
+        fetched = []
+        second_fetched = threading.Event()
+
+        def batches():
+            for index in range(3):
+                fetched.append(index)
+                if index == 1:
+                    second_fetched.set()
+                yield [index]
+
+        stream = prefetch(batches())
+        self.assertEqual(next(stream), [0])
+        # The next batch is read while the consumer still holds the first one
+        self.assertTrue(second_fetched.wait(timeout=5))
+        stream.close()
+
+    def test_prefetch_reraises_errors(self):
+        def batches():
+            yield [1]
+            raise ValueError("connection lost")
+
+        stream = prefetch(batches())
+        self.assertEqual(next(stream), [1])
+        with self.assertRaises(ValueError):
+            next(stream)
+
+    def test_abandoned_prefetch_stops_and_closes_the_source(self):
+        fetched = []
+
+        class Cursor:
+            closed = False
+
+            def __iter__(self):
+                for index in range(100):
+                    fetched.append(index)
+                    yield [index]
+
+            def close(self):
+                self.closed = True
+
+        cursor = Cursor()
+        stream = prefetch(cursor, depth=2)
+        self.assertEqual(next(stream), [0])
+        stream.close()
+        # Nothing reads from the cursor once close() has returned
+        fetched_at_close = len(fetched)
+        self.assertTrue(cursor.closed)
+        self.assertLess(fetched_at_close, 100)
+        self.assertEqual(len(fetched), fetched_at_close)
+
+    def test_abandoned_cursor_is_drained_before_closing(self):
+        class Cursor:
+            def __init__(self):
+                self.rows = list(range(10))
+                self.closed_with_unread = None
+
+            def fetchmany(self, size):
+                batch, self.rows = self.rows[:size], self.rows[size:]
+                return batch
+
+            def close(self):
+                self.closed_with_unread = len(self.rows)
+
+        cursor = Cursor()
+        stream = stream_rows(fetchmany_batches(cursor, 3))
+        self.assertEqual(next(stream), 0)
+        stream.close()
+        self.assertEqual(cursor.closed_with_unread, 0)
+
+
+class TestEngineStreaming(unittest.TestCase):
+    def test_execute_query_streams_rows(self):
+        connector = StreamingConnector([{'id': index} for index in range(5)])
+        engine = QueryEngine(DatabaseType.MONGO_DB, connector, batch_size=2)
+        rows = engine.execute_query("SELECT * FROM employees", stream=True)
+        self.assertEqual(next(rows), {'id': 0})
+        self.assertEqual(list(rows), [{'id': index} for index in range(1, 5)])
+        self.assertEqual(connector.batch_sizes, [2])
+
+    def test_empty_result_streams_nothing(self):
+        engine = QueryEngine(DatabaseType.MONGO_DB, StreamingConnector([]))
+        self.assertEqual(list(engine.execute_query("SELECT * FROM employees WHERE 1 = 0", stream=True)), [])
+
+    def test_falls_back_to_materialized_result(self):
+        class ListConnector:
+            def run_query(self, query):
+                return [{'id': 1}]
+
+        engine = QueryEngine(DatabaseType.MONGO_DB, ListConnector())
+        self.assertEqual(list(engine.execute_query("SELECT * FROM employees", stream=True)), [{'id': 1}])
+
+
+if __name__ == "__main__":
+    unittest.main()
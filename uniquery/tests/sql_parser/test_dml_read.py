@@ -218,6 +218,38 @@ class TestSqlParserDataReadQueries(unittest.TestCase):
         }
         self.assertEqual(self.sql_parser.parse(sql), expected)
 
+    def test_select_with_distinct_count_and_aggregate_order(self):
+        sql = """SELECT department, COUNT(DISTINCT title) AS titles, AVG(salary) FROM employees
+            GROUP BY department HAVING COUNT(*) > 2 ORDER BY AVG(salary) DESC"""
+        expected = {
+            'operation': 'SELECT',
+            'table': {'name': 'employees', 'alias': 'employees'},
+            'columns': [
+                {'name': 'department', 'alias': None},
+                {'aggregation_function': 'COUNT_DISTINCT', 'name': 'title', 'alias': 'titles'},
+                {'aggregation_function': 'AVG', 'name': 'salary', 'alias': None}
+            ],
+            'aggregate': ['department'],
+            'having': {
+                'aggregation_function': 'COUNT',
+                'column': '*',
+                'operator': '>',
+                'value': 2
+            },
+            'order_by': [{'column': 'salary', 'order': 'DESC', 'aggregation_function': 'AVG'}]
+        }
+        self.assertEqual(self.sql_parser.parse(sql), expected)
+
+    def test_select_distinct(self):
+        sql = "SELECT DISTINCT department_id FROM employees"
+        expected = {
+            'operation': 'SELECT',
+            'table': {'name': 'employees', 'alias': 'employees'},
+            'columns': [{'name': 'department_id', 'alias': None}],
+            'distinct': True
+        }
+        self.assertEqual(self.sql_parser.parse(sql), expected)
+
     def test_select_with_inner_join(self):
         sql = """SELECT e.name, d.name FROM employees e 
             INNER JOIN departments d ON e.department_id = d.id
@@ -0,0 +1,49 @@
+import unittest
+
+from uniquery.src.query_engine.translators.ir import (Operator, Comparison, InList, Logical, Projection, OrderItem,
+                                                      SelectStatement, Command, statement_from_dict, ColumnRef)
+from uniquery.src.query_engine.translators.sql_parser import SqlParser
+
+class TestSqlParserIntermediateRepresentation(unittest.TestCase):
+    def setUp(self):
+        self.sql_parser = SqlParser()
+
+    def test_select_is_typed(self):
+        statement = self.sql_parser.parse_ir(
+            "SELECT name, COUNT(*) AS cnt FROM employees WHERE salary > 5000 AND name IN ('Alice', 'Bob') "
+            "GROUP BY name ORDER BY name DESC LIMIT 3"
+        )
+        self.assertIsInstance(statement, SelectStatement)
+        self.assertEqual(statement.columns, (Projection('name'), Projection('*', 'cnt', 'COUNT')))
+        self.assertEqual(statement.filter, Logical(Operator.AND, (
+            Comparison('salary', Operator.GT, 5000),
+            InList('name', ('Alice', 'Bob'))
+        )))
+        self.assertEqual(statement.group_by, ('name',))
+        self.assertEqual(statement.order_by, (OrderItem('name', True),))
+        self.assertEqual(statement.limit, 3)
+
+    def test_column_comparison_keeps_column_reference(self):
+        statement = self.sql_parser.parse_ir("SELECT e.name FROM employees e WHERE e.salary > e.bonus")
+        self.assertEqual(statement.filter, Comparison('e.salary', Operator.GT, ColumnRef('e.bonus')))
+
+    def test_ddl_is_wrapped_in_command(self):
+        statement = self.sql_parser.parse_ir("CREATE DATABASE employee")
+        self.assertIsInstance(statement, Command)
+        self.assertEqual(statement.operation, 'CREATE_DATABASE')
+
+    def test_dict_round_trip(self):
+        for sql in (
+            "SELECT e.id AS employee_id, d.name FROM employees e JOIN departments d ON e.department_id = d.id "
+            "WHERE NOT (e.name IS NULL) AND e.salary BETWEEN 1 AND 9",
+            "UPDATE employees SET salary = 5000 WHERE name LIKE 'A%' OR salary <= 10",
+            "DELETE FROM employees",
+            "SELECT e.name FROM employees e JOIN departments d ON e.department_id = d.id WHERE e.code = d.code",
+            "INSERT INTO employees (id, name) VALUES (1, 'Alice'), (2, 'Bob')",
+        ):
+            statement = self.sql_parser.parse_ir(sql)
+            self.assertEqual(statement_from_dict(statement.to_dict()), statement)
+
+
+if __name__ == '__main__':
+    unittest.main()